@@ -0,0 +1,332 @@
+"""
+Offline benchmark suite for the analysis hot paths
+
+Runs every case against synthetic universes, so no network access is needed:
+
+    python -m benchmarks.run --symbols 100 1000 --periods 1y 5y
+    python -m benchmarks.run --compare output/benchmarks_baseline.json
+
+Results are written as JSON (one record per case, universe size and history
+length) and, with --compare, checked against a previous run.
+
+The default grid is 100, 1k and 10k symbols at 1y, 5y and 20y. A universe
+holds its raw bars and indicator frames at once, roughly 300 bytes per bar,
+so --max-bars (default 20,000,000 bars, about 6 GB) skips 10k symbols x 20y
+(50.4M bars, about 15 GB). Run that size on a machine with the memory for it:
+
+    python -m benchmarks.run --symbols 10000 --periods 20y --max-bars 0
+"""
+import warnings
+warnings.filterwarnings("ignore")
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+import matplotlib
+matplotlib.use('Agg')
+
+from src.chart_renderer import ChartRenderer
+from src.correlation import returns_panel, rolling_correlations
+from src.news_parser import NewsPageParser
+from src.panel import PricePanel
+from src.panel_indicators import compute_panel_indicators
+from src.stock_analyzer import StockAnalyzer
+from src.synthetic_data import PERIOD_BARS, generate_universe
+from src.technical_analysis import TechnicalAnalyzer
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_news_fixtures():
+    """Saved news pages, one per layout the parser supports"""
+    fixtures = []
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if name.endswith('.html'):
+            with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+                fixtures.append(f.read())
+    return fixtures
+
+
+def _news_pages(symbols, fixtures):
+    # A per-symbol comment gives every page its own fingerprint, so nothing is served from the cache
+    return {symbol: fixtures[k % len(fixtures)] + f'<!-- {symbol} -->' for k, symbol in enumerate(symbols)}
+
+
+def _indicator_frames(analyzer, universe):
+    return {symbol: analyzer.calculate_technical_indicators(df.copy()) for symbol, df in universe.items()}
+
+
+def _results(analyzer, frames):
+    return {symbol: analyzer.build_results(df, analyzer.generate_signals(df)) for symbol, df in frames.items()}
+
+
+def case_indicators(ctx):
+    for df in ctx['universe'].values():
+        ctx['analyzer'].calculate_technical_indicators(df.copy())
+
+
+def case_panel_indicators(ctx):
+    compute_panel_indicators(PricePanel.from_bars(ctx['universe']))
+
+
+def case_signals(ctx):
+    for df in ctx['frames'].values():
+        ctx['analyzer'].generate_signals(df)
+
+
+def case_recommendation(ctx):
+    for results in ctx['results'].values():
+        tech_analysis = results['technical_analysis']
+        ctx['analyzer'].generate_recommendation(tech_analysis, tech_analysis['signals'])
+
+
+def case_backtest(ctx):
+    ctx['analyzer'].backtest_recommendations(ctx['universe'])
+
+
+def case_correlation(ctx):
+    ctx['analyzer'].correlation_analysis(ctx['universe'])
+
+
+def case_rolling_correlation(ctx):
+    for _ in rolling_correlations(returns_panel(ctx['universe'])):
+        pass
+
+
+def case_excel_summary(ctx):
+    ctx['analyzer'].generate_excel_summary(ctx['results'])
+
+
+def case_excel_summary_streaming(ctx):
+    ctx['analyzer'].generate_excel_summary(ctx['results'], streaming=True)
+
+
+def case_plots(ctx):
+    for symbol in ctx['plot_symbols']:
+        ctx['analyzer'].plot_technical_analysis(ctx['frames'][symbol], symbol)
+
+
+def case_chart_renderer(ctx):
+    renderer = ChartRenderer(ctx['tmpdir'])
+    for symbol in ctx['plot_symbols']:
+        renderer.render(ctx['frames'][symbol], symbol, force=True)
+
+
+def case_parse_news(ctx):
+    NewsPageParser().parse_pages(ctx['news_pages'])
+
+
+def case_parse_news_cached(ctx):
+    ctx['news_parser'].parse_pages(ctx['news_pages'])
+
+
+def case_parse_news_soup(ctx):
+    # Full tree build, as SentimentAnalyzer used to do for every page
+    for html in ctx['news_pages'].values():
+        BeautifulSoup(html, 'html.parser')
+
+
+def case_technical_analyzer(ctx):
+    for df in ctx['universe'].values():
+        technical = TechnicalAnalyzer(df.copy())
+        technical.add_all_indicators()
+        technical.generate_signals()
+
+
+# name -> (function, whether it only runs on the plot sample)
+CASES = {
+    'calculate_technical_indicators': (case_indicators, False),
+    'panel_indicators': (case_panel_indicators, False),
+    'generate_signals': (case_signals, False),
+    'generate_recommendation': (case_recommendation, False),
+    'backtest_recommendations': (case_backtest, False),
+    'correlation_analysis': (case_correlation, False),
+    'rolling_correlations': (case_rolling_correlation, False),
+    'generate_excel_summary': (case_excel_summary, False),
+    'generate_excel_summary_streaming': (case_excel_summary_streaming, False),
+    'plot_technical_analysis': (case_plots, True),
+    'chart_renderer': (case_chart_renderer, True),
+    'parse_news': (case_parse_news, True),
+    'parse_news_cached': (case_parse_news_cached, True),
+    'parse_news_soup': (case_parse_news_soup, True),
+    'technical_analyzer': (case_technical_analyzer, False)
+}
+
+
+def measure(func, ctx, track_memory):
+    """Time one call of `func` and optionally record its peak traced allocation"""
+    start = time.perf_counter()
+    func(ctx)
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if track_memory:
+        # Separate pass so tracemalloc overhead does not distort the timing
+        tracemalloc.start()
+        func(ctx)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return seconds, peak_mb
+
+
+def run_suite(symbol_counts, periods, cases, plot_sample=20, max_bars=20_000_000,
+              track_memory=True, seed=0):
+    """
+    Run every requested case for every universe size and history length
+
+    Parameters:
+    symbol_counts (list): Universe sizes
+    periods (list): History lengths, keys of PERIOD_BARS
+    cases (list): Case names, keys of CASES
+    plot_sample (int): Symbols rendered by the plotting cases and news pages parsed by the news cases
+    max_bars (int): Skip universes with more symbols x bars than this; 0 for no limit
+    track_memory (bool): Record peak memory with tracemalloc
+    seed (int): Random seed for the synthetic data
+
+    Returns:
+    list: One result record per case, universe size and period
+    """
+    records = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        analyzer = StockAnalyzer()
+        analyzer.output_dir = tmpdir
+        news_fixtures = load_news_fixtures()
+
+        for period in periods:
+            for n_symbols in symbol_counts:
+                total_bars = n_symbols * PERIOD_BARS[period]
+                if max_bars and total_bars > max_bars:
+                    print(f"Skipping {n_symbols} symbols x {period}: {total_bars:,} bars exceeds "
+                          f"--max-bars {max_bars:,} (pass --max-bars 0 to run it)")
+                    records += [{'case': name, 'symbols': n_symbols, 'period': period,
+                                 'skipped': True} for name in cases]
+                    continue
+
+                print(f"\nUniverse: {n_symbols} symbols x {period}")
+                universe = generate_universe(n_symbols, period, seed=seed)
+                frames = _indicator_frames(analyzer, universe)
+                ctx = {
+                    'analyzer': analyzer,
+                    'universe': universe,
+                    'frames': frames,
+                    'results': _results(analyzer, frames),
+                    'plot_symbols': list(universe)[:plot_sample],
+                    'news_pages': _news_pages(list(universe)[:plot_sample], news_fixtures),
+                    'news_parser': NewsPageParser(),
+                    'tmpdir': tmpdir
+                }
+                ctx['news_parser'].parse_pages(ctx['news_pages'])
+                bars = sum(len(df) for df in universe.values())
+
+                for name in cases:
+                    func, sampled = CASES[name]
+                    measured = len(ctx['plot_symbols']) if sampled else n_symbols
+                    seconds, peak_mb = measure(func, ctx, track_memory)
+                    measured_bars = bars * measured / n_symbols
+                    record = {
+                        'case': name,
+                        'symbols': n_symbols,
+                        'period': period,
+                        'measured_symbols': measured,
+                        'bars': int(measured_bars),
+                        'seconds': round(seconds, 6),
+                        'symbols_per_second': round(measured / seconds, 2) if seconds else None,
+                        'bars_per_second': round(measured_bars / seconds, 1) if seconds else None,
+                        'peak_memory_mb': round(peak_mb, 2) if peak_mb is not None else None
+                    }
+                    records.append(record)
+                    memory = f", peak {peak_mb:.1f} MB" if peak_mb is not None else ""
+                    print(f"  {name:<34} {seconds:9.3f}s  "
+                          f"{record['symbols_per_second']:>10} symbols/s{memory}")
+    return records
+
+
+def compare(records, baseline_path, tolerance):
+    """
+    Compare throughput against a previous run
+
+    Returns:
+    list: Human-readable descriptions of every case that slowed down by more than `tolerance`
+    """
+    with open(baseline_path) as f:
+        baseline = {(r['case'], r['symbols'], r['period']): r
+                    for r in json.load(f)['results'] if not r.get('skipped')}
+    regressions = []
+    for record in records:
+        previous = baseline.get((record['case'], record['symbols'], record['period']))
+        if record.get('skipped') or previous is None:
+            continue
+        if record['symbols_per_second'] < previous['symbols_per_second'] * (1 - tolerance):
+            regressions.append(
+                f"{record['case']} ({record['symbols']} x {record['period']}): "
+                f"{previous['symbols_per_second']} -> {record['symbols_per_second']} symbols/s")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis hot paths on synthetic data")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Universe sizes")
+    parser.add_argument("--periods", nargs="+", default=["1y", "5y", "20y"],
+                        choices=sorted(PERIOD_BARS), help="History lengths")
+    parser.add_argument("--cases", nargs="+", default=list(CASES), choices=list(CASES),
+                        help="Cases to run")
+    parser.add_argument("--plot-sample", type=int, default=20,
+                        help="Symbols rendered by the plotting cases and news pages parsed by the news cases")
+    parser.add_argument("--max-bars", type=int, default=20_000_000,
+                        help="Skip universes with more symbols x bars than this (about 300 bytes "
+                             "of memory per bar); the default skips 10k symbols x 20y, 0 runs everything")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", default=None,
+                        help="JSON results path (default output/benchmarks_<timestamp>.json)")
+    parser.add_argument("--compare", default=None,
+                        help="Baseline JSON to check for throughput regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed fractional throughput drop before a case counts as a regression")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    records = run_suite(args.symbols, args.periods, args.cases, plot_sample=args.plot_sample,
+                        max_bars=args.max_bars, track_memory=not args.no_memory, seed=args.seed)
+
+    output = args.output or os.path.join(
+        'output', f'benchmarks_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'results': records
+        }, f, indent=2)
+    print(f"\nBenchmark results written to {output}")
+
+    if args.compare:
+        regressions = compare(records, args.compare, args.tolerance)
+        if regressions:
+            print("\nThroughput regressions:")
+            for regression in regressions:
+                print(f"- {regression}")
+            sys.exit(1)
+        print("\nNo throughput regressions")
+
+
+if __name__ == "__main__":
+    main()
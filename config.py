@@ -17,7 +17,24 @@ TECHNICAL_PARAMS = {
     'EMA_LONG': 26,
     'MACD_SIGNAL': 9,
     'BB_PERIOD': 20,
-    'BB_STD': 2
+    'BB_STD': 2,
+    'SMA_TREND': 200,
+    'STOCH_PERIOD': 14,
+    'STOCH_SMOOTH': 3,
+    'ATR_PERIOD': 14,
+    'ROC_PERIOD': 10,
+    'MFI_PERIOD': 14,
+    'RVI_PERIOD': 10
+}
+
+# Default grid for parameter sweeps (main.py --sweep); unlisted parameters keep
+# their TECHNICAL_PARAMS value
+PARAM_GRID = {
+    'RSI_PERIOD': [9, 14, 21],
+    'SMA_TREND': [100, 150, 200],
+    'EMA_SHORT': [8, 12],
+    'EMA_LONG': [21, 26],
+    'BB_STD': [2, 2.5]
 }
 
 # Fundamental Analysis Thresholds
@@ -40,3 +57,6 @@ WEIGHTS = {
 # Output Settings
 OUTPUT_DIR = "output"
 EXCEL_FILENAME = "stock_analysis_report.xlsx"
+
+# Local data cache (price bars are refreshed incrementally)
+CACHE_DIR = "cache"
@@ -2,8 +2,14 @@ import warnings
 warnings.filterwarnings("ignore")
 
 from src.stock_analyzer import StockAnalyzer
+from src.pipeline import AnalysisPipeline
+from src.chart_renderer import render_many
+from config import CACHE_DIR, PARAM_GRID
 import yfinance as yf
+import argparse
+import math
 import time
+from datetime import datetime
 
 def get_stock_list():
     """Returns a list of popular stocks"""
@@ -51,21 +57,80 @@ def get_stock_list():
         "NIO", "RIVN", "LCID"
     ]
 
-def main():
-    # Create analyzer instance
-    analyzer = StockAnalyzer()
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Analyze a universe of stocks")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Run fetch, indicator, plot and export stages concurrently")
+    parser.add_argument("--fetch-workers", type=int, default=4,
+                        help="Fetch threads in pipeline mode")
+    parser.add_argument("--compute-workers", type=int, default=2,
+                        help="Indicator processes in pipeline mode (and with --shared-memory)")
+    parser.add_argument("--shared-memory", action="store_true",
+                        help="Compute panel indicators in --compute-workers processes over a shared-memory panel")
+    parser.add_argument("--plot-workers", type=int, default=2,
+                        help="Plotting processes")
+    parser.add_argument("--fast-plots", action="store_true",
+                        help="Render charts from reusable templates and skip unchanged ones")
+    parser.add_argument("--streaming-excel", action="store_true",
+                        help="Write the Excel summary in constant-memory streaming mode")
+    parser.add_argument("--export-format", choices=["csv", "arrow"], default="csv",
+                        help="Per-symbol CSV files or one partitioned Arrow dataset")
+    parser.add_argument("--queue-size", type=int, default=16,
+                        help="Capacity of each queue between pipeline stages")
+    parser.add_argument("--compact", action="store_true",
+                        help="Keep frames as float32 with trimmed columns and release them once exported")
+    parser.add_argument("--sweep", action="store_true",
+                        help="Backtest every config.PARAM_GRID combination instead of running the analysis")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Time every stage and write JSON and Prometheus run metrics")
+    return parser.parse_args()
+
+def print_analysis(analyzer, results):
+    """Display the recommendation, key indicators and signals for one stock"""
+    tech_analysis = results['technical_analysis']
+    signals = tech_analysis['signals']
     
-    # Get list of stocks
-    symbols = get_stock_list()
-    print(f"Starting analysis for {len(symbols)} stocks...")
+    # Get recommendation
+    recommendation, confidence_score, reasoning = analyzer.generate_recommendation(
+        tech_analysis, signals)
     
-    # Store all results
+    print("\nAnalysis Results:")
+    print(f"Last Price: ${tech_analysis['last_price']:.2f}")
+    print(f"Recommendation: {recommendation}")
+    print(f"Confidence Score: {confidence_score:.1f}%")
+    print(f"Analysis Reasoning: {reasoning}")
+    
+    print("\nKey Indicators:")
+    print(f"RSI: {tech_analysis['rsi']:.2f}")
+    print(f"MACD: {tech_analysis['macd']:.2f}")
+    
+    print("\nTrading Signals:")
+    for indicator, signal in signals.items():
+        print(f"{indicator}: {signal}")
+
+def keep_frames(args):
+    """Whether per-symbol frames are still needed after a symbol is exported"""
+    return not args.compact or args.fast_plots or args.export_format == "arrow"
+
+def run_sequential(analyzer, symbols, start_time, args):
+    """Analyze the stocks one after another"""
     all_results = {}
     failed_symbols = []
-    
-    # Progress tracking
     total_stocks = len(symbols)
-    start_time = time.time()
+    
+    span = analyzer.instrumentation.span
+    
+    # Download the whole universe up front in batched, rate-limited requests
+    with span('fetch_batch'):
+        price_data = analyzer.get_multiple_stock_data(symbols)
+    print(f"Fetched price data for {len(price_data)}/{total_stocks} stocks "
+          f"in {time.time() - start_time:.1f} seconds")
+    
+    # Compute indicators for the whole universe as one dates x symbols panel
+    with span('panel_indicators'):
+        price_data = analyzer.calculate_panel_indicators(
+            price_data, processes=args.compute_workers if args.shared_memory else 1)
     
     for index, symbol in enumerate(symbols, 1):
         print(f"\n{'='*50}")
@@ -77,38 +142,25 @@ def main():
         success = False
         
         for attempt in range(max_retries):
+            if attempt > 0:
+                analyzer.instrumentation.increment('retries', symbol)
             try:
-                # Perform analysis
-                results = analyzer.analyze_stock(symbol)
+                # Perform analysis, falling back to a single fetch on retries
+                prefetched = price_data.pop(symbol, None) if attempt == 0 else None
+                results = analyzer.analyze_stock(symbol, data=prefetched,
+                                                 plot=not args.fast_plots)
                 
                 if results:
                     # Store results for summary report
                     all_results[symbol] = results
                     
                     # Display technical analysis results
-                    tech_analysis = results['technical_analysis']
-                    signals = tech_analysis['signals']
-                    
-                    # Get recommendation
-                    recommendation, confidence_score, reasoning = analyzer.generate_recommendation(
-                        tech_analysis, signals)
-                    
-                    print("\nAnalysis Results:")
-                    print(f"Last Price: ${tech_analysis['last_price']:.2f}")
-                    print(f"Recommendation: {recommendation}")
-                    print(f"Confidence Score: {confidence_score:.1f}%")
-                    print(f"Analysis Reasoning: {reasoning}")
-                    
-                    print("\nKey Indicators:")
-                    print(f"RSI: {tech_analysis['rsi']:.2f}")
-                    print(f"MACD: {tech_analysis['macd']:.2f}")
-                    
-                    print("\nTrading Signals:")
-                    for indicator, signal in signals.items():
-                        print(f"{indicator}: {signal}")
+                    print_analysis(analyzer, results)
                     
                     # Export results
                     analyzer.export_results(results, symbol)
+                    if not keep_frames(args):
+                        results.pop('data', None)
                     
                     print(f"\nAnalysis completed for {symbol}")
                     success = True
@@ -132,14 +184,87 @@ def main():
         
         print(f"\nProgress: {index}/{total_stocks} stocks processed")
         print(f"Estimated time remaining: {estimated_time_remaining/60:.1f} minutes")
-        
-        time.sleep(1)  # Prevent rate limiting
+    
+    if args.fast_plots:
+        # Render every chart in one batch across worker processes
+        frames = {symbol: results['data'] for symbol, results in all_results.items()}
+        with span('render_many'):
+            rendered = render_many(frames, analyzer.output_dir, processes=args.plot_workers)
+        print(f"\nRendered charts for {len(rendered)} stocks "
+              f"({len(frames) - len(rendered)} unchanged)")
+    
+    return all_results, failed_symbols
+
+def run_pipelined(analyzer, symbols, args):
+    """Analyze the stocks with every stage running concurrently"""
+    total_stocks = len(symbols)
+    completed = []
+    
+    def on_result(symbol, results):
+        completed.append(symbol)
+        print(f"\n{'='*50}")
+        print(f"Completed {symbol} ({len(completed)}/{total_stocks})")
+        print(f"{'='*50}")
+        print_analysis(analyzer, results)
+    
+    pipeline = AnalysisPipeline(analyzer,
+                                fetch_workers=args.fetch_workers,
+                                compute_workers=args.compute_workers,
+                                plot_workers=args.plot_workers,
+                                queue_size=args.queue_size,
+                                keep_frames=keep_frames(args))
+    return pipeline.run(symbols, on_result=on_result)
+
+def run_sweep(analyzer, symbols, args):
+    """Backtest the parameter grid across the universe and save the ranked results"""
+    price_data = analyzer.get_multiple_stock_data(symbols)
+    n_combinations = math.prod(len(values) for values in PARAM_GRID.values())
+    print(f"Sweeping {n_combinations} parameter combinations over {len(price_data)} stocks...")
+    
+    results = analyzer.sweep_parameters(price_data, PARAM_GRID, processes=args.compute_workers)
+    if results is None:
+        return
+    
+    sweep_path = f'{analyzer.output_dir}/param_sweep_{datetime.now().strftime("%Y%m%d_%H%M")}.csv'
+    results.to_csv(sweep_path, index=False)
+    print("\nTop parameter combinations:")
+    print(results.head(10).to_string(index=False))
+    print(f"\nSweep results written to {sweep_path}")
+
+def main():
+    args = parse_args()
+    
+    # Create analyzer instance
+    analyzer = StockAnalyzer(cache_dir=CACHE_DIR, fast_plots=args.fast_plots,
+                             export_format=args.export_format, instrument=args.metrics,
+                             compact=args.compact)
+    
+    # Get list of stocks
+    symbols = get_stock_list()
+    
+    if args.sweep:
+        run_sweep(analyzer, symbols, args)
+        return
+    print(f"Starting analysis for {len(symbols)} stocks...")
+    
+    # Progress tracking
+    total_stocks = len(symbols)
+    start_time = time.time()
+    
+    if args.pipeline:
+        all_results, failed_symbols = run_pipelined(analyzer, symbols, args)
+    else:
+        all_results, failed_symbols = run_sequential(analyzer, symbols, start_time, args)
     
     # Generate summary reports
     if all_results:
+        if args.export_format == "arrow":
+            analyzer.export_dataset(all_results)
+        
         try:
             # Generate Excel summary
-            excel_path = analyzer.generate_excel_summary(all_results)
+            excel_path = analyzer.generate_excel_summary(all_results,
+                                                         streaming=args.streaming_excel)
             if excel_path:
                 print(f"Excel summary created at: {excel_path}")
             
@@ -163,6 +288,13 @@ def main():
     # Print total execution time
     total_time = time.time() - start_time
     print(f"\nTotal execution time: {total_time/60:.1f} minutes")
+    
+    # Report and export per-stage timings
+    if args.metrics:
+        analyzer.instrumentation.print_summary()
+        json_path, prom_path = analyzer.instrumentation.write(analyzer.output_dir)
+        if json_path:
+            print(f"\nRun metrics written to {json_path} and {prom_path}")
 
 if __name__ == "__main__":
     main()
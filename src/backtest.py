@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+
+def ffill(x):
+    """Forward-fill NaN down axis 0 of a (dates x symbols) array"""
+    rows = np.arange(len(x))[:, None]
+    last = np.maximum.accumulate(np.where(~np.isnan(x), rows, 0), axis=0)
+    return np.take_along_axis(x, last, axis=0)
+
+
+def drawdown(equity):
+    """Fractional drop from the running peak, along axis 0"""
+    return equity / np.maximum.accumulate(equity, axis=0) - 1
+
+
+class Backtester:
+    def __init__(self, long_threshold=60, exit_threshold=40, short_threshold=None,
+                 cost_bps=5.0, slippage_bps=5.0, bars_per_year=252):
+        """
+        Vectorised backtest of the recommendation score
+
+        A symbol goes long when its score reaches `long_threshold` and back to
+        flat when it falls below `exit_threshold` (and short below
+        `short_threshold`, if given); in between the previous position is
+        held. Positions are decided on a bar's close and held from the next
+        bar, so there is no look-ahead. Every change of position pays
+        `cost_bps + slippage_bps` on the traded fraction. Every step is an
+        array operation over all dates and symbols at once.
+
+        Parameters:
+        long_threshold (float): Score at or above which to be long
+        exit_threshold (float): Score below which a long position is closed
+        short_threshold (float): Score below which to be short; None disables shorts
+        cost_bps (float): Commission per unit of turnover, in basis points
+        slippage_bps (float): Slippage per unit of turnover, in basis points
+        bars_per_year (int): Bars per year for annualised figures
+        """
+        self.long_threshold = long_threshold
+        self.exit_threshold = exit_threshold
+        self.short_threshold = short_threshold
+        self.cost_bps = cost_bps
+        self.slippage_bps = slippage_bps
+        self.bars_per_year = bars_per_year
+
+    def target_positions(self, scores):
+        """
+        Turn a (dates x symbols) score array into target positions of -1, 0 or 1
+
+        Bars whose score is between the thresholds (or NaN) keep the previous target.
+        """
+        with np.errstate(invalid='ignore'):
+            target = np.full(scores.shape, np.nan)
+            target[scores < self.exit_threshold] = 0.0
+            if self.short_threshold is not None:
+                target[scores < self.short_threshold] = -1.0
+            target[scores >= self.long_threshold] = 1.0
+        return np.nan_to_num(ffill(target))
+
+    @staticmethod
+    def prepare(close):
+        """
+        Bar returns and trading masks for a (dates x symbols) close array
+
+        Independent of the scores, so a parameter sweep prepares them once
+        and passes them to every `simulate` call.
+
+        Returns:
+        dict: 'returns', 'listed' and 'active' arrays; a symbol is active from
+        its second close through its last one
+        """
+        filled = ffill(close)
+        listed = ~np.isnan(filled)
+        # Bars after a symbol's last close (delisted or data ending early) carry no returns
+        closing = ~np.isnan(ffill(close[::-1])[::-1])
+        prev = np.vstack([np.full((1, filled.shape[1]), np.nan), filled[:-1]])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = np.nan_to_num(filled / prev - 1)
+        return {'returns': returns, 'listed': listed, 'active': listed & closing & ~np.isnan(prev)}
+
+    def run(self, dates, symbols, close, scores):
+        """
+        Simulate the strategy for every symbol and an equal-weight portfolio
+
+        Parameters:
+        dates (pandas.DatetimeIndex): Row dates
+        symbols (list): Column symbols
+        close (numpy.ndarray): (dates x symbols) closes, NaN where a symbol has no bar
+        scores (numpy.ndarray): (dates x symbols) recommendation scores
+
+        Returns:
+        dict: See `simulate`
+        """
+        return self.simulate(dates, symbols, self.prepare(close), scores)
+
+    def simulate(self, dates, symbols, market, scores):
+        """
+        Simulate the strategy on prepared market data
+
+        Parameters:
+        dates (pandas.DatetimeIndex): Row dates
+        symbols (list): Column symbols
+        market (dict): Output of `prepare` for the closes
+        scores (numpy.ndarray): (dates x symbols) recommendation scores
+
+        Returns:
+        dict: 'equity' (per-symbol equity curves), 'portfolio' (equity,
+        drawdown and turnover of the equal-weight portfolio) and 'summary'
+        (total return, CAGR, volatility, Sharpe, max drawdown, turnover,
+        trades and exposure per symbol plus a PORTFOLIO row)
+        """
+        returns, listed, active = market['returns'], market['listed'], market['active']
+
+        # Decide on bar t's close, hold from bar t+1
+        target = self.target_positions(scores)
+        position = np.zeros_like(target)
+        position[1:] = target[:-1]
+        position[~listed] = 0.0
+
+        trades = np.abs(np.diff(position, axis=0, prepend=0.0))
+        costs = trades * (self.cost_bps + self.slippage_bps) / 1e4
+        net = position * returns - costs
+        equity = np.cumprod(1 + net, axis=0)
+
+        # Equal weight across the symbols trading on each bar, rebalanced daily
+        n_active = active.sum(axis=1)
+        with np.errstate(invalid='ignore'):
+            portfolio_returns = np.where(n_active > 0, np.where(active, net, 0).sum(axis=1) / n_active, 0.0)
+            portfolio_turnover = np.where(n_active > 0, np.where(active, trades, 0).sum(axis=1) / n_active, 0.0)
+        portfolio_equity = np.cumprod(1 + portfolio_returns)
+
+        summary = self._summary(net, equity, trades, position, active)
+        portfolio_summary = self._summary(portfolio_returns[:, None], portfolio_equity[:, None],
+                                          portfolio_turnover[:, None], np.ones((len(dates), 1)),
+                                          (n_active > 0)[:, None])
+        summary_df = pd.DataFrame(summary, index=list(symbols))
+        summary_df.loc['PORTFOLIO'] = {name: values[0] for name, values in portfolio_summary.items()}
+        summary_df.loc['PORTFOLIO', ['Trades', 'Exposure']] = [summary['Trades'].sum(),
+                                                              np.nanmean(summary['Exposure'])]
+
+        return {
+            'equity': pd.DataFrame(equity, index=dates, columns=list(symbols)),
+            'portfolio': pd.DataFrame({'Equity': portfolio_equity,
+                                       'Drawdown': drawdown(portfolio_equity),
+                                       'Turnover': portfolio_turnover}, index=dates),
+            'summary': summary_df
+        }
+
+    def _summary(self, net, equity, trades, position, active):
+        bars = active.sum(axis=0)
+        years = bars / self.bars_per_year
+        final = equity[-1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(active, net, 0).sum(axis=0) / bars
+            variance = np.where(active, (net - mean) ** 2, 0).sum(axis=0) / (bars - 1)
+            volatility = np.sqrt(variance * self.bars_per_year)
+            return {
+                'Total_Return': final - 1,
+                'CAGR': np.where(years > 0, final ** (1 / years) - 1, np.nan),
+                'Volatility': volatility,
+                'Sharpe': mean * self.bars_per_year / volatility,
+                'Max_Drawdown': drawdown(equity).min(axis=0),
+                'Turnover': trades.sum(axis=0),
+                'Trades': (trades > 0).sum(axis=0),
+                'Exposure': np.where(active, position != 0, False).sum(axis=0) / bars
+            }
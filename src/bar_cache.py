@@ -0,0 +1,216 @@
+import json
+import os
+import threading
+import pandas as pd
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+# Calendar days covered by each yfinance period string
+PERIOD_DAYS = {
+    '1d': 1, '5d': 5, '1mo': 31, '3mo': 92, '6mo': 183,
+    '1y': 366, '2y': 731, '5y': 1827, '10y': 3653
+}
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+ACTION_COLUMNS = ['Dividends', 'Stock Splits']
+
+
+def period_start(period, today=None):
+    """
+    Convert a yfinance period string into the first calendar date it covers
+
+    Parameters:
+    period (str): Time period - 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
+    today (datetime): Reference date, defaults to now
+
+    Returns:
+    datetime: First date of the period, or None for 'max'
+    """
+    today = (today or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return today.replace(month=1, day=1)
+    return today - timedelta(days=PERIOD_DAYS[period])
+
+
+class BarCache:
+    def __init__(self, fetcher, cache_dir='cache', interval='1d', tolerance=1e-6):
+        """
+        On-disk OHLCV store with one Parquet file per symbol and interval
+
+        A cache hit only downloads the bars after the last stored one. The
+        refetched tail overlaps the stored history by one bar so adjustments
+        and gaps can be detected; when they are, the full history is rewritten.
+
+        Parameters:
+        fetcher (DataFetcher): Fetcher used for full and incremental downloads
+        cache_dir (str): Root directory of the bar store
+        interval (str): Bar interval stored by this cache
+        tolerance (float): Relative price difference treated as an adjustment
+        """
+        self.fetcher = fetcher
+        self.interval = interval
+        self.tolerance = tolerance
+        self.bar_dir = os.path.join(cache_dir, 'bars', interval)
+        self.manifest_path = os.path.join(self.bar_dir, 'manifest.json')
+        self._lock = threading.Lock()
+        os.makedirs(self.bar_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        """Load the earliest requested start date recorded for every symbol"""
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error reading bar cache manifest: {str(e)}")
+            return {}
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _path(self, symbol):
+        return os.path.join(self.bar_dir, f'{symbol}.parquet')
+
+    def load(self, symbol):
+        """
+        Read the stored bars for a symbol
+
+        Parameters:
+        symbol (str): Stock symbol
+
+        Returns:
+        pandas.DataFrame: Stored bars, or None if the symbol is not cached
+        """
+        path = self._path(symbol)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            print(f"Error reading cached bars for {symbol}: {str(e)}")
+            return None
+
+    def store(self, symbol, df, period=None):
+        """
+        Write the full bar history for a symbol
+
+        Parameters:
+        symbol (str): Stock symbol
+        df (pandas.DataFrame): Bars to store
+        period (str): Period the history was downloaded for; recorded in the
+            manifest for full downloads, omitted when appending a tail
+        """
+        tmp_path = self._path(symbol) + '.tmp'
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, self._path(symbol))
+        if period is not None:
+            start = period_start(period)
+            with self._lock:
+                self.manifest[symbol] = start.strftime('%Y-%m-%d') if start else 'max'
+
+    def _covers(self, symbol, cached, start):
+        """Check whether the stored history reaches back to `start`"""
+        if cached is None or len(cached) < 2:
+            return False
+        recorded = self.manifest.get(symbol)
+        if recorded is None:
+            return False
+        if recorded == 'max':
+            return True
+        return start is not None and datetime.strptime(recorded, '%Y-%m-%d') <= start
+
+    def _needs_rewrite(self, cached, tail):
+        """
+        Decide whether a fetched tail invalidates the stored history
+
+        The tail starts at the second-to-last stored bar (the last one may have
+        been a partial session). History is rewritten when that anchor bar is
+        missing from the tail (a gap), when its prices moved (a split or dividend
+        adjustment was applied retroactively), or when a new bar carries a
+        corporate action that will adjust everything before it.
+        """
+        anchor = cached.index[-2]
+        if anchor not in tail.index:
+            return True
+
+        stored = cached.loc[anchor, PRICE_COLUMNS].astype(float)
+        fresh = tail.loc[anchor, PRICE_COLUMNS].astype(float)
+        if ((stored - fresh).abs() > self.tolerance * stored.abs()).any():
+            return True
+
+        new_bars = tail[tail.index > cached.index[-1]]
+        actions = [col for col in ACTION_COLUMNS if col in new_bars.columns]
+        return bool(actions) and bool((new_bars[actions].fillna(0) != 0).any().any())
+
+    def _trim(self, df, start):
+        if start is None:
+            return df
+        start = pd.Timestamp(start)
+        if df.index.tz is not None:
+            start = start.tz_localize(df.index.tz)
+        return df[df.index >= start]
+
+    def get_many(self, symbols, period='1y', **fetch_kwargs):
+        """
+        Return bars for many symbols, downloading only what is missing on disk
+
+        Symbols without a usable cache entry are fetched in full; the rest are
+        grouped by the date their tail starts so each group is a single batched
+        request.
+
+        Parameters:
+        symbols (list): List of stock symbols
+        period (str): Time period
+        fetch_kwargs: Extra arguments for DataFetcher.fetch_multiple_stocks
+
+        Returns:
+        dict: Dictionary with stock symbols as keys and DataFrames as values
+        """
+        start = period_start(period)
+        results = {}
+        full_fetch = []
+        tails = defaultdict(list)
+
+        for symbol in dict.fromkeys(symbols):
+            cached = self.load(symbol)
+            if self._covers(symbol, cached, start):
+                results[symbol] = cached
+                tails[cached.index[-2].strftime('%Y-%m-%d')].append(symbol)
+            else:
+                full_fetch.append(symbol)
+
+        for tail_start, group in tails.items():
+            fresh = self.fetcher.fetch_multiple_stocks(
+                group, period=period, start=tail_start, interval=self.interval, **fetch_kwargs)
+            for symbol in group:
+                cached = results[symbol]
+                tail = fresh.get(symbol)
+                if tail is None or tail.empty:
+                    continue
+                if self._needs_rewrite(cached, tail):
+                    full_fetch.append(symbol)
+                    del results[symbol]
+                    continue
+                merged = pd.concat([cached[cached.index < tail.index[0]], tail])
+                self.store(symbol, merged)
+                results[symbol] = merged
+
+        if full_fetch:
+            fresh = self.fetcher.fetch_multiple_stocks(
+                full_fetch, period=period, interval=self.interval, **fetch_kwargs)
+            for symbol, df in fresh.items():
+                self.store(symbol, df, period=period)
+                results[symbol] = df
+
+        with self._lock:
+            self._save_manifest()
+
+        return {symbol: self._trim(results[symbol], start)
+                for symbol in symbols if symbol in results}
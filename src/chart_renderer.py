@@ -0,0 +1,198 @@
+import hashlib
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.dates import date2num
+from matplotlib.figure import Figure
+
+# Columns drawn on each chart; the content hash covers exactly these
+TECHNICAL_SERIES = [('Close', 'Price'), ('SMA_20', '20-day SMA'), ('SMA_50', '50-day SMA'),
+                    ('BB_upper', 'BB Upper'), ('BB_lower', 'BB Lower')]
+MOMENTUM_SERIES = ['RSI', 'MACD', 'Signal_Line', 'Volume']
+PLOTTED_COLUMNS = [col for col, _ in TECHNICAL_SERIES] + MOMENTUM_SERIES
+
+
+def series_hash(df, symbol):
+    """
+    Hash the dates and every plotted series of a frame
+
+    Parameters:
+    df (pandas.DataFrame): Frame with price and indicator columns
+    symbol (str): Stock symbol (part of the chart title)
+
+    Returns:
+    str: Hex digest that changes whenever the rendered charts would
+    """
+    digest = hashlib.sha1(symbol.encode())
+    digest.update(np.ascontiguousarray(df.index.asi8).tobytes())
+    for col in PLOTTED_COLUMNS:
+        digest.update(np.ascontiguousarray(df[col].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+class ChartRenderer:
+    def __init__(self, output_dir='output'):
+        """
+        Render the per-symbol technical and momentum charts from reusable templates
+
+        Both figures are built once with the object-oriented Agg API; each
+        render only swaps the line data, titles and limits. A content hash of
+        the plotted series is stored next to the charts so unchanged symbols
+        are not redrawn on the next run.
+
+        Parameters:
+        output_dir (str): Directory the PNG files are written to
+        """
+        self.output_dir = output_dir
+        self.hash_dir = os.path.join(output_dir, '.chart_hashes')
+        os.makedirs(self.hash_dir, exist_ok=True)
+        self._build_technical_template()
+        self._build_momentum_template()
+
+    def _build_technical_template(self):
+        self.technical_fig = Figure(figsize=(12, 6))
+        FigureCanvasAgg(self.technical_fig)
+        ax = self.technical_fig.add_subplot()
+        ax.xaxis_date()
+        self.technical_ax = ax
+        self.technical_lines = {}
+        for col, label in TECHNICAL_SERIES:
+            style = {'linestyle': '--', 'alpha': 0.7} if col.startswith('BB_') else \
+                {'alpha': 0.5 if col == 'Close' else 0.7}
+            self.technical_lines[col], = ax.plot([], [], label=label, **style)
+        ax.legend()
+
+    def _build_momentum_template(self):
+        self.momentum_fig = Figure(figsize=(12, 10))
+        FigureCanvasAgg(self.momentum_fig)
+        ax1, ax2, ax3 = self.momentum_fig.subplots(3, 1, sharex=True)
+        ax1.xaxis_date()
+
+        # RSI
+        self.rsi_line, = ax1.plot([], [], label='RSI')
+        ax1.axhline(y=70, color='r', linestyle='--')
+        ax1.axhline(y=30, color='g', linestyle='--')
+        ax1.set_title('RSI')
+        ax1.legend()
+
+        # MACD
+        self.macd_line, = ax2.plot([], [], label='MACD')
+        self.signal_line, = ax2.plot([], [], label='Signal Line')
+        ax2.set_title('MACD')
+        ax2.legend()
+
+        # Volume, drawn as vertical segments so the bars can be swapped in place
+        self.volume_bars = ax3.vlines([], [], [], label='Volume', alpha=0.5, linewidth=2)
+        ax3.set_title('Volume')
+
+        self.momentum_axes = (ax1, ax2, ax3)
+        self.momentum_fig.tight_layout()
+
+    def _paths(self, symbol):
+        return (os.path.join(self.output_dir, f'{symbol}_technical.png'),
+                os.path.join(self.output_dir, f'{symbol}_momentum.png'),
+                os.path.join(self.hash_dir, f'{symbol}.sha1'))
+
+    def is_current(self, df, symbol, digest=None):
+        """Check whether the charts on disk were rendered from identical data"""
+        technical_path, momentum_path, hash_path = self._paths(symbol)
+        if not (os.path.exists(technical_path) and os.path.exists(momentum_path)
+                and os.path.exists(hash_path)):
+            return False
+        with open(hash_path) as f:
+            return f.read().strip() == (digest or series_hash(df, symbol))
+
+    @staticmethod
+    def _rescale(ax):
+        ax.relim()
+        ax.autoscale_view()
+
+    def render(self, df, symbol, force=False):
+        """
+        Write `{symbol}_technical.png` and `{symbol}_momentum.png`
+
+        Parameters:
+        df (pandas.DataFrame): Frame with price and indicator columns
+        symbol (str): Stock symbol
+        force (bool): Redraw even if the plotted data has not changed
+
+        Returns:
+        bool: True if the charts were redrawn, False if they were up to date
+        """
+        digest = series_hash(df, symbol)
+        if not force and self.is_current(df, symbol, digest):
+            return False
+
+        technical_path, momentum_path, hash_path = self._paths(symbol)
+        index = df.index.tz_localize(None) if getattr(df.index, 'tz', None) is not None else df.index
+        x = date2num(index.to_pydatetime())
+
+        # Price, Moving Averages, and Bollinger Bands
+        for col, line in self.technical_lines.items():
+            line.set_data(x, df[col].to_numpy(dtype=np.float64))
+        self.technical_ax.set_title(f'{symbol} Price and Technical Indicators')
+        self._rescale(self.technical_ax)
+        self.technical_fig.savefig(technical_path)
+
+        # Momentum Indicators
+        ax1, ax2, ax3 = self.momentum_axes
+        self.rsi_line.set_data(x, df['RSI'].to_numpy(dtype=np.float64))
+        self.macd_line.set_data(x, df['MACD'].to_numpy(dtype=np.float64))
+        self.signal_line.set_data(x, df['Signal_Line'].to_numpy(dtype=np.float64))
+        volume = df['Volume'].to_numpy(dtype=np.float64)
+        self.volume_bars.set_segments(
+            np.stack([np.column_stack([x, np.zeros_like(volume)]), np.column_stack([x, volume])], axis=1))
+        self._rescale(ax1)
+        self._rescale(ax2)
+        ax3.set_ylim(0, (np.nanmax(volume) if len(volume) else 1) * 1.05)
+        self.momentum_fig.savefig(momentum_path)
+
+        with open(hash_path, 'w') as f:
+            f.write(digest)
+        return True
+
+
+_worker_renderer = None
+
+
+def _init_worker(output_dir):
+    global _worker_renderer
+    _worker_renderer = ChartRenderer(output_dir)
+
+
+def _render_in_worker(item):
+    symbol, df = item
+    try:
+        return symbol, _worker_renderer.render(df, symbol, force=True)
+    except Exception as e:
+        print(f"Error creating plots for {symbol}: {str(e)}")
+        return symbol, False
+
+
+def render_many(frames, output_dir='output', processes=2):
+    """
+    Render charts for many symbols across worker processes
+
+    Unchanged symbols are filtered out before any data is sent to a worker.
+
+    Parameters:
+    frames (dict): Stock symbols as keys and indicator DataFrames as values
+    output_dir (str): Directory the PNG files are written to
+    processes (int): Number of rendering processes
+
+    Returns:
+    list: Symbols whose charts were redrawn
+    """
+    checker = ChartRenderer(output_dir)
+    stale = [(symbol, df[PLOTTED_COLUMNS]) for symbol, df in frames.items()
+             if not checker.is_current(df, symbol)]
+    if not stale:
+        return []
+    if processes <= 1:
+        return [symbol for symbol, df in stale if checker.render(df, symbol, force=True)]
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(output_dir,)) as executor:
+        return [symbol for symbol, rendered in executor.map(_render_in_worker, stale, chunksize=4)
+                if rendered]
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+# Relative precision of the compact layout: every float column is rounded to
+# the nearest float32, so |compact - full| <= COMPACT_RTOL * |full| for each
+# value (NaN stays NaN). Indicators are computed in float64 first and only
+# stored as float32, so the error does not compound across indicators.
+COMPACT_RTOL = 2.0 ** -24
+
+# Corporate-action columns from yfinance; almost every value is zero
+ACTION_COLUMNS = ['Dividends', 'Stock Splits', 'Capital Gains']
+
+
+def compact_frame(df):
+    """
+    Store a price/indicator frame in a memory-lean layout
+
+    - float columns become one consolidated float32 block
+    - Volume becomes uint32 when it fits (int64 otherwise)
+    - corporate-action columns are dropped when all zero and kept as sparse
+      float32 columns (zero fill) otherwise
+
+    Roughly halves the per-symbol footprint of an analysed frame. Values are
+    within COMPACT_RTOL of the float64 originals.
+
+    Parameters:
+    df (pandas.DataFrame): Frame with float64 price and indicator columns
+
+    Returns:
+    pandas.DataFrame: Compact frame with the same index and column order
+    """
+    actions = {}
+    for col in ACTION_COLUMNS:
+        if col in df.columns:
+            values = df[col].to_numpy(dtype=np.float32)
+            if np.any(values != 0):
+                actions[col] = pd.arrays.SparseArray(values, fill_value=np.float32(0))
+
+    float_cols = [col for col in df.columns
+                  if col not in ACTION_COLUMNS and col != 'Volume' and pd.api.types.is_float_dtype(df[col])]
+    compact = pd.DataFrame(df[float_cols].to_numpy(dtype=np.float32), index=df.index, columns=float_cols)
+
+    if 'Volume' in df.columns:
+        volume = df['Volume'].to_numpy()
+        if np.issubdtype(volume.dtype, np.floating):
+            volume = np.nan_to_num(volume)
+        fits = len(volume) == 0 or (volume.min() >= 0 and volume.max() <= np.iinfo(np.uint32).max)
+        compact['Volume'] = volume.astype(np.uint32 if fits else np.int64)
+
+    for col, values in actions.items():
+        compact[col] = values
+
+    # Anything not handled above (e.g. object columns) is carried over unchanged
+    for col in df.columns:
+        if col not in compact.columns and col not in ACTION_COLUMNS:
+            compact[col] = df[col]
+
+    order = [col for col in df.columns if col in compact.columns]
+    return compact[order]
+
+
+def frame_nbytes(df):
+    """Return the in-memory size of a frame's values and index in bytes"""
+    return int(df.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,223 @@
+import numpy as np
+import pandas as pd
+from sklearn.cluster import AgglomerativeClustering
+from src.utils import calculate_returns
+
+
+def returns_panel(frames, min_bars=2):
+    """
+    Daily returns of a universe as one (dates x symbols) frame
+
+    Parameters:
+    frames (dict): Stock symbols as keys and OHLCV DataFrames as values
+    min_bars (int): Drop symbols with fewer bars than this
+
+    Returns:
+    pandas.DataFrame: Returns on the union of all dates, NaN where a symbol has no bar
+    """
+    returns = {symbol: calculate_returns(df)[0] for symbol, df in frames.items()
+               if df is not None and len(df) >= min_bars}
+    return pd.DataFrame(returns).sort_index().iloc[1:]
+
+
+def correlation_matrix(returns, block_size=1024, min_periods=20, out=None):
+    """
+    Pairwise-complete correlation matrix computed in blocks
+
+    Each pair uses the dates on which both symbols have a return, as
+    pandas.DataFrame.corr does. The sums that formula needs come from six
+    matrix products per (block_size x block_size) tile, so temporary
+    memory depends on the block size rather than the universe. Pass a
+    np.memmap as `out` to keep even the result off the heap.
+
+    Parameters:
+    returns (numpy.ndarray): (dates x symbols) returns, NaN where missing
+    block_size (int): Symbols per tile
+    min_periods (int): Pairs with fewer common dates are NaN
+    out (numpy.ndarray): Optional (symbols x symbols) array to write into
+
+    Returns:
+    numpy.ndarray: (symbols x symbols) correlations
+    """
+    valid = ~np.isnan(returns)
+    mask = valid.astype(np.float64)
+    # Centre first so the sums below do not cancel catastrophically
+    with np.errstate(invalid='ignore'):
+        mean = np.nanmean(returns, axis=0)
+    x = np.where(valid, returns - mean, 0.0)
+    xx = x * x
+
+    n_symbols = returns.shape[1]
+    if out is None:
+        out = np.empty((n_symbols, n_symbols))
+    for i in range(0, n_symbols, block_size):
+        bi = slice(i, min(i + block_size, n_symbols))
+        for j in range(i, n_symbols, block_size):
+            bj = slice(j, min(j + block_size, n_symbols))
+            n = mask[:, bi].T @ mask[:, bj]
+            sx = x[:, bi].T @ mask[:, bj]
+            sy = mask[:, bi].T @ x[:, bj]
+            sxx = xx[:, bi].T @ mask[:, bj]
+            syy = mask[:, bi].T @ xx[:, bj]
+            sxy = x[:, bi].T @ x[:, bj]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                corr = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+            corr[n < min_periods] = np.nan
+            np.clip(corr, -1.0, 1.0, out=corr)
+            out[bi, bj] = corr
+            out[bj, bi] = corr.T
+    return out
+
+
+class RollingCovariance:
+    def __init__(self, n_symbols, window, recompute_every=250):
+        """
+        Covariance of the last `window` bars, updated as bars arrive
+
+        Keeps the column sums and the cross-product matrix of the window;
+        appending k bars adds their products and subtracts those of the k
+        bars leaving, an O(k * symbols^2) update instead of the
+        O(window * symbols^2) of a recomputation. Memory is the
+        cross-product matrix plus a (window x symbols) ring buffer,
+        whatever the history length. The sums are rebuilt from the buffer
+        every `recompute_every` bars so rounding error cannot accumulate.
+
+        A symbol missing a bar in the window has NaN covariances until that
+        bar leaves the window, like pandas rolling with min_periods=window.
+
+        Parameters:
+        n_symbols (int): Number of symbols (columns)
+        window (int): Bars per window
+        recompute_every (int): Bars between exact rebuilds
+        """
+        self.n_symbols = n_symbols
+        self.window = window
+        self.recompute_every = recompute_every
+        self.buffer = np.zeros((window, n_symbols))
+        self.missing = np.zeros((window, n_symbols), dtype=bool)
+        self.sums = np.zeros(n_symbols)
+        self.cross = np.zeros((n_symbols, n_symbols))
+        self.n_missing = np.zeros(n_symbols, dtype=np.int64)
+        self.count = 0
+        self.since_rebuild = 0
+
+    def _rebuild(self):
+        rows = self.buffer[:min(self.count, self.window)]
+        self.sums = rows.sum(axis=0)
+        self.cross = rows.T @ rows
+        self.n_missing = self.missing[:min(self.count, self.window)].sum(axis=0)
+        self.since_rebuild = 0
+
+    def update(self, rows):
+        """
+        Append one or more bars
+
+        Parameters:
+        rows (numpy.ndarray): (bars x symbols) returns, or one bar as a 1-D array
+        """
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        # Batches longer than the window only leave their last `window` bars behind
+        rows = rows[-self.window:]
+        missing = np.isnan(rows)
+        values = np.where(missing, 0.0, rows)
+
+        positions = (self.count + np.arange(len(rows))) % self.window
+        if self.count >= self.window:
+            leaving = positions
+        else:
+            leaving = positions[self.count + np.arange(len(rows)) >= self.window]
+        old = self.buffer[leaving]
+        self.sums += values.sum(axis=0) - old.sum(axis=0)
+        self.cross += values.T @ values - old.T @ old
+        self.n_missing += missing.sum(axis=0) - self.missing[leaving].sum(axis=0)
+
+        self.buffer[positions] = values
+        self.missing[positions] = missing
+        self.count += len(rows)
+        self.since_rebuild += len(rows)
+        if self.since_rebuild >= self.recompute_every:
+            self._rebuild()
+
+    def covariance(self):
+        """Sample covariance of the current window (NaN until it is full)"""
+        if self.count < self.window:
+            return np.full((self.n_symbols, self.n_symbols), np.nan)
+        w = self.window
+        # In place, so the only new (symbols x symbols) array is the result
+        cov = np.outer(self.sums, self.sums / -w)
+        cov += self.cross
+        cov /= w - 1
+        incomplete = self.n_missing > 0
+        cov[incomplete, :] = np.nan
+        cov[:, incomplete] = np.nan
+        return cov
+
+    def correlation(self):
+        """Correlation of the current window (NaN until it is full)"""
+        cov = self.covariance()
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov /= std[:, None]
+            cov /= std[None, :]
+        return np.clip(cov, -1.0, 1.0, out=cov)
+
+
+def rolling_correlations(returns, window=63, step=21):
+    """
+    Rolling correlation matrices, one every `step` bars
+
+    A generator: only the current matrix is alive at a time, so a
+    5,000-symbol universe needs the cross-product matrix, the ring buffer
+    and one output matrix regardless of history length.
+
+    Parameters:
+    returns (pandas.DataFrame): (dates x symbols) returns
+    window (int): Bars per window
+    step (int): Bars between emitted matrices
+
+    Yields:
+    tuple: (window end date, (symbols x symbols) numpy correlation array);
+    nothing when there are fewer than `window` bars
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    if len(values) < window:
+        return
+    rolling = RollingCovariance(values.shape[1], window)
+    start = window
+    rolling.update(values[:start])
+    yield returns.index[start - 1], rolling.correlation()
+    for stop in range(start + step, len(values) + 1, step):
+        rolling.update(values[stop - step:stop])
+        yield returns.index[stop - 1], rolling.correlation()
+
+
+def cluster_symbols(corr, symbols, n_clusters=None, distance_threshold=0.6):
+    """
+    Hierarchical (average linkage) clusters of co-moving symbols
+
+    Correlations become distances sqrt((1 - rho) / 2), in [0, 1]; pairs
+    without a correlation are treated as unrelated (distance 1).
+
+    Parameters:
+    corr (numpy.ndarray): (symbols x symbols) correlation matrix
+    symbols (list): Symbol of every row
+    n_clusters (int): Number of clusters; None cuts the tree at `distance_threshold`
+    distance_threshold (float): Linkage distance at which to cut when n_clusters is None
+
+    Returns:
+    pandas.Series: Cluster label per symbol, largest cluster first
+    """
+    distance = np.sqrt(np.clip((1.0 - corr) / 2.0, 0.0, 1.0))
+    distance = np.where(np.isnan(distance), 1.0, distance)
+    np.fill_diagonal(distance, 0.0)
+    if len(symbols) < 2:
+        return pd.Series(np.zeros(len(symbols), dtype=int), index=list(symbols), name='Cluster')
+
+    model = AgglomerativeClustering(n_clusters=n_clusters, metric='precomputed', linkage='average',
+                                    distance_threshold=None if n_clusters else distance_threshold)
+    labels = model.fit_predict(distance)
+    # Relabel so cluster 0 is the largest
+    sizes = np.bincount(labels)
+    rank = np.empty_like(sizes)
+    rank[np.argsort(-sizes, kind='stable')] = np.arange(len(sizes))
+    return pd.Series(rank[labels], index=list(symbols), name='Cluster')
@@ -1,10 +1,101 @@
 import yfinance as yf
 import pandas as pd
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+
+class RateLimiter:
+    def __init__(self, calls_per_second=1.0):
+        """
+        Thread-safe limiter shared by every worker that talks to the provider
+
+        Parameters:
+        calls_per_second (float): Maximum number of requests started per second
+        """
+        self.min_interval = 1.0 / calls_per_second if calls_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Block until the caller is allowed to issue its next request"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+def yahoo_batch_provider(symbols, period='1y', start=None, interval='1d'):
+    """
+    Download several symbols in a single Yahoo Finance request
+
+    Parameters:
+    symbols (list): Stock symbols in the batch
+    period (str): Time period, ignored when `start` is given
+    start (str or datetime): Only fetch bars from this date onwards
+    interval (str): Bar interval
+
+    Returns:
+    dict: Stock symbols as keys and DataFrames shaped like Ticker.history() as values
+    """
+    window = {'start': start} if start is not None else {'period': period}
+    raw = yf.download(symbols, interval=interval, group_by='ticker', auto_adjust=True,
+                      actions=True, threads=False, ignore_tz=False, progress=False, **window)
+    return split_batch_frame(raw, symbols)
+
+
+def split_batch_frame(raw, symbols):
+    """
+    Split a multi-symbol download into one DataFrame per symbol
+
+    Parameters:
+    raw (pandas.DataFrame): Frame returned by yf.download
+    symbols (list): Symbols that were requested
+
+    Returns:
+    dict: Stock symbols as keys and DataFrames as values
+    """
+    frames = {}
+    if raw is None or raw.empty:
+        return frames
+
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # yfinance returns flat columns when a single symbol was requested
+        raw = pd.concat({symbols[0]: raw}, axis=1)
+
+    available = raw.columns.get_level_values(0)
+    for symbol in symbols:
+        if symbol not in available:
+            continue
+        df = raw[symbol].dropna(how='all')
+        if df.empty:
+            continue
+        # Symbols listed later than the rest of the batch are padded with NaN
+        df = df.dropna(subset=['Close'])
+        if 'Volume' in df.columns:
+            df = df.assign(Volume=df['Volume'].fillna(0).astype('int64'))
+        df.columns.name = None
+        frames[symbol] = df
+    return frames
+
+
 class DataFetcher:
-    def __init__(self):
+    def __init__(self, provider=None, rate_limiter=None):
+        """
+        Parameters:
+        provider (callable): Batch provider taking (symbols, period) and returning
+            a dict of DataFrames. Defaults to yahoo_batch_provider; tests can pass a stub.
+            Providers used for incremental fetches must also accept `start` and
+            `interval` keyword arguments.
+        rate_limiter (RateLimiter): Limiter shared by all fetch workers
+        """
         self.data = None
+        self.provider = provider or yahoo_batch_provider
+        self.rate_limiter = rate_limiter or RateLimiter(calls_per_second=2.0)
         
     def fetch_stock_data(self, symbol, period='1y'):
         """
@@ -25,23 +116,52 @@ class DataFetcher:
             print(f"Error fetching data for {symbol}: {str(e)}")
             return None
     
-    def fetch_multiple_stocks(self, symbols, period='1y'):
+    def fetch_multiple_stocks(self, symbols, period='1y', batch_size=50, max_workers=4,
+                              start=None, interval='1d'):
         """
         Fetch data for multiple stocks
         
+        Symbols are grouped into batches of `batch_size`, each batch is downloaded
+        in one request, and batches run on a bounded worker pool that shares
+        `self.rate_limiter`. Passing batch_size=1 and max_workers=1 reproduces
+        the old one-symbol-at-a-time behaviour.
+        
         Parameters:
         symbols (list): List of stock symbols
         period (str): Time period
+        batch_size (int): Number of symbols per provider request
+        max_workers (int): Number of concurrent provider requests
+        start (str or datetime): Only fetch bars from this date onwards
+        interval (str): Bar interval
         
         Returns:
         dict: Dictionary with stock symbols as keys and DataFrames as values
         """
+        symbols = list(dict.fromkeys(symbols))
+        batches = [symbols[i:i + batch_size] for i in range(0, len(symbols), batch_size)]
+        window = {}
+        if start is not None:
+            window['start'] = start
+        if interval != '1d':
+            window['interval'] = interval
+
+        def fetch_batch(batch):
+            self.rate_limiter.wait()
+            try:
+                return self.provider(batch, period, **window)
+            except Exception as e:
+                print(f"Error fetching batch {batch[0]}..{batch[-1]}: {str(e)}")
+                return {}
+
         stock_data = {}
-        for symbol in symbols:
-            data = self.fetch_stock_data(symbol, period)
-            if data is not None:
-                stock_data[symbol] = data
-        return stock_data
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for frames in executor.map(fetch_batch, batches):
+                for symbol, data in frames.items():
+                    if data is not None and not data.empty:
+                        stock_data[symbol] = data
+
+        # Keep the caller's ordering regardless of which batch finished first
+        return {symbol: stock_data[symbol] for symbol in symbols if symbol in stock_data}
     
     def get_stock_info(self, symbol):
         """
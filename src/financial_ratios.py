@@ -0,0 +1,217 @@
+import os
+import numpy as np
+import pandas as pd
+from src.screener import to_float
+
+# Canonical line item -> (statement, labels to try in order). yfinance has
+# renamed several rows between releases, so older labels are kept as aliases.
+LINE_ITEMS = {
+    'Revenue': ('Income_Statement', ['Total Revenue', 'Operating Revenue']),
+    'Gross_Profit': ('Income_Statement', ['Gross Profit']),
+    'Operating_Income': ('Income_Statement', ['Operating Income', 'Total Operating Income As Reported']),
+    'EBIT': ('Income_Statement', ['EBIT', 'Operating Income']),
+    'Pretax_Income': ('Income_Statement', ['Pretax Income', 'Income Before Tax']),
+    'Tax_Provision': ('Income_Statement', ['Tax Provision', 'Income Tax Expense']),
+    'Interest_Expense': ('Income_Statement', ['Interest Expense', 'Interest Expense Non Operating']),
+    'Net_Income': ('Income_Statement', ['Net Income', 'Net Income Common Stockholders']),
+    'Total_Assets': ('Balance_Sheet', ['Total Assets']),
+    'Equity': ('Balance_Sheet', ['Stockholders Equity', 'Total Stockholder Equity', 'Common Stock Equity']),
+    'Total_Debt': ('Balance_Sheet', ['Total Debt', 'Long Term Debt']),
+    'Cash': ('Balance_Sheet', ['Cash And Cash Equivalents', 'Cash']),
+    'Current_Assets': ('Balance_Sheet', ['Current Assets', 'Total Current Assets']),
+    'Current_Liabilities': ('Balance_Sheet', ['Current Liabilities', 'Total Current Liabilities']),
+    'Operating_Cash_Flow': ('Cash_Flow', ['Operating Cash Flow', 'Total Cash From Operating Activities']),
+    'Capital_Expenditure': ('Cash_Flow', ['Capital Expenditure', 'Capital Expenditures']),
+    'Free_Cash_Flow': ('Cash_Flow', ['Free Cash Flow'])
+}
+
+# Used for NOPAT when the effective rate is missing or outside [0, 1]
+DEFAULT_TAX_RATE = 0.21
+
+
+def align_statements(statements, n_periods=4):
+    """
+    Stack statements of many symbols into (symbols x periods) arrays
+
+    Periods follow the income statement's columns, latest first; balance
+    sheet and cash flow columns are matched to them by period end date.
+
+    Parameters:
+    statements (dict): Stock symbols as keys and get_financial_statements dicts as values
+    n_periods (int): Number of periods kept per symbol
+
+    Returns:
+    tuple: (symbols, period end dates as datetime64 array, dict of line item arrays)
+    """
+    symbols = list(statements)
+    periods = np.full((len(symbols), n_periods), np.datetime64('NaT'), dtype='datetime64[ns]')
+    items = {item: np.full((len(symbols), n_periods), np.nan) for item in LINE_ITEMS}
+
+    for i, symbol in enumerate(symbols):
+        frames = statements[symbol]
+        income = frames.get('Income_Statement')
+        if income is None or income.empty:
+            continue
+        dates = np.asarray(income.columns[:n_periods], dtype='datetime64[ns]')
+        periods[i, :len(dates)] = dates
+        for name in ('Income_Statement', 'Balance_Sheet', 'Cash_Flow'):
+            df = frames.get(name)
+            if df is None or df.empty:
+                continue
+            # A handful of columns per statement: a direct comparison beats an Index lookup
+            match = np.asarray(df.columns, dtype='datetime64[ns]')[None, :] == dates[:, None]
+            found = match.any(axis=1)
+            columns = match.argmax(axis=1)
+            rows = {label: k for k, label in enumerate(df.index)}
+            values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+            for item, (statement, labels) in LINE_ITEMS.items():
+                if statement != name:
+                    continue
+                row = next((rows[label] for label in labels if label in rows), None)
+                if row is not None:
+                    items[item][i, :len(dates)][found] = values[row, columns[found]]
+    return symbols, periods, items
+
+
+def _div(a, b):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(b != 0, a / b, np.nan)
+
+
+def _growth(x):
+    """Change on the prior period (next column); NaN for the oldest period"""
+    growth = np.full(x.shape, np.nan)
+    growth[:, :-1] = _div(x[:, :-1] - x[:, 1:], np.abs(x[:, 1:]))
+    return growth
+
+
+def compute_ratios(items):
+    """
+    Financial ratios for every symbol and period in one pass
+
+    Ratios use period-end balances. Free cash flow falls back to operating
+    cash flow plus (negative) capital expenditure when it is not reported.
+
+    Parameters:
+    items (dict): Line item arrays from align_statements
+
+    Returns:
+    dict: Ratio name as key and (symbols x periods) float64 array as value
+    """
+    revenue, net_income, ebit = items['Revenue'], items['Net_Income'], items['EBIT']
+    equity, debt, cash = items['Equity'], items['Total_Debt'], items['Cash']
+    fcf = np.where(np.isnan(items['Free_Cash_Flow']),
+                   items['Operating_Cash_Flow'] + items['Capital_Expenditure'], items['Free_Cash_Flow'])
+
+    tax_rate = _div(items['Tax_Provision'], items['Pretax_Income'])
+    tax_rate = np.where((tax_rate >= 0) & (tax_rate <= 1), tax_rate, DEFAULT_TAX_RATE)
+    invested_capital = debt + equity - np.nan_to_num(cash)
+
+    return {
+        'Gross_Margin': _div(items['Gross_Profit'], revenue),
+        'Operating_Margin': _div(items['Operating_Income'], revenue),
+        'Net_Margin': _div(net_income, revenue),
+        'FCF_Margin': _div(fcf, revenue),
+        'ROE': _div(net_income, equity),
+        'ROA': _div(net_income, items['Total_Assets']),
+        'ROIC': _div(ebit * (1 - tax_rate), invested_capital),
+        'Debt_To_Equity': _div(debt, equity),
+        'Debt_To_Assets': _div(debt, items['Total_Assets']),
+        'Net_Debt_To_EBIT': _div(debt - cash, ebit),
+        'Current_Ratio': _div(items['Current_Assets'], items['Current_Liabilities']),
+        'Interest_Coverage': _div(ebit, np.abs(items['Interest_Expense'])),
+        'Free_Cash_Flow': fcf,
+        'Revenue_Growth': _growth(revenue),
+        'Net_Income_Growth': _growth(net_income),
+        'FCF_Growth': _growth(fcf)
+    }
+
+
+def filing_key(frames):
+    """Latest period end of each statement; changes only when a new filing appears"""
+    dates = []
+    for name in ('Income_Statement', 'Balance_Sheet', 'Cash_Flow'):
+        df = frames.get(name)
+        dates.append(str(np.asarray(df.columns, dtype='datetime64[D]').max()) if df is not None and len(df.columns) else '')
+    return '|'.join(dates)
+
+
+class RatioEngine:
+    def __init__(self, cache_dir=None, n_periods=4):
+        """
+        Multi-period financial ratios for a universe, cached by filing
+
+        Each symbol's ratios are keyed by the latest period of its
+        statements, so a refresh only recomputes companies that have filed
+        since the last run; those are recomputed together in one
+        vectorised pass.
+
+        Parameters:
+        cache_dir (str): Directory of ratios.parquet; None keeps the cache in memory
+        n_periods (int): Number of periods computed per symbol
+        """
+        self.n_periods = n_periods
+        self.path = os.path.join(cache_dir, 'ratios.parquet') if cache_dir else None
+        self.keys = {}
+        self.ratios = self._load()
+
+    def _load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return pd.DataFrame()
+        try:
+            ratios = pd.read_parquet(self.path)
+            self.keys = ratios.groupby(level='Symbol')['Filing_Key'].first().to_dict()
+            return ratios
+        except Exception as e:
+            print(f"Error reading cached ratios: {str(e)}")
+            return pd.DataFrame()
+
+    def _save(self):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        self.ratios.to_parquet(tmp_path)
+        os.replace(tmp_path, self.path)
+
+    def _frame(self, statements):
+        symbols, periods, items = align_statements(statements, self.n_periods)
+        ratios = compute_ratios(items)
+        valid = ~np.isnat(periods)
+        index = pd.MultiIndex.from_arrays([np.repeat(symbols, self.n_periods)[valid.ravel()],
+                                           periods[valid]], names=['Symbol', 'Period'])
+        df = pd.DataFrame({name: values[valid] for name, values in ratios.items()}, index=index)
+        df['Filing_Key'] = df.index.get_level_values('Symbol').map(
+            {symbol: filing_key(statements[symbol]) for symbol in symbols})
+        return df
+
+    def compute(self, statements, market_caps=None):
+        """
+        Ratios for every symbol and period
+
+        Parameters:
+        statements (dict): Stock symbols as keys and get_financial_statements dicts as values
+        market_caps (dict): Stock symbols as keys and market capitalisation as values;
+            adds FCF_Yield (free cash flow over current market cap)
+
+        Returns:
+        pandas.DataFrame: Ratios indexed by (Symbol, Period), latest period first
+        """
+        keys = {symbol: filing_key(frames) for symbol, frames in statements.items()}
+        stale = [symbol for symbol, key in keys.items() if self.keys.get(symbol) != key]
+        if stale:
+            fresh = self._frame({symbol: statements[symbol] for symbol in stale})
+            kept = self.ratios[~self.ratios.index.get_level_values('Symbol').isin(stale)] \
+                if len(self.ratios) else self.ratios
+            self.ratios = pd.concat([kept, fresh]) if len(kept) else fresh
+            self.keys.update({symbol: keys[symbol] for symbol in stale})
+            self._save()
+
+        if not len(self.ratios):
+            return self.ratios
+        ratios = self.ratios[self.ratios.index.get_level_values('Symbol').isin(list(statements))]
+        ratios = ratios.drop(columns='Filing_Key')
+        if market_caps:
+            caps = np.array([to_float(market_caps.get(symbol)) for symbol in ratios.index.get_level_values('Symbol')])
+            ratios = ratios.assign(FCF_Yield=_div(ratios['Free_Cash_Flow'].to_numpy(), caps))
+        return ratios
@@ -1,10 +1,55 @@
-import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from src.fundamentals_cache import FundamentalsCache
+from src.financial_ratios import RatioEngine, align_statements, compute_ratios
+from src.screener import FundamentalScreener
+
+# Metric name -> Ticker.info field
+INFO_FIELDS = {
+    # Basic company information
+    'Company_Name': 'longName',
+    'Sector': 'sector',
+    'Industry': 'industry',
+    # Valuation metrics
+    'Market_Cap': 'marketCap',
+    'PE_Ratio': 'trailingPE',
+    'Forward_PE': 'forwardPE',
+    'PB_Ratio': 'priceToBook',
+    # Financial metrics
+    'Revenue': 'totalRevenue',
+    'Revenue_Growth': 'revenueGrowth',
+    'Profit_Margin': 'profitMargins',
+    'Operating_Margin': 'operatingMargins',
+    'ROE': 'returnOnEquity',
+    # Dividend information
+    'Dividend_Yield': 'dividendYield',
+    'Payout_Ratio': 'payoutRatio',
+    # Financial health
+    'Current_Ratio': 'currentRatio',
+    'Debt_To_Equity': 'debtToEquity'
+}
+
+
+def info_metrics(info):
+    """Map a Ticker.info dict onto the metric names, 'N/A' where a field is missing"""
+    return {metric: info.get(field, 'N/A') for metric, field in INFO_FIELDS.items()}
+
 
 class FundamentalAnalyzer:
-    def __init__(self):
-        """Initialize the Fundamental Analyzer"""
+    def __init__(self, cache=None, ratio_engine=None):
+        """
+        Initialize the Fundamental Analyzer
+
+        Parameters:
+        cache (FundamentalsCache): Store for info, statements and recommendations;
+            defaults to the persistent store under config.CACHE_DIR, so repeated
+            runs only refetch what has gone stale
+        ratio_engine (RatioEngine): Filing-keyed ratio cache; defaults to an in-memory one
+        """
+        self.cache = cache or FundamentalsCache()
+        self.ratio_engine = ratio_engine or RatioEngine()
+        # Metrics of the most recently analysed symbol, used by format_metrics
         self.metrics = {}
         
     def analyze_stock(self, symbol):
@@ -18,40 +63,62 @@ class FundamentalAnalyzer:
         dict: Fundamental analysis results
         """
         try:
-            stock = yf.Ticker(symbol)
-            info = stock.info
-            
-            # Basic company information
-            self.metrics['Company_Name'] = info.get('longName', 'N/A')
-            self.metrics['Sector'] = info.get('sector', 'N/A')
-            self.metrics['Industry'] = info.get('industry', 'N/A')
-            
-            # Valuation metrics
-            self.metrics['Market_Cap'] = info.get('marketCap', 'N/A')
-            self.metrics['PE_Ratio'] = info.get('trailingPE', 'N/A')
-            self.metrics['Forward_PE'] = info.get('forwardPE', 'N/A')
-            self.metrics['PB_Ratio'] = info.get('priceToBook', 'N/A')
-            
-            # Financial metrics
-            self.metrics['Revenue'] = info.get('totalRevenue', 'N/A')
-            self.metrics['Revenue_Growth'] = info.get('revenueGrowth', 'N/A')
-            self.metrics['Profit_Margin'] = info.get('profitMargins', 'N/A')
-            self.metrics['Operating_Margin'] = info.get('operatingMargins', 'N/A')
-            
-            # Dividend information
-            self.metrics['Dividend_Yield'] = info.get('dividendYield', 'N/A')
-            self.metrics['Payout_Ratio'] = info.get('payoutRatio', 'N/A')
-            
-            # Financial health
-            self.metrics['Current_Ratio'] = info.get('currentRatio', 'N/A')
-            self.metrics['Debt_To_Equity'] = info.get('debtToEquity', 'N/A')
-            
+            info = self.cache.get_info([symbol], fields=list(INFO_FIELDS.values())).get(symbol)
+            if info is None:
+                print(f"Error analyzing {symbol}: no info available")
+                return None
+            self.metrics = info_metrics(info)
             return self.metrics
             
         except Exception as e:
             print(f"Error analyzing {symbol}: {str(e)}")
             return None
+
+    def analyze_many(self, symbols, limit=None):
+        """
+        Perform fundamental analysis on a universe of stocks
+
+        Stale info is refreshed for the whole universe in one pass; fresh
+        entries come straight from the cache.
+
+        Parameters:
+        symbols (list): Stock symbols
+        limit (int): Refresh at most this many stale symbols (the rest use stored info)
+
+        Returns:
+        dict: Stock symbols as keys and fundamental analysis results as values
+        """
+        try:
+            fields = list(INFO_FIELDS.values())
+            self.cache.refresh(symbols, parts=('info',), fields=fields, limit=limit)
+            info = self.cache.get_info(symbols, fields=fields, refresh=False)
+            return {symbol: info_metrics(values) for symbol, values in info.items()}
+        except Exception as e:
+            print(f"Error analyzing fundamentals: {str(e)}")
+            return {}
     
+    def screen_universe(self, symbols, thresholds=None, limit=None):
+        """
+        Symbols passing config.FUNDAMENTAL_THRESHOLDS
+
+        Parameters:
+        symbols (list): Stock symbols
+        thresholds (dict): Overrides the configured thresholds
+        limit (int): Refresh at most this many stale symbols first
+
+        Returns:
+        pandas.DataFrame: Numeric metrics of the passing symbols indexed by symbol
+        (NaN where missing), or None on error
+        """
+        try:
+            metrics = self.analyze_many(symbols, limit=limit)
+            if not metrics:
+                return None
+            return FundamentalScreener.from_metrics(metrics).screen(thresholds)
+        except Exception as e:
+            print(f"Error screening fundamentals: {str(e)}")
+            return None
+
     def get_financial_statements(self, symbol):
         """
         Get financial statements for a stock
@@ -63,15 +130,7 @@ class FundamentalAnalyzer:
         dict: Dictionary containing financial statements
         """
         try:
-            stock = yf.Ticker(symbol)
-            
-            statements = {
-                'Income_Statement': stock.financials,
-                'Balance_Sheet': stock.balance_sheet,
-                'Cash_Flow': stock.cashflow
-            }
-            
-            return statements
+            return self.cache.get_statements([symbol]).get(symbol)
             
         except Exception as e:
             print(f"Error fetching financial statements for {symbol}: {str(e)}")
@@ -85,31 +144,42 @@ class FundamentalAnalyzer:
         statements (dict): Financial statements
         
         Returns:
-        dict: Financial ratios
+        dict: Financial ratios for the latest period ('N/A' where not computable)
         """
         ratios = {}
         
         if statements and all(k in statements for k in ['Income_Statement', 'Balance_Sheet']):
             try:
-                income = statements['Income_Statement']
-                balance = statements['Balance_Sheet']
-                
-                # Calculate ROE
-                if 'Net Income' in income.index and 'Total Stockholder Equity' in balance.index:
-                    net_income = income.loc['Net Income'].iloc[0]
-                    equity = balance.loc['Total Stockholder Equity'].iloc[0]
-                    ratios['ROE'] = net_income / equity if equity != 0 else 'N/A'
-                
-                # Calculate ROA
-                if 'Net Income' in income.index and 'Total Assets' in balance.index:
-                    net_income = income.loc['Net Income'].iloc[0]
-                    assets = balance.loc['Total Assets'].iloc[0]
-                    ratios['ROA'] = net_income / assets if assets != 0 else 'N/A'
+                items = align_statements({None: statements}, n_periods=2)[2]
+                for name, values in compute_ratios(items).items():
+                    ratios[name] = float(values[0, 0]) if not np.isnan(values[0, 0]) else 'N/A'
                 
             except Exception as e:
                 print(f"Error calculating ratios: {str(e)}")
                 
         return ratios
+
+    def financial_ratios(self, symbols):
+        """
+        Multi-period financial ratios for a universe of stocks
+
+        Statements and market caps come from the cache; ratios are only
+        recomputed for symbols with a new filing.
+
+        Parameters:
+        symbols (list): Stock symbols
+
+        Returns:
+        pandas.DataFrame: Ratios indexed by (Symbol, Period), or None on error
+        """
+        try:
+            statements = self.cache.get_statements(symbols)
+            info = self.cache.get_info(symbols, fields=['marketCap'], refresh=False)
+            market_caps = {symbol: values.get('marketCap') for symbol, values in info.items()}
+            return self.ratio_engine.compute(statements, market_caps)
+        except Exception as e:
+            print(f"Error calculating financial ratios: {str(e)}")
+            return None
     
     def get_analyst_recommendations(self, symbol):
         """
@@ -122,23 +192,25 @@ class FundamentalAnalyzer:
         pandas.DataFrame: Analyst recommendations
         """
         try:
-            stock = yf.Ticker(symbol)
-            return stock.recommendations
+            return self.cache.get_recommendations([symbol]).get(symbol)
         except Exception as e:
             print(f"Error fetching analyst recommendations for {symbol}: {str(e)}")
             return None
     
-    def format_metrics(self):
+    def format_metrics(self, metrics=None):
         """
         Format metrics for display
         
+        Parameters:
+        metrics (dict): Results of analyze_stock; defaults to the last analysed symbol
+        
         Returns:
         dict: Formatted metrics
         """
         formatted = {}
-        for key, value in self.metrics.items():
+        for key, value in (self.metrics if metrics is None else metrics).items():
             if isinstance(value, float):
-                if 'Ratio' in key or 'Margin' in key or 'Growth' in key or 'Yield' in key:
+                if 'Ratio' in key or 'Margin' in key or 'Growth' in key or 'Yield' in key or key == 'ROE':
                     formatted[key] = f"{value:.2%}" if value != 'N/A' else 'N/A'
                 else:
                     formatted[key] = f"{value:,.2f}" if value != 'N/A' else 'N/A'
@@ -0,0 +1,291 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
+from config import CACHE_DIR
+from src.data_fetcher import RateLimiter
+
+DAY = 86400
+
+# Seconds each Ticker.info field stays fresh. Price-driven fields go stale
+# daily, descriptive ones monthly; anything unlisted uses DEFAULT_INFO_TTL.
+INFO_TTLS = {
+    'marketCap': DAY,
+    'trailingPE': DAY,
+    'forwardPE': DAY,
+    'priceToBook': DAY,
+    'dividendYield': DAY,
+    'longName': 30 * DAY,
+    'sector': 30 * DAY,
+    'industry': 30 * DAY
+}
+DEFAULT_INFO_TTL = 7 * DAY
+
+# Statements are refetched once an earnings date passes after they were
+# stored; this age is the fallback when no earnings date is known
+STATEMENT_MAX_AGE = 100 * DAY
+RECOMMENDATION_TTL = DAY
+
+# Statement name -> Ticker attribute
+STATEMENTS = {
+    'Income_Statement': 'financials',
+    'Balance_Sheet': 'balance_sheet',
+    'Cash_Flow': 'cashflow'
+}
+
+PARTS = ('info', 'statements', 'recommendations')
+
+
+def _labels_to_json(labels):
+    if isinstance(labels, pd.DatetimeIndex):
+        # Aware labels are written in UTC so one parse handles every DST offset
+        tz = str(labels.tz) if labels.tz is not None else None
+        values = labels.tz_convert('UTC') if tz else labels
+        return {'dates': True, 'name': labels.name, 'tz': tz, 'values': [label.isoformat() for label in values]}
+    return {'dates': False, 'name': labels.name, 'values': [str(label) for label in labels]}
+
+
+def _labels_from_json(labels):
+    if labels['dates']:
+        # isoformat strings parse without a format on pandas 1.x and 2.x alike
+        index = pd.DatetimeIndex(labels['values'], name=labels['name'])
+        return index.tz_convert(labels['tz']) if labels.get('tz') else index
+    return pd.Index(labels['values'], dtype=object, name=labels['name'])
+
+
+def frame_to_json(df):
+    """Serialise a statement or recommendations frame (labels, values and NaN) to JSON"""
+    data = df.astype(object).where(df.notna(), None).values.tolist()
+    return json.dumps({'index': _labels_to_json(df.index), 'columns': _labels_to_json(df.columns),
+                       'data': data}, default=str)
+
+
+def frame_from_json(payload):
+    """Rebuild a frame written by frame_to_json"""
+    raw = json.loads(payload)
+    df = pd.DataFrame(raw['data'], index=_labels_from_json(raw['index']),
+                      columns=_labels_from_json(raw['columns']))
+    # All-None columns come back as object; make missing values NaN again
+    return df.fillna(np.nan).infer_objects()
+
+
+class FundamentalsCache:
+    def __init__(self, cache_dir=CACHE_DIR, ticker_factory=None, rate_limiter=None, max_workers=4,
+                 info_ttls=None, clock=time.time):
+        """
+        SQLite store for Ticker.info, financial statements and analyst recommendations
+
+        Each part has its own freshness rule: info fields expire per
+        INFO_TTLS, statements when an earnings date has passed since they
+        were stored, recommendations daily. `refresh` looks up the state of a
+        whole universe in one query and downloads only what is stale, using a
+        single Ticker per symbol for every part it needs, so repeated runs
+        over thousands of symbols only pay for what has changed.
+
+        Parameters:
+        cache_dir (str): Directory of fundamentals.sqlite, shared with the bar cache by default;
+            None keeps the store in memory for this session
+        ticker_factory (callable): Builds a Ticker-like object from a symbol; defaults to yf.Ticker
+        rate_limiter (RateLimiter): Limiter shared by every request to the provider
+        max_workers (int): Number of symbols fetched concurrently
+        info_ttls (dict): Overrides for INFO_TTLS
+        clock (callable): Returns the current time in epoch seconds
+        """
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, 'fundamentals.sqlite')
+        else:
+            path = ':memory:'
+        self.ticker_factory = ticker_factory or yf.Ticker
+        self.rate_limiter = rate_limiter or RateLimiter(calls_per_second=2.0)
+        self.max_workers = max_workers
+        self.info_ttls = dict(INFO_TTLS, **(info_ttls or {}))
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute('CREATE TABLE IF NOT EXISTS info '
+                              '(symbol TEXT PRIMARY KEY, payload TEXT NOT NULL, fetched_at REAL NOT NULL)')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS frames '
+                              '(symbol TEXT NOT NULL, name TEXT NOT NULL, payload TEXT NOT NULL, '
+                              'fetched_at REAL NOT NULL, PRIMARY KEY (symbol, name))')
+
+    def _query(self, sql, symbols, *args):
+        """Run a per-symbol SELECT for many symbols in chunks below SQLite's variable limit"""
+        rows = []
+        with self._lock:
+            for i in range(0, len(symbols), 500):
+                chunk = symbols[i:i + 500]
+                marks = ','.join('?' * len(chunk))
+                rows.extend(self.conn.execute(sql.format(marks=marks), list(args) + chunk).fetchall())
+        return rows
+
+    def _state(self, symbols):
+        """Stored info and part fetch times for every symbol, from two queries"""
+        state = {symbol: {'info': None, 'info_at': None, 'frames_at': {}} for symbol in symbols}
+        for symbol, payload, fetched_at in self._query(
+                'SELECT symbol, payload, fetched_at FROM info WHERE symbol IN ({marks})', symbols):
+            state[symbol]['info'] = json.loads(payload)
+            state[symbol]['info_at'] = fetched_at
+        for symbol, name, fetched_at in self._query(
+                'SELECT symbol, name, fetched_at FROM frames WHERE symbol IN ({marks})', symbols):
+            state[symbol]['frames_at'][name] = fetched_at
+        return state
+
+    def _info_ttl(self, fields):
+        if not fields:
+            return min(self.info_ttls.values(), default=DEFAULT_INFO_TTL)
+        return min(self.info_ttls.get(field, DEFAULT_INFO_TTL) for field in fields)
+
+    def _info_stale(self, entry, fields, now):
+        return entry['info_at'] is None or now - entry['info_at'] > self._info_ttl(fields)
+
+    def _statements_stale(self, entry, info, now):
+        times = [entry['frames_at'].get(name) for name in STATEMENTS]
+        if any(t is None for t in times):
+            return True
+        fetched_at = min(times)
+        if now - fetched_at > STATEMENT_MAX_AGE:
+            return True
+        # A report released since the statements were stored makes them stale
+        earnings = (info or {}).get('earningsTimestamp')
+        return isinstance(earnings, (int, float)) and fetched_at < earnings <= now
+
+    def _recommendations_stale(self, entry, now):
+        fetched_at = entry['frames_at'].get('Recommendations')
+        return fetched_at is None or now - fetched_at > RECOMMENDATION_TTL
+
+    def _needs(self, entry, parts, fields, now):
+        """Parts of one symbol that must be downloaded; statements are rechecked after info"""
+        needs = set()
+        if 'info' in parts and self._info_stale(entry, fields, now):
+            needs.add('info')
+        if 'statements' in parts and self._statements_stale(entry, entry['info'], now):
+            needs.add('statements')
+        if 'recommendations' in parts and self._recommendations_stale(entry, now):
+            needs.add('recommendations')
+        return needs
+
+    def _fetch(self, symbol, entry, parts, needs, now):
+        """Download the stale parts of one symbol through a single Ticker"""
+        fetched = {}
+        try:
+            ticker = self.ticker_factory(symbol)
+            info = entry['info']
+            if 'info' in needs:
+                self.rate_limiter.wait()
+                info = ticker.info or {}
+                fetched['info'] = info
+            # Fresh info may carry an earnings date that invalidates the stored statements
+            if 'statements' in needs or ('statements' in parts and self._statements_stale(entry, info, now)):
+                for name, attr in STATEMENTS.items():
+                    self.rate_limiter.wait()
+                    fetched[name] = getattr(ticker, attr)
+            if 'recommendations' in needs:
+                self.rate_limiter.wait()
+                fetched['Recommendations'] = ticker.recommendations
+        except Exception as e:
+            print(f"Error fetching fundamentals for {symbol}: {str(e)}")
+        return fetched
+
+    def _store(self, symbol, fetched, now):
+        with self._lock, self.conn:
+            if 'info' in fetched:
+                self.conn.execute('INSERT OR REPLACE INTO info VALUES (?, ?, ?)',
+                                  (symbol, json.dumps(fetched['info'], default=str), now))
+            for name, df in fetched.items():
+                if name != 'info' and isinstance(df, pd.DataFrame):
+                    self.conn.execute('INSERT OR REPLACE INTO frames VALUES (?, ?, ?, ?)',
+                                      (symbol, name, frame_to_json(df), now))
+
+    def refresh(self, symbols, parts=PARTS, fields=None, limit=None):
+        """
+        Download whatever is stale for a universe of symbols
+
+        Parameters:
+        symbols (list): Stock symbols; duplicates are fetched once
+        parts (tuple): Any of 'info', 'statements' and 'recommendations'
+        fields (list): Info fields the caller needs; their shortest TTL decides info staleness
+        limit (int): Refresh at most this many symbols, least recently fetched
+            first, so a large universe can be brought up to date over several runs
+
+        Returns:
+        list: Symbols that were fetched
+        """
+        symbols = list(dict.fromkeys(symbols))
+        now = self.clock()
+        state = self._state(symbols)
+        needs = {symbol: self._needs(state[symbol], parts, fields, now) for symbol in symbols}
+        stale = [symbol for symbol in symbols if needs[symbol]]
+        if limit is not None:
+            stale = sorted(stale, key=lambda symbol: state[symbol]['info_at'] or 0)[:limit]
+
+        def fetch(symbol):
+            return symbol, self._fetch(symbol, state[symbol], parts, needs[symbol], now)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            for symbol, fetched in executor.map(fetch, stale):
+                self._store(symbol, fetched, now)
+        return stale
+
+    def get_info(self, symbols, fields=None, refresh=True):
+        """
+        Ticker.info for many symbols
+
+        Parameters:
+        symbols (list): Stock symbols
+        fields (list): Info fields the caller needs (controls the TTL applied)
+        refresh (bool): Download stale entries first; False reads the store as is
+
+        Returns:
+        dict: Stock symbols as keys and info dicts as values, for symbols with stored info
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if refresh:
+            self.refresh(symbols, parts=('info',), fields=fields)
+        rows = self._query('SELECT symbol, payload FROM info WHERE symbol IN ({marks})', symbols)
+        info = {symbol: json.loads(payload) for symbol, payload in rows}
+        return {symbol: info[symbol] for symbol in symbols if symbol in info}
+
+    def _frames(self, symbols, names):
+        rows = self._query('SELECT symbol, name, payload FROM frames WHERE symbol IN ({marks})', symbols)
+        frames = {}
+        for symbol, name, payload in rows:
+            if name in names:
+                frames.setdefault(symbol, {})[name] = frame_from_json(payload)
+        return frames
+
+    def get_statements(self, symbols, refresh=True):
+        """
+        Income statement, balance sheet and cash flow for many symbols
+
+        Returns:
+        dict: Stock symbols as keys and {'Income_Statement', 'Balance_Sheet', 'Cash_Flow'} dicts as values
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if refresh:
+            self.refresh(symbols, parts=('info', 'statements'))
+        frames = self._frames(symbols, STATEMENTS)
+        return {symbol: frames[symbol] for symbol in symbols
+                if symbol in frames and len(frames[symbol]) == len(STATEMENTS)}
+
+    def get_recommendations(self, symbols, refresh=True):
+        """
+        Analyst recommendations for many symbols
+
+        Returns:
+        dict: Stock symbols as keys and recommendation DataFrames as values
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if refresh:
+            self.refresh(symbols, parts=('recommendations',))
+        frames = self._frames(symbols, ['Recommendations'])
+        return {symbol: frames[symbol]['Recommendations'] for symbol in symbols if symbol in frames}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,134 @@
+import hashlib
+import re
+import numpy as np
+
+# Financial news lexicon, word -> polarity in [-1, 1]. Hand-curated from the
+# terms that dominate market headlines; general-purpose lexicons misread many
+# of them (e.g. "liability", "share", "bull").
+LEXICON = {
+    # Positive
+    'beat': 0.6, 'beats': 0.6, 'tops': 0.5, 'exceeds': 0.5, 'exceeded': 0.5,
+    'surge': 0.7, 'surges': 0.7, 'surged': 0.7, 'soar': 0.8, 'soars': 0.8, 'soared': 0.8,
+    'jump': 0.5, 'jumps': 0.5, 'jumped': 0.5, 'rally': 0.6, 'rallies': 0.6, 'rallied': 0.6,
+    'gain': 0.4, 'gains': 0.4, 'gained': 0.4, 'rise': 0.3, 'rises': 0.3, 'rose': 0.3,
+    'climb': 0.4, 'climbs': 0.4, 'climbed': 0.4, 'rebound': 0.4, 'rebounds': 0.4,
+    'record': 0.4, 'high': 0.2, 'highs': 0.3, 'strong': 0.5, 'stronger': 0.5, 'robust': 0.5,
+    'growth': 0.4, 'grow': 0.3, 'grows': 0.3, 'expand': 0.3, 'expands': 0.3, 'expansion': 0.3,
+    'profit': 0.4, 'profitable': 0.5, 'profits': 0.4, 'upgrade': 0.7, 'upgrades': 0.7, 'upgraded': 0.7,
+    'outperform': 0.6, 'outperforms': 0.6, 'buy': 0.4, 'bullish': 0.7, 'optimistic': 0.5,
+    'raise': 0.4, 'raises': 0.4, 'raised': 0.4, 'boost': 0.5, 'boosts': 0.5, 'boosted': 0.5,
+    'approval': 0.5, 'approved': 0.5, 'approves': 0.5, 'win': 0.5, 'wins': 0.5, 'won': 0.5,
+    'breakthrough': 0.7, 'innovative': 0.4, 'partnership': 0.3, 'dividend': 0.2, 'buyback': 0.4,
+    'upbeat': 0.6, 'positive': 0.5, 'improve': 0.4, 'improves': 0.4, 'improved': 0.4,
+    'recovery': 0.4, 'momentum': 0.3, 'opportunity': 0.3, 'success': 0.5, 'successful': 0.5,
+    # Negative
+    'miss': -0.6, 'misses': -0.6, 'missed': -0.6, 'plunge': -0.8, 'plunges': -0.8, 'plunged': -0.8,
+    'tumble': -0.7, 'tumbles': -0.7, 'tumbled': -0.7, 'sink': -0.6, 'sinks': -0.6, 'sank': -0.6,
+    'drop': -0.5, 'drops': -0.5, 'dropped': -0.5, 'fall': -0.4, 'falls': -0.4, 'fell': -0.4,
+    'slide': -0.5, 'slides': -0.5, 'slump': -0.6, 'slumps': -0.6, 'decline': -0.4, 'declines': -0.4,
+    'loss': -0.5, 'losses': -0.5, 'lose': -0.4, 'loses': -0.4, 'weak': -0.5, 'weaker': -0.5,
+    'downgrade': -0.7, 'downgrades': -0.7, 'downgraded': -0.7, 'underperform': -0.6, 'sell': -0.4,
+    'bearish': -0.7, 'pessimistic': -0.5, 'cut': -0.4, 'cuts': -0.4, 'slash': -0.6, 'slashes': -0.6,
+    'layoff': -0.5, 'layoffs': -0.5, 'lawsuit': -0.5, 'sued': -0.5, 'probe': -0.5, 'investigation': -0.5,
+    'fraud': -0.9, 'scandal': -0.8, 'recall': -0.5, 'recalls': -0.5, 'fine': -0.3, 'fined': -0.5,
+    'bankruptcy': -0.9, 'bankrupt': -0.9, 'default': -0.7, 'warning': -0.5, 'warns': -0.5,
+    'concern': -0.4, 'concerns': -0.4, 'risk': -0.3, 'risks': -0.3, 'fear': -0.5, 'fears': -0.5,
+    'volatile': -0.3, 'volatility': -0.2, 'delay': -0.4, 'delays': -0.4, 'delayed': -0.4,
+    'halt': -0.5, 'halts': -0.5, 'halted': -0.5, 'crash': -0.8, 'crashes': -0.8, 'selloff': -0.6,
+    'downturn': -0.5, 'recession': -0.6, 'negative': -0.5, 'disappointing': -0.6, 'disappoints': -0.6,
+    'lowers': -0.4, 'lowered': -0.4, 'shortfall': -0.6, 'struggle': -0.5, 'struggles': -0.5
+}
+
+# Words that flip the polarity of the word right after them
+NEGATORS = {'not', 'no', 'never', 'without', "isn't", "wasn't", "doesn't", "didn't", "won't", "can't"}
+
+TOKEN_PATTERN = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+def normalize_text(text):
+    """Lowercase a headline and collapse its whitespace"""
+    return ' '.join((text or '').lower().split())
+
+
+def text_key(text):
+    """Stable 64-bit key of a headline's normalised text, used to memoise scores"""
+    return hashlib.blake2b(normalize_text(text).encode(), digest_size=8).digest()
+
+
+class HeadlineScorer:
+    def __init__(self, lexicon=None, negators=NEGATORS, alpha=1.0, max_cache=500000):
+        """
+        Offline lexicon scorer for headlines and short posts
+
+        The lexicon is compiled to a vocabulary and a weight array, and each
+        batch is scored with one lookup and one weighted bincount over all of
+        its tokens. A negator flips the polarity of the word that follows it.
+        The summed polarity s is squashed to s / sqrt(s^2 + alpha), in
+        (-1, 1). Scores are memoised by a hash of the normalised text, so a
+        syndicated headline repeated under many tickers is scored once.
+
+        Parameters:
+        lexicon (dict): Word -> polarity; defaults to LEXICON
+        negators (set): Words that flip the next word's polarity
+        alpha (float): Normalisation constant; larger values compress scores towards 0
+        max_cache (int): Memoised scores kept before the memo is cleared
+        """
+        lexicon = LEXICON if lexicon is None else lexicon
+        # Id 0 is every out-of-vocabulary word
+        self.vocab = {word: k + 1 for k, word in enumerate(lexicon)}
+        self.weights = np.concatenate([[0.0], np.fromiter(lexicon.values(), dtype=np.float64)])
+        self.negator_id = len(self.vocab) + 1
+        for word in negators:
+            self.vocab.setdefault(word, self.negator_id)
+        self.weights = np.append(self.weights, 0.0)
+        self.alpha = alpha
+        self.max_cache = max_cache
+        self.cache = {}
+
+    def _score_tokens(self, documents):
+        lengths = np.fromiter((len(tokens) for tokens in documents), dtype=np.int64, count=len(documents))
+        vocab_get = self.vocab.get
+        ids = np.fromiter((vocab_get(token, 0) for tokens in documents for token in tokens),
+                          dtype=np.int64, count=int(lengths.sum()))
+        doc = np.repeat(np.arange(len(documents)), lengths)
+
+        weights = self.weights[ids]
+        # Flip a word that follows a negator in the same headline
+        negated = np.zeros(len(ids), dtype=bool)
+        negated[1:] = (ids[:-1] == self.negator_id) & (doc[1:] == doc[:-1])
+        weights[negated] = -weights[negated]
+
+        total = np.bincount(doc, weights=weights, minlength=len(documents))
+        return total / np.sqrt(total * total + self.alpha)
+
+    def score(self, texts):
+        """
+        Score a batch of texts
+
+        Parameters:
+        texts (list): Headlines or posts
+
+        Returns:
+        numpy.ndarray: Sentiment in (-1, 1) per text, 0.0 for texts without lexicon words
+        """
+        keys = [text_key(text) for text in texts]
+        scores = np.empty(len(texts))
+
+        missing = {}
+        for k, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is None:
+                missing.setdefault(key, []).append(k)
+            else:
+                scores[k] = cached
+
+        if missing:
+            # Only texts not seen before are tokenised
+            fresh = self._score_tokens([TOKEN_PATTERN.findall(normalize_text(texts[rows[0]]))
+                                        for rows in missing.values()])
+            if len(self.cache) + len(missing) > self.max_cache:
+                self.cache.clear()
+            for (key, rows), value in zip(missing.items(), fresh):
+                self.cache[key] = float(value)
+                scores[rows] = value
+        return scores
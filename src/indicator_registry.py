@@ -0,0 +1,347 @@
+import numpy as np
+import pandas as pd
+from config import TECHNICAL_PARAMS
+
+# Raw price columns read straight from the input frame
+BASE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# family name -> (parameter names, dependency templates, function)
+# A node key is the family name followed by its parameters, e.g.
+# 'rolling_mean:Close:20'. Dependency templates are formatted with the
+# node's parameters and the function receives the resolved dependencies
+# followed by the parameters as strings.
+REGISTRY = {}
+
+
+def indicator(family, params=(), deps=()):
+    """Register a node family computed from `deps`"""
+    def decorator(func):
+        REGISTRY[family] = (tuple(params), tuple(deps), func)
+        return func
+    return decorator
+
+
+# Shared intermediates
+
+@indicator('delta', ['src'], ['{src}'])
+def _delta(src, _):
+    return src.diff()
+
+
+@indicator('shift', ['src', 'periods'], ['{src}'])
+def _shift(src, _, periods):
+    return src.shift(int(periods))
+
+
+# Gains, losses and flows are blanked where the source is missing so that
+# NaN-padded (dates x symbols) frames match per-symbol results
+
+@indicator('gain', ['src'], ['delta:{src}', '{src}'])
+def _gain(delta, src, _):
+    return delta.where(delta > 0, 0).where(src.notna())
+
+
+@indicator('loss', ['src'], ['delta:{src}', '{src}'])
+def _loss(delta, src, _):
+    return (-delta.where(delta < 0, 0)).where(src.notna())
+
+
+@indicator('rolling_mean', ['src', 'window'], ['{src}'])
+def _rolling_mean(src, _, window):
+    return src.rolling(window=int(window)).mean()
+
+
+@indicator('rolling_sum', ['src', 'window'], ['{src}'])
+def _rolling_sum(src, _, window):
+    return src.rolling(window=int(window)).sum()
+
+
+@indicator('rolling_std', ['src', 'window'], ['{src}'])
+def _rolling_std(src, _, window):
+    return src.rolling(window=int(window)).std()
+
+
+@indicator('rolling_pstd', ['src', 'window'], ['rolling_std:{src}:{window}'])
+def _rolling_pstd(std, _, window):
+    # Population (ddof=0) deviation rescaled from the sample one
+    window = int(window)
+    return std * np.sqrt((window - 1) / window)
+
+
+@indicator('rolling_min', ['src', 'window'], ['{src}'])
+def _rolling_min(src, _, window):
+    return src.rolling(window=int(window)).min()
+
+
+@indicator('rolling_max', ['src', 'window'], ['{src}'])
+def _rolling_max(src, _, window):
+    return src.rolling(window=int(window)).max()
+
+
+@indicator('ewm', ['src', 'span'], ['{src}'])
+def _ewm(src, _, span):
+    return src.ewm(span=int(span), adjust=False).mean()
+
+
+@indicator('ema', ['src', 'span'], ['{src}', 'ewm:{src}:{span}'])
+def _ema(src, ewm, _, span):
+    # Same recursion as ewm, blank until `span` observations (ta's EMA)
+    return ewm.where(src.notna().cumsum() >= int(span))
+
+
+@indicator('wilder', ['src', 'window'], ['{src}'])
+def _wilder(src, _, window):
+    return src.ewm(alpha=1 / int(window), min_periods=int(window), adjust=False).mean()
+
+
+@indicator('high_low', deps=['High', 'Low'])
+def _high_low(high, low):
+    return high - low
+
+
+@indicator('close_open', deps=['Close', 'Open'])
+def _close_open(close, open_):
+    return close - open_
+
+
+@indicator('true_range', deps=['high_low', 'High', 'Low', 'shift:Close:1'])
+def _true_range(high_low, high, low, prev_close):
+    # NaN-skipping maximum of the three ranges
+    return np.fmax(np.fmax(high_low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+@indicator('typical_price', deps=['High', 'Low', 'Close'])
+def _typical_price(high, low, close):
+    return (high + low + close) / 3
+
+
+@indicator('money_flow', deps=['typical_price', 'Volume'])
+def _money_flow(typical_price, volume):
+    return typical_price * volume
+
+
+# Indicators (StockAnalyzer)
+
+@indicator('rsi', ['window'], ['rolling_mean:gain:Close:{window}', 'rolling_mean:loss:Close:{window}'])
+def _rsi(gain, loss, window):
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+@indicator('macd', ['fast', 'slow'], ['ewm:Close:{fast}', 'ewm:Close:{slow}'])
+def _macd(exp1, exp2, fast, slow):
+    return exp1 - exp2
+
+
+@indicator('bb_upper', ['window', 'dev'], ['rolling_mean:Close:{window}', 'rolling_std:Close:{window}'])
+def _bb_upper(middle, std, window, dev):
+    return middle + float(dev) * std
+
+
+@indicator('bb_lower', ['window', 'dev'], ['rolling_mean:Close:{window}', 'rolling_std:Close:{window}'])
+def _bb_lower(middle, std, window, dev):
+    return middle - float(dev) * std
+
+
+@indicator('stochastic_k', ['window'], ['Close', 'rolling_min:Low:{window}', 'rolling_max:High:{window}'])
+def _stochastic_k(close, low_min, high_max, window):
+    return 100 * ((close - low_min) / (high_max - low_min))
+
+
+@indicator('obv', deps=['delta:Close', 'Volume'])
+def _obv(delta, volume):
+    return (np.sign(delta) * volume).fillna(0).cumsum()
+
+
+@indicator('roc', ['periods'], ['Close', 'shift:Close:{periods}'])
+def _roc(close, shifted, periods):
+    return ((close - shifted) / shifted) * 100
+
+
+@indicator('mfi', ['window'], ['typical_price', 'shift:typical_price:1', 'money_flow'])
+def _mfi(typical_price, prev_typical_price, money_flow, window):
+    listed = typical_price.notna()
+    positive_flow = money_flow.where(typical_price > prev_typical_price, 0).where(listed) \
+        .rolling(window=int(window)).sum()
+    negative_flow = money_flow.where(typical_price < prev_typical_price, 0).where(listed) \
+        .rolling(window=int(window)).sum()
+    mfi_ratio = positive_flow / negative_flow
+    return 100 - (100 / (1 + mfi_ratio))
+
+
+@indicator('rvi', ['window'], ['rolling_mean:close_open:{window}', 'rolling_mean:high_low:{window}'])
+def _rvi(close_open, high_low, window):
+    return close_open / high_low
+
+
+# Indicators with `ta` semantics (TechnicalAnalyzer)
+
+@indicator('rsi_wilder', ['window'], ['wilder:gain:Close:{window}', 'wilder:loss:Close:{window}'])
+def _rsi_wilder(emaup, emadn, window):
+    relative_strength = emaup / emadn
+    return (100 - (100 / (1 + relative_strength))).where(emadn != 0, 100)
+
+
+@indicator('macd_ema', ['fast', 'slow'], ['Close', 'macd:{fast}:{slow}'])
+def _macd_ema(close, macd, fast, slow):
+    # Difference of two ta EMAs: the same values, blank until the slower one starts
+    return macd.where(close.notna().cumsum() >= max(int(fast), int(slow)))
+
+
+@indicator('bb_upper_pop', ['window', 'dev'], ['rolling_mean:Close:{window}', 'rolling_pstd:Close:{window}'])
+def _bb_upper_pop(middle, std, window, dev):
+    return middle + float(dev) * std
+
+
+@indicator('bb_lower_pop', ['window', 'dev'], ['rolling_mean:Close:{window}', 'rolling_pstd:Close:{window}'])
+def _bb_lower_pop(middle, std, window, dev):
+    return middle - float(dev) * std
+
+
+@indicator('atr_wilder', ['window'], ['true_range'])
+def _atr_wilder(true_range, window):
+    # Seeded with the plain mean of the first window, then Wilder-smoothed; zero before that.
+    # Single series only.
+    window = int(window)
+    atr = pd.Series(0.0, index=true_range.index)
+    if len(true_range) >= window:
+        seeded = true_range.iloc[window - 1:].copy()
+        seeded.iloc[0] = true_range.iloc[:window].mean()
+        atr.iloc[window - 1:] = seeded.ewm(alpha=1 / window, adjust=False).mean().to_numpy()
+    return atr
+
+
+def indicator_columns(params=None):
+    """
+    Map every public indicator column to its node key for a parameter set
+
+    Column names are fixed (consumers read 'SMA_20', 'SMA_200', ...) while
+    the windows come from `params`: SMA_20, SMA_50 and SMA_200 hold the
+    SMA_SHORT, SMA_LONG and SMA_TREND averages. Columns that share a key
+    (SMA_20 and BB_middle with the default windows) are computed once.
+
+    Parameters:
+    params (dict): Overrides for config.TECHNICAL_PARAMS
+
+    Returns:
+    dict: Column name as key and node key as value, in output order
+    """
+    p = dict(TECHNICAL_PARAMS, **(params or {}))
+    macd = f"macd:{p['EMA_SHORT']}:{p['EMA_LONG']}"
+    stochastic_k = f"stochastic_k:{p['STOCH_PERIOD']}"
+    return {
+        'RSI': f"rsi:{p['RSI_PERIOD']}",
+        'MACD': macd,
+        'Signal_Line': f"ewm:{macd}:{p['MACD_SIGNAL']}",
+        'SMA_20': f"rolling_mean:Close:{p['SMA_SHORT']}",
+        'SMA_50': f"rolling_mean:Close:{p['SMA_LONG']}",
+        'SMA_200': f"rolling_mean:Close:{p['SMA_TREND']}",
+        'BB_middle': f"rolling_mean:Close:{p['BB_PERIOD']}",
+        'BB_upper': f"bb_upper:{p['BB_PERIOD']}:{p['BB_STD']}",
+        'BB_lower': f"bb_lower:{p['BB_PERIOD']}:{p['BB_STD']}",
+        'Stochastic_K': stochastic_k,
+        'Stochastic_D': f"rolling_mean:{stochastic_k}:{p['STOCH_SMOOTH']}",
+        'ATR': f"rolling_mean:true_range:{p['ATR_PERIOD']}",
+        'OBV': 'obv',
+        'ROC': f"roc:{p['ROC_PERIOD']}",
+        'MFI': f"mfi:{p['MFI_PERIOD']}",
+        'RVI': f"rvi:{p['RVI_PERIOD']}"
+    }
+
+
+# Public column name -> node key for the configured parameters
+COLUMNS = indicator_columns()
+
+
+def parse_key(key):
+    """
+    Split a node key into its family and parameters
+
+    The first parameter may itself be a node key (e.g. 'ewm:macd:12:26:9' is
+    the 9-span ewm of 'macd:12:26'), so parameters are matched from the right.
+
+    Returns:
+    tuple: (family, dict of parameter name -> string value)
+    """
+    family, *values = key.split(':')
+    if family not in REGISTRY:
+        raise KeyError(f"Unknown indicator: {key}")
+    names = REGISTRY[family][0]
+    if len(values) > len(names) and names:
+        split = len(values) - len(names) + 1
+        values = [':'.join(values[:split])] + values[split:]
+    if len(values) != len(names):
+        raise KeyError(f"Indicator {family} expects parameters {names}, got {key}")
+    return family, dict(zip(names, values))
+
+
+def dependencies(key):
+    """Return the node keys `key` is computed from"""
+    if key in BASE_COLUMNS:
+        return []
+    family, params = parse_key(key)
+    return [template.format(**params) for template in REGISTRY[family][1]]
+
+
+class LazyIndicators:
+    def __init__(self, df, params=None):
+        """
+        Compute indicators on demand from an OHLCV frame
+
+        Every node (a public column such as 'BB_upper' or an intermediate
+        such as 'true_range') is computed the first time it is requested and
+        cached, so intermediates shared by several indicators are computed
+        exactly once and nothing that is not requested is computed at all.
+
+        Nodes are keyed by their parameters, so one instance can serve several
+        parameter sets and reuse everything they have in common. `df` may
+        also be a dict of (dates x symbols) DataFrames keyed by field, which
+        computes every symbol at once.
+
+        Parameters:
+        df (pandas.DataFrame): Frame with Open, High, Low, Close and Volume columns
+        params (dict): Overrides for config.TECHNICAL_PARAMS used to resolve column names
+        """
+        self.df = df
+        self.cache = {}
+        self.columns = indicator_columns(params)
+
+    def resolve(self, key, params=None):
+        """Return the node key behind a column name (for `params`, or this instance's)"""
+        columns = indicator_columns(params) if params is not None else self.columns
+        return columns.get(key, key)
+
+    def get(self, key, params=None):
+        """Compute a column for a specific parameter set, sharing the cache"""
+        return self[self.resolve(key, params)]
+
+    def __getitem__(self, key):
+        key = self.columns.get(key, key)
+        if key in self.cache:
+            return self.cache[key]
+        if key in BASE_COLUMNS:
+            value = self.df[key]
+        else:
+            family, params = parse_key(key)
+            func = REGISTRY[family][2]
+            value = func(*[self[dep] for dep in dependencies(key)], *params.values())
+        self.cache[key] = value
+        return value
+
+
+def compute_indicators(df, columns=None, params=None):
+    """
+    Add indicator columns to `df` in place
+
+    Parameters:
+    df (pandas.DataFrame): Frame with OHLCV columns
+    columns (list): Column names from COLUMNS (or node keys) to add; defaults to all of COLUMNS
+    params (dict): Overrides for config.TECHNICAL_PARAMS
+
+    Returns:
+    pandas.DataFrame: `df` with the requested columns added
+    """
+    lazy = LazyIndicators(df, params)
+    for col in (columns if columns is not None else lazy.columns):
+        df[col] = lazy[col]
+    return df
@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+import numpy as np
+
+# Quantiles reported for every histogram; 1.0 is the maximum
+QUANTILES = {'p50': 50, 'p95': 95, 'max': 100}
+
+
+class _NullSpan:
+    """Span handed out while instrumentation is disabled; does nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('metrics', 'stage', 'symbol', 'start')
+
+    def __init__(self, metrics, stage, symbol):
+        self.metrics = metrics
+        self.stage = stage
+        self.symbol = symbol
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.record(self.stage, time.perf_counter() - self.start, self.symbol)
+        return False
+
+
+def _histogram(values):
+    values = np.asarray(values, dtype=np.float64)
+    summary = {'count': int(values.size), 'total': float(values.sum())}
+    for name, q in QUANTILES.items():
+        summary[name] = float(np.percentile(values, q)) if values.size else 0.0
+    return summary
+
+
+class RunMetrics:
+    def __init__(self, enabled=True):
+        """
+        Collect per-stage timings and counters for one analysis run
+
+        Stages are timed with `span()` and counters (e.g. retries) are bumped
+        with `increment()`. When disabled, `span()` returns a shared no-op
+        context manager and `increment()` returns immediately, so the calls can
+        stay in hot paths. Safe to use from several threads.
+
+        Parameters:
+        enabled (bool): Record timings and counters
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.samples = []  # (stage, symbol, seconds)
+        self.counters = defaultdict(int)  # (name, symbol) -> count
+
+    def span(self, stage, symbol=None):
+        """Context manager timing one stage, optionally attributed to a symbol"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage, symbol)
+
+    def record(self, stage, seconds, symbol=None):
+        """Record an externally measured stage duration"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.samples.append((stage, symbol, seconds))
+
+    def increment(self, name, symbol=None, amount=1):
+        """Bump a counter such as 'retries'"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[(name, symbol)] += amount
+
+    def drain(self):
+        """Remove and return the samples recorded so far (used to ship them between processes)"""
+        with self._lock:
+            samples, self.samples = self.samples, []
+        return samples
+
+    def merge(self, samples):
+        """Add samples drained from another RunMetrics"""
+        if not self.enabled or not samples:
+            return
+        with self._lock:
+            self.samples.extend(samples)
+
+    def summary(self):
+        """
+        Aggregate the recorded samples
+
+        Returns:
+        dict: 'stages' (histogram per stage across all symbols), 'symbols'
+        (seconds per stage for each symbol), 'symbol_totals' (histogram of
+        each symbol's total time) and 'counters'
+        """
+        with self._lock:
+            samples = list(self.samples)
+            counters = dict(self.counters)
+
+        by_stage = defaultdict(list)
+        by_symbol = defaultdict(lambda: defaultdict(float))
+        for stage, symbol, seconds in samples:
+            by_stage[stage].append(seconds)
+            if symbol is not None:
+                by_symbol[symbol][stage] += seconds
+
+        symbols = {}
+        for symbol, stages in by_symbol.items():
+            symbols[symbol] = dict(stages)
+            symbols[symbol]['total'] = sum(stages.values())
+
+        counter_totals = defaultdict(int)
+        symbol_counters = defaultdict(dict)
+        for (name, symbol), count in counters.items():
+            counter_totals[name] += count
+            if symbol is not None:
+                symbol_counters[symbol][name] = count
+
+        return {
+            'stages': {stage: _histogram(values) for stage, values in by_stage.items()},
+            'symbols': symbols,
+            'symbol_totals': _histogram([stages['total'] for stages in symbols.values()]),
+            'counters': dict(counter_totals),
+            'symbol_counters': dict(symbol_counters)
+        }
+
+    def to_prometheus(self, summary=None, prefix='stock_analysis'):
+        """Render a summary in the Prometheus text exposition format"""
+        summary = summary or self.summary()
+        lines = [f'# HELP {prefix}_stage_seconds Time spent in each analysis stage',
+                 f'# TYPE {prefix}_stage_seconds summary']
+        for stage, hist in sorted(summary['stages'].items()):
+            lines += [f'{prefix}_stage_seconds{{stage="{stage}",quantile="{q / 100:g}"}} {hist[name]:.6f}'
+                      for name, q in QUANTILES.items()]
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {hist["total"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {hist["count"]}')
+
+        totals = summary['symbol_totals']
+        lines += [f'# HELP {prefix}_symbol_seconds Total time spent on each symbol',
+                  f'# TYPE {prefix}_symbol_seconds summary']
+        lines += [f'{prefix}_symbol_seconds{{quantile="{q / 100:g}"}} {totals[name]:.6f}'
+                  for name, q in QUANTILES.items()]
+        lines.append(f'{prefix}_symbol_seconds_sum {totals["total"]:.6f}')
+        lines.append(f'{prefix}_symbol_seconds_count {totals["count"]}')
+
+        lines += [f'# HELP {prefix}_symbol_stage_seconds Time spent on each symbol per stage',
+                  f'# TYPE {prefix}_symbol_stage_seconds gauge']
+        for symbol, stages in sorted(summary['symbols'].items()):
+            lines += [f'{prefix}_symbol_stage_seconds{{symbol="{symbol}",stage="{stage}"}} {seconds:.6f}'
+                      for stage, seconds in sorted(stages.items()) if stage != 'total']
+
+        lines += [f'# HELP {prefix}_events_total Run event counters such as retries',
+                  f'# TYPE {prefix}_events_total counter']
+        lines += [f'{prefix}_events_total{{event="{name}"}} {count}'
+                  for name, count in sorted(summary['counters'].items())]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, output_dir='output'):
+        """
+        Write the run summary as JSON and as a Prometheus textfile
+
+        The textfile is replaced atomically so a node_exporter textfile
+        collector never reads a partial file.
+
+        Parameters:
+        output_dir (str): Directory the files are written to
+
+        Returns:
+        tuple: (json_path, prometheus_path), or (None, None) if disabled or on error
+        """
+        if not self.enabled:
+            return None, None
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            summary = self.summary()
+            json_path = os.path.join(output_dir, f'run_metrics_{datetime.now().strftime("%Y%m%d_%H%M")}.json')
+            with open(json_path, 'w') as f:
+                json.dump(summary, f, indent=2)
+
+            prom_path = os.path.join(output_dir, 'run_metrics.prom')
+            with open(prom_path + '.tmp', 'w') as f:
+                f.write(self.to_prometheus(summary))
+            os.replace(prom_path + '.tmp', prom_path)
+            return json_path, prom_path
+        except Exception as e:
+            print(f"Error writing run metrics: {str(e)}")
+            return None, None
+
+    def print_summary(self):
+        """Print the per-stage histograms and counters"""
+        if not self.enabled:
+            return
+        summary = self.summary()
+        print("\nStage timings (seconds):")
+        print(f"{'Stage':<20}{'Count':>8}{'Total':>10}{'p50':>10}{'p95':>10}{'Max':>10}")
+        for stage, hist in sorted(summary['stages'].items(), key=lambda item: -item[1]['total']):
+            print(f"{stage:<20}{hist['count']:>8}{hist['total']:>10.2f}"
+                  f"{hist['p50']:>10.3f}{hist['p95']:>10.3f}{hist['max']:>10.3f}")
+        for name, count in sorted(summary['counters'].items()):
+            print(f"{name}: {count}")
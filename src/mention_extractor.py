@@ -0,0 +1,230 @@
+import json
+import re
+import numpy as np
+
+# $CASHTAGs and words; inner dots/hyphens are kept (BRK.B) but trailing punctuation is not
+TOKEN_PATTERN = re.compile(r"\$?[A-Za-z][A-Za-z0-9]*(?:[.&'-][A-Za-z0-9]+)*")
+
+# Tickers that are also everyday words or initials; they only count as a
+# $CASHTAG. Every single-letter ticker is treated the same way.
+AMBIGUOUS_TICKERS = {
+    'ALL', 'ARE', 'CAT', 'COIN', 'COST', 'DD', 'DE', 'DIS', 'EA', 'GE', 'GM', 'HD', 'IT',
+    'KEY', 'LOW', 'MA', 'MS', 'MU', 'NOW', 'ON', 'PG', 'SO', 'SHOP', 'TM'
+}
+
+# Legal forms that can follow a company name in text ("Target Corp.")
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'ltd', 'limited', 'plc',
+    'sa', 'nv', 'ag', 'se'
+}
+
+# Trailing words dropped from company names ("Apple Inc." -> "apple")
+NAME_SUFFIXES = LEGAL_SUFFIXES | {'group', 'holdings', 'holding', 'the', 'class', 'a', 'b', 'com'}
+
+# One-word company names that are also everyday words; on their own they only
+# count when followed by a legal suffix ("Target Corp.", not "price target")
+AMBIGUOUS_NAMES = {
+    'target', 'gap', 'block', 'square', 'snap', 'match', 'progressive', 'coherent', 'ball', 'southern'
+}
+
+# Share of upper-case letters above which a post is treated as shouting and
+# bare tickers in it are ignored ("SO EXCITED FOR THIS")
+SHOUTING_SHARE = 0.6
+
+
+def company_aliases(long_name):
+    """
+    Matchable forms of a company name
+
+    Parameters:
+    long_name (str): Company name, e.g. Ticker.info['longName']
+
+    Returns:
+    list: Lowercase token tuples, the full name and the name without legal suffixes or a leading 'the'
+    """
+    tokens = [token.lower().rstrip('.') for token in TOKEN_PATTERN.findall(long_name or '')]
+    aliases = []
+    if tokens:
+        aliases.append(tuple(tokens))
+    while tokens and tokens[-1] in NAME_SUFFIXES:
+        tokens = tokens[:-1]
+    if len(tokens) > 1 and tokens[0] == 'the':
+        tokens = tokens[1:]
+    if tokens and tuple(tokens) not in aliases:
+        aliases.append(tuple(tokens))
+    return aliases
+
+
+class MentionExtractor:
+    def __init__(self, symbols, names=None, ambiguous=AMBIGUOUS_TICKERS, ambiguous_names=AMBIGUOUS_NAMES):
+        """
+        Attribute posts and headlines to ticker symbols in a single pass
+
+        Text is tokenised once. Cashtags and bare tickers are matched with
+        one dictionary lookup per token. Company names go into a trie of
+        lowercase tokens that is walked from capitalised tokens only. The
+        cost per post therefore depends on its length, not on the size of
+        the universe.
+
+        Rules:
+        - $CASHTAGs always match.
+        - Bare tickers must appear in upper case, and are skipped in posts
+          that are mostly upper case.
+        - Single-letter and AMBIGUOUS_TICKERS only match as cashtags.
+        - Company names must start with a capital letter.
+        - One-word names in AMBIGUOUS_NAMES only match with a legal suffix
+          after them; the symbol's cashtag still matches.
+
+        Parameters:
+        symbols (list): Ticker symbols of the universe
+        names (dict): Stock symbols as keys and company names (str or list of str) as values
+        ambiguous (set): Tickers that only match as cashtags
+        ambiguous_names (set): Lowercase one-word names that need a legal suffix
+        """
+        self.symbols = list(dict.fromkeys(symbols))
+        self.index = {symbol: k for k, symbol in enumerate(self.symbols)}
+        self.cashtags = {}
+        self.tickers = {}
+        for symbol in self.symbols:
+            for form in {symbol.upper(), symbol.upper().replace('-', '.')}:
+                self.cashtags[form] = symbol
+                if len(form) > 1 and form not in ambiguous:
+                    self.tickers[form] = symbol
+
+        self.trie = {}
+        # Exact token forms that can start a match; every other token is skipped with one set lookup
+        self.starts = {'$' + form for form in self.cashtags} | {'$' + form.lower() for form in self.cashtags}
+        self.starts |= set(self.tickers)
+        for symbol, values in (names or {}).items():
+            if symbol not in self.index:
+                continue
+            for name in [values] if isinstance(values, str) else values:
+                first = TOKEN_PATTERN.findall(name or '')[:1]
+                aliases = company_aliases(name)
+                for alias in list(aliases):
+                    if len(alias) == 1 and alias[0] in ambiguous_names:
+                        aliases.remove(alias)
+                        aliases += [alias + (suffix,) for suffix in sorted(LEGAL_SUFFIXES)]
+                for alias in aliases:
+                    node = self.trie
+                    for token in alias:
+                        node = node.setdefault(token, {})
+                    node[None] = symbol
+                    self.starts |= {alias[0].capitalize(), alias[0].upper()} | set(first)
+
+    def extract(self, text):
+        """
+        Symbols mentioned in a text
+
+        Parameters:
+        text (str): Post or headline
+
+        Returns:
+        set: Mentioned symbols (each counted once per text)
+        """
+        tokens = TOKEN_PATTERN.findall(text or '')
+        starts = self.starts
+        found = set()
+        shouting = None
+        for i, token in enumerate(tokens):
+            if token not in starts:
+                continue
+            if token[0] == '$':
+                found.add(self.cashtags[token[1:].upper()])
+                continue
+            symbol = self.tickers.get(token)
+            if symbol is not None:
+                if shouting is None:
+                    shouting = sum(map(str.isupper, text)) > SHOUTING_SHARE * sum(map(str.isalpha, text))
+                if not shouting:
+                    found.add(symbol)
+            if token[0].isupper():
+                node = self.trie.get(token.lower())
+                j = i + 1
+                while node is not None:
+                    if None in node:
+                        found.add(node[None])
+                    if j == len(tokens):
+                        break
+                    node = node.get(tokens[j].lower())
+                    j += 1
+        return found
+
+    def process_feed(self, feed, scorer, text_field='text', batch_size=5000, polarity_threshold=0.05):
+        """
+        Mention counts and sentiment aggregates per symbol from a JSONL post feed
+
+        The feed is streamed: only one batch of matched posts is held at a
+        time, so memory does not grow with the feed. Each batch is scored in
+        one scorer call and folded into per-symbol totals.
+
+        Parameters:
+        feed (str or iterable): Path of a JSONL file, or an iterable of JSON lines or dicts
+        scorer (HeadlineScorer): Text scorer
+        text_field (str): Key of the post text in each record
+        batch_size (int): Matched posts scored per batch
+        polarity_threshold (float): Scores beyond +/- this count as positive / negative mentions
+
+        Returns:
+        tuple: (results, skipped) where results has stock symbols as keys and
+        {'sentiment_score', 'mentions', 'positive_mentions', 'negative_mentions'}
+        as values, and skipped counts the malformed records left out
+        """
+        n = len(self.symbols)
+        mentions = np.zeros(n, dtype=np.int64)
+        positive = np.zeros(n, dtype=np.int64)
+        negative = np.zeros(n, dtype=np.int64)
+        total = np.zeros(n)
+        skipped = 0
+
+        texts, rows, posts = [], [], []
+
+        def flush():
+            scores = scorer.score(texts)[posts]
+            np.add.at(mentions, rows, 1)
+            np.add.at(total, rows, scores)
+            np.add.at(positive, rows, scores > polarity_threshold)
+            np.add.at(negative, rows, scores < -polarity_threshold)
+            texts.clear()
+            rows.clear()
+            posts.clear()
+
+        stream = open(feed) if isinstance(feed, str) else feed
+        try:
+            for record in stream:
+                if not isinstance(record, dict):
+                    if not record.strip():
+                        continue
+                    try:
+                        record = json.loads(record)
+                    except ValueError:
+                        skipped += 1
+                        continue
+                    if not isinstance(record, dict):
+                        skipped += 1
+                        continue
+                text = record.get(text_field)
+                if not isinstance(text, str):
+                    continue
+                found = self.extract(text)
+                if not found:
+                    continue
+                for symbol in found:
+                    rows.append(self.index[symbol])
+                    posts.append(len(texts))
+                texts.append(text)
+                if len(texts) >= batch_size:
+                    flush()
+            if texts:
+                flush()
+        finally:
+            if isinstance(feed, str):
+                stream.close()
+
+        mean = total / np.maximum(mentions, 1)
+        results = {symbol: {'sentiment_score': float(mean[k]),
+                            'mentions': int(mentions[k]),
+                            'positive_mentions': int(positive[k]),
+                            'negative_mentions': int(negative[k])}
+                   for k, symbol in enumerate(self.symbols)}
+        return results, skipped
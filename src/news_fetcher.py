@@ -0,0 +1,166 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+NEWS_URL = "https://finance.yahoo.com/quote/{symbol}/news"
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class ResponseCache:
+    def __init__(self, cache_dir=None):
+        """
+        SQLite store of response bodies and their validators (ETag, Last-Modified)
+
+        Parameters:
+        cache_dir (str): Directory of responses.sqlite; None keeps the store in memory
+        """
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, 'responses.sqlite')
+        else:
+            path = ':memory:'
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute('CREATE TABLE IF NOT EXISTS responses '
+                              '(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, '
+                              'body TEXT NOT NULL, fetched_at REAL NOT NULL)')
+
+    def get(self, url):
+        """Return {'etag', 'last_modified', 'body', 'fetched_at'} for a URL, or None"""
+        with self._lock:
+            row = self.conn.execute('SELECT etag, last_modified, body, fetched_at FROM responses WHERE url = ?',
+                                    (url,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('etag', 'last_modified', 'body', 'fetched_at'), row))
+
+    def put(self, url, etag, last_modified, body):
+        with self._lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                              (url, etag, last_modified, body, time.time()))
+
+    def touch(self, url):
+        """Mark a cached response as revalidated now"""
+        with self._lock, self.conn:
+            self.conn.execute('UPDATE responses SET fetched_at = ? WHERE url = ?', (time.time(), url))
+
+
+class NewsFetcher:
+    def __init__(self, cache_dir=None, url_template=NEWS_URL, per_host=8, timeout=(3.05, 10),
+                 max_workers=32, headers=None, session=None):
+        """
+        Concurrent HTTP fetcher for news pages
+
+        Requests for a whole universe are scheduled on an asyncio loop. Each
+        one runs on a pooled requests.Session in a thread pool, so
+        connections are reused, while a semaphore per host caps how many
+        requests hit the same server at once. Cached pages are revalidated
+        with If-None-Match / If-Modified-Since and reused on 304.
+
+        Parameters:
+        cache_dir (str): Directory of the response cache; None keeps it in memory
+        url_template (str): News URL with a {symbol} placeholder
+        per_host (int): Maximum concurrent requests to one host
+        timeout (tuple): (connect, read) timeout in seconds for every request
+        max_workers (int): Threads available for requests across all hosts
+        headers (dict): Request headers; defaults to a browser User-Agent
+        session (requests.Session): Session to send requests through; defaults to a
+            pooled one. Tests can pass a stub with the same get() signature.
+        """
+        self.url_template = url_template
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.headers = headers or DEFAULT_HEADERS
+        self.cache = ResponseCache(cache_dir)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(per_host, 1))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        self.session = session
+
+    def url(self, symbol):
+        return self.url_template.format(symbol=symbol)
+
+    def _get(self, url, cached):
+        headers = dict(self.headers)
+        if cached is not None:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    async def _fetch(self, url, semaphore, executor):
+        loop = asyncio.get_running_loop()
+        cached = self.cache.get(url)
+        try:
+            async with semaphore:
+                response = await loop.run_in_executor(executor, self._get, url, cached)
+            if response.status_code == 304 and cached is not None:
+                self.cache.touch(url)
+                return cached['body']
+            if response.status_code == 200:
+                self.cache.put(url, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                               response.text)
+                return response.text
+            print(f"Error fetching {url}: HTTP {response.status_code}")
+            return None
+        except Exception as e:
+            print(f"Error fetching {url}: {str(e)}")
+            return None
+
+    async def fetch_urls_async(self, urls):
+        """
+        Fetch many URLs concurrently (see fetch_urls)
+        """
+        urls = list(dict.fromkeys(urls))
+        semaphores = {}
+        for url in urls:
+            host = urlsplit(url).netloc
+            if host not in semaphores:
+                semaphores[host] = asyncio.Semaphore(self.per_host)
+        workers = max(1, min(self.max_workers, len(semaphores) * self.per_host))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            bodies = await asyncio.gather(*(self._fetch(url, semaphores[urlsplit(url).netloc], executor)
+                                            for url in urls))
+        return dict(zip(urls, bodies))
+
+    def fetch_urls(self, urls):
+        """
+        Fetch many URLs concurrently
+
+        Parameters:
+        urls (list): URLs; duplicates are requested once
+
+        Returns:
+        dict: URL as key and response text as value (None where the request failed)
+        """
+        return asyncio.run(self.fetch_urls_async(urls))
+
+    def fetch_news(self, symbols):
+        """
+        Fetch the news page of every symbol concurrently
+
+        Parameters:
+        symbols (list): Stock symbols
+
+        Returns:
+        dict: Stock symbols as keys and page HTML as values (None where the request failed)
+        """
+        bodies = self.fetch_urls([self.url(symbol) for symbol in symbols])
+        return {symbol: bodies[self.url(symbol)] for symbol in symbols}
+
+    def close(self):
+        self.session.close()
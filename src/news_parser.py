@@ -0,0 +1,167 @@
+import hashlib
+from collections import OrderedDict
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+BASE_URL = "https://finance.yahoo.com"
+
+
+def article_key(item):
+    """Identity of an article across pages: its stream id, else its URL without query or fragment"""
+    if item.get('id'):
+        return item['id']
+    parts = urlsplit(item['url'])
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip('/'), '', ''))
+
+
+class _NewsStreamParser(HTMLParser):
+    """
+    Event-based extractor for news stream items
+
+    Only <li>, <a>, <h3>, <p> and the publishing <div> are acted on and
+    only their text is kept; no tree is built. An item is a linked <h3>
+    headline; the first <p> after it becomes its summary and a 'publishing'
+    <div> its source line.
+    """
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.items = []
+        self.item_id = None
+        self.link = None
+        self.title_link = None
+        self.current = None
+        self.capture = None
+        self.buffer = []
+
+    def _start(self, field):
+        self.capture = field
+        self.buffer = []
+
+    def _text(self):
+        return ' '.join(''.join(self.buffer).split())
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'li':
+            attrs = dict(attrs)
+            self.item_id = attrs.get('data-uuid') or attrs.get('data-id')
+            self.current = None
+        elif tag == 'a':
+            self.link = dict(attrs).get('href')
+            if self.capture == 'title' and self.link:
+                self.title_link = self.link
+        elif tag == 'h3':
+            self._start('title')
+            self.title_link = self.link
+        elif self.current is None or self.capture is not None:
+            return
+        elif tag == 'p' and 'summary' not in self.current:
+            self._start('summary')
+        elif tag == 'div' and 'publishing' in (dict(attrs).get('class') or '') and 'source' not in self.current:
+            self._start('source')
+
+    def handle_endtag(self, tag):
+        if tag == 'a':
+            self.link = None
+        elif tag == 'h3' and self.capture == 'title':
+            title = self._text()
+            self.capture = None
+            if title and self.title_link:
+                self.current = {'id': self.item_id, 'url': urljoin(self.base_url, self.title_link),
+                                'title': title}
+                self.items.append(self.current)
+                # One headline per stream item; a second one starts a new, id-less item
+                self.item_id = None
+        elif tag == 'p' and self.capture == 'summary':
+            self.current['summary'] = self._text()
+            self.capture = None
+        elif tag == 'div' and self.capture == 'source':
+            source, _, published = self._text().partition('•')
+            self.current['source'] = source.strip()
+            self.current['published'] = published.strip()
+            self.capture = None
+
+    def handle_data(self, data):
+        if self.capture is not None:
+            self.buffer.append(data)
+
+
+class NewsPageParser:
+    def __init__(self, base_url=BASE_URL, max_pages=2000):
+        """
+        News item extractor with a cache of parsed pages
+
+        Pages are parsed with an event-based HTMLParser that keeps only the
+        headline, summary and source of each stream item. Results are
+        cached by a fingerprint of the page, so a page that has not changed
+        since the last fetch (e.g. a 304 from NewsFetcher) is not parsed
+        again. Articles are deduplicated by stream id or URL, within a page
+        and across the pages of one `parse_pages` call.
+
+        Parameters:
+        base_url (str): Base for relative article links
+        max_pages (int): Parsed pages kept, least recently used first out
+        """
+        self.base_url = base_url
+        self.max_pages = max_pages
+        self.cache = OrderedDict()
+
+    @staticmethod
+    def fingerprint(html):
+        return hashlib.blake2b(html.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def parse(self, html):
+        """
+        News items of one page
+
+        Parameters:
+        html (str): Page HTML
+
+        Returns:
+        list: Unique items as dicts with 'id', 'url', 'title' and, when present,
+        'summary', 'source' and 'published'
+        """
+        key = self.fingerprint(html)
+        items = self.cache.get(key)
+        if items is not None:
+            self.cache.move_to_end(key)
+            return items
+
+        parser = _NewsStreamParser(self.base_url)
+        parser.feed(html)
+        parser.close()
+        seen = set()
+        items = []
+        for item in parser.items:
+            item_key = article_key(item)
+            if item_key not in seen:
+                seen.add(item_key)
+                items.append(item)
+
+        self.cache[key] = items
+        if len(self.cache) > self.max_pages:
+            self.cache.popitem(last=False)
+        return items
+
+    def parse_pages(self, pages):
+        """
+        News items for many pages, with articles shared across pages deduplicated
+
+        An article listed on several symbols' pages is the same dict object
+        in each list, so downstream work can be keyed on it once.
+
+        Parameters:
+        pages (dict): Stock symbols as keys and page HTML as values (None is passed through)
+
+        Returns:
+        dict: Stock symbols as keys and item lists as values
+        """
+        articles = {}
+        results = {}
+        for symbol, html in pages.items():
+            if html is None:
+                results[symbol] = None
+                continue
+            results[symbol] = [articles.setdefault(article_key(item), item) for item in self.parse(html)]
+        return results
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+OHLCV_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+class PricePanel:
+    def __init__(self, dates, symbols, fields):
+        """
+        Aligned dates x symbols price arrays for a whole universe
+
+        Parameters:
+        dates (pandas.DatetimeIndex): Union of all trading dates, sorted
+        symbols (list): Symbol for every column
+        fields (dict): Field name as key and 2-D float64 array (dates x symbols) as value
+        """
+        self.dates = dates
+        self.symbols = list(symbols)
+        self.fields = fields
+
+    @classmethod
+    def from_frames(cls, frames, fields=OHLCV_FIELDS):
+        """
+        Align per-symbol frames on a common date index
+
+        Symbols that start trading later (or stop earlier) than the rest of the
+        universe are padded with NaN.
+
+        Parameters:
+        frames (dict): Stock symbols as keys and OHLCV DataFrames as values
+        fields (list): Columns to load into the panel
+
+        Returns:
+        PricePanel: Aligned panel
+        """
+        symbols = list(frames)
+        dates = frames[symbols[0]].index
+        for symbol in symbols[1:]:
+            if not frames[symbol].index.equals(dates):
+                dates = dates.union(frames[symbol].index)
+        dates = dates.sort_values()
+
+        arrays = {field: np.full((len(dates), len(symbols)), np.nan) for field in fields}
+        for j, symbol in enumerate(symbols):
+            df = frames[symbol]
+            rows = dates.get_indexer(df.index)
+            values = df[fields].to_numpy(dtype=np.float64)
+            for k, field in enumerate(fields):
+                arrays[field][rows, j] = values[:, k]
+        return cls(dates, symbols, arrays)
+
+    @classmethod
+    def from_bars(cls, frames, fields=OHLCV_FIELDS):
+        """
+        Stack per-symbol frames by bar position, aligned on each symbol's latest bar
+
+        Every column holds only that symbol's own bars, padded with leading
+        NaN, so indicators never see gaps where other symbols traded and the
+        last row is every symbol's latest bar. `dates` is a RangeIndex of bar
+        positions; map rows back with `bar_dates`.
+
+        Parameters:
+        frames (dict): Stock symbols as keys and OHLCV DataFrames as values
+        fields (list): Columns to load into the panel
+
+        Returns:
+        PricePanel: Bar-aligned panel
+        """
+        symbols = list(frames)
+        n_bars = max(len(df) for df in frames.values())
+        arrays = {field: np.full((n_bars, len(symbols)), np.nan) for field in fields}
+        for j, symbol in enumerate(symbols):
+            df = frames[symbol]
+            values = df[fields].to_numpy(dtype=np.float64)
+            for k, field in enumerate(fields):
+                arrays[field][n_bars - len(df):, j] = values[:, k]
+        panel = cls(pd.RangeIndex(n_bars), symbols, arrays)
+        panel.bar_dates = {symbol: frames[symbol].index for symbol in symbols}
+        return panel
+
+    def date_of(self, row, symbol):
+        """Date of panel row `row` for `symbol` (bar-aligned panels map through bar_dates)"""
+        bar_dates = getattr(self, 'bar_dates', None)
+        if bar_dates is None:
+            return self.dates[row]
+        index = bar_dates[symbol]
+        return index[row - (len(self.dates) - len(index))]
+
+    @property
+    def shape(self):
+        return len(self.dates), len(self.symbols)
+
+    def __getitem__(self, field):
+        return self.fields[field]
+
+    def to_frames(self, frames, columns):
+        """
+        Scatter panel columns back into per-symbol DataFrames
+
+        Works for date-aligned (from_frames) and bar-aligned (from_bars) panels.
+
+        Parameters:
+        frames (dict): Original per-symbol frames the panel was built from
+        columns (dict): Column name as key and 2-D array (dates x symbols) as value
+
+        Returns:
+        dict: Stock symbols as keys and copies of the frames with the new columns as values
+        """
+        names = list(columns)
+        cube = np.stack([columns[name] for name in names], axis=-1)
+        bar_dates = getattr(self, 'bar_dates', None)
+        results = {}
+        for j, symbol in enumerate(self.symbols):
+            df = frames[symbol]
+            if bar_dates is None:
+                rows = self.dates.get_indexer(df.index)
+            else:
+                # Bar-aligned: a symbol's bars are the last len(df) rows of its column
+                rows = np.arange(len(self.dates) - len(df), len(self.dates))
+            block = pd.DataFrame(cube[rows, j, :], index=df.index, columns=names)
+            results[symbol] = pd.concat([df.drop(columns=names, errors='ignore'), block], axis=1)
+        return results
@@ -0,0 +1,177 @@
+import warnings
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from config import TECHNICAL_PARAMS
+
+# Same columns, in the same order, as StockAnalyzer.calculate_technical_indicators
+INDICATOR_COLUMNS = [
+    'RSI', 'MACD', 'Signal_Line', 'SMA_20', 'SMA_50', 'SMA_200',
+    'BB_middle', 'BB_upper', 'BB_lower', 'Stochastic_K', 'Stochastic_D',
+    'ATR', 'OBV', 'ROC', 'MFI', 'RVI'
+]
+
+
+def shift(x, periods=1):
+    """Shift a dates x symbols array down by `periods` rows, padding with NaN"""
+    out = np.full_like(x, np.nan)
+    if periods < len(x):
+        out[periods:] = x[:-periods]
+    return out
+
+
+def rolling_sum(x, window):
+    """
+    Rolling sum along the date axis, NaN unless the whole window is finite
+
+    Uses cumulative sums so the cost does not depend on the window length.
+    Matches pandas rolling(window).sum() for series with leading NaN padding.
+    """
+    finite = np.isfinite(x)
+    csum = np.zeros((x.shape[0] + 1,) + x.shape[1:])
+    np.cumsum(np.where(finite, x, 0.0), axis=0, out=csum[1:])
+    count = np.zeros(csum.shape, dtype=np.int64)
+    np.cumsum(finite, axis=0, out=count[1:])
+
+    out = np.full(x.shape, np.nan)
+    if window <= x.shape[0]:
+        sums = csum[window:] - csum[:-window]
+        full = (count[window:] - count[:-window]) == window
+        out[window - 1:] = np.where(full, sums, np.nan)
+    return out
+
+
+def rolling_mean(x, window):
+    """Rolling mean along the date axis (pandas rolling(window).mean())"""
+    return rolling_sum(x, window) / window
+
+
+def rolling_std(x, window, ddof=1):
+    """
+    Rolling standard deviation along the date axis (pandas rolling(window).std())
+
+    Each column is centred on its own mean first so the sum-of-squares
+    formulation does not lose precision on high-priced symbols.
+    """
+    with warnings.catch_warnings():
+        # Columns that are entirely NaN have no mean and stay NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        centred = x - np.nanmean(np.where(np.isfinite(x), x, np.nan), axis=0)
+    s1 = rolling_sum(centred, window)
+    s2 = rolling_sum(centred * centred, window)
+    var = (s2 - s1 * s1 / window) / (window - ddof)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+def _rolling_extreme(x, window, reducer):
+    out = np.full(x.shape, np.nan)
+    if window <= x.shape[0]:
+        out[window - 1:] = reducer(sliding_window_view(x, window, axis=0), axis=-1)
+    return out
+
+
+def rolling_min(x, window):
+    """Rolling minimum along the date axis (pandas rolling(window).min())"""
+    return _rolling_extreme(x, window, np.min)
+
+
+def rolling_max(x, window):
+    """Rolling maximum along the date axis (pandas rolling(window).max())"""
+    return _rolling_extreme(x, window, np.max)
+
+
+def ewm_mean(x, span):
+    """
+    Exponential moving average along the date axis (pandas ewm(span, adjust=False).mean())
+
+    Each column is seeded with its first non-NaN value, so symbols with later
+    listing dates start their average on their own first bar.
+    """
+    alpha = 2.0 / (span + 1.0)
+    out = np.empty_like(x)
+    prev = np.full(x.shape[1:], np.nan)
+    for t in range(x.shape[0]):
+        row = x[t]
+        seeded = ~np.isnan(prev)
+        prev = np.where(seeded, np.where(np.isnan(row), prev, prev + alpha * (row - prev)), row)
+        out[t] = prev
+    return out
+
+
+def compute_panel_indicators(panel, params=None):
+    """
+    Calculate every technical indicator for all symbols of a panel at once
+
+    Each indicator is a single vectorised pass over the dates x symbols arrays
+    instead of one pandas call per symbol. Results match
+    StockAnalyzer.calculate_technical_indicators to floating-point tolerance
+    for symbols whose only missing bars are leading NaN padding.
+
+    Parameters:
+    panel (PricePanel): Aligned OHLCV panel
+    params (dict): Overrides for config.TECHNICAL_PARAMS
+
+    Returns:
+    dict: Indicator name as key and 2-D array (dates x symbols) as value
+    """
+    p = dict(TECHNICAL_PARAMS, **(params or {}))
+    open_, high, low = panel['Open'], panel['High'], panel['Low']
+    close, volume = panel['Close'], panel['Volume']
+    listed = ~np.isnan(close)
+    out = {}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # RSI
+        delta = close - shift(close)
+        gain = np.where(listed, np.where(delta > 0, delta, 0.0), np.nan)
+        loss = np.where(listed, np.where(delta < 0, -delta, 0.0), np.nan)
+        rs = rolling_mean(gain, p['RSI_PERIOD']) / rolling_mean(loss, p['RSI_PERIOD'])
+        out['RSI'] = 100 - (100 / (1 + rs))
+
+        # MACD
+        out['MACD'] = ewm_mean(close, p['EMA_SHORT']) - ewm_mean(close, p['EMA_LONG'])
+        out['Signal_Line'] = ewm_mean(out['MACD'], p['MACD_SIGNAL'])
+
+        # Moving Averages
+        out['SMA_20'] = rolling_mean(close, p['SMA_SHORT'])
+        out['SMA_50'] = rolling_mean(close, p['SMA_LONG'])
+        out['SMA_200'] = rolling_mean(close, p['SMA_TREND'])
+
+        # Bollinger Bands
+        bb_std = rolling_std(close, p['BB_PERIOD'])
+        out['BB_middle'] = out['SMA_20'] if p['BB_PERIOD'] == p['SMA_SHORT'] else rolling_mean(close, p['BB_PERIOD'])
+        out['BB_upper'] = out['BB_middle'] + p['BB_STD'] * bb_std
+        out['BB_lower'] = out['BB_middle'] - p['BB_STD'] * bb_std
+
+        # Stochastic Oscillator
+        low_min = rolling_min(low, p['STOCH_PERIOD'])
+        high_max = rolling_max(high, p['STOCH_PERIOD'])
+        out['Stochastic_K'] = 100 * ((close - low_min) / (high_max - low_min))
+        out['Stochastic_D'] = rolling_mean(out['Stochastic_K'], p['STOCH_SMOOTH'])
+
+        # Average True Range (ATR)
+        prev_close = shift(close)
+        true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+        out['ATR'] = rolling_mean(true_range, p['ATR_PERIOD'])
+
+        # On-Balance Volume (OBV)
+        flow = np.sign(delta) * volume
+        obv = np.cumsum(np.where(np.isnan(flow), 0.0, flow), axis=0)
+        out['OBV'] = np.where(listed, obv, np.nan)
+
+        # Rate of Change (ROC)
+        close_n = shift(close, p['ROC_PERIOD'])
+        out['ROC'] = ((close - close_n) / close_n) * 100
+
+        # Money Flow Index (MFI)
+        typical_price = (high + low + close) / 3
+        money_flow = typical_price * volume
+        prev_tp = shift(typical_price)
+        positive = np.where(listed, np.where(typical_price > prev_tp, money_flow, 0.0), np.nan)
+        negative = np.where(listed, np.where(typical_price < prev_tp, money_flow, 0.0), np.nan)
+        mfi_ratio = rolling_sum(positive, p['MFI_PERIOD']) / rolling_sum(negative, p['MFI_PERIOD'])
+        out['MFI'] = 100 - (100 / (1 + mfi_ratio))
+
+        # Relative Vigor Index (RVI)
+        out['RVI'] = rolling_mean(close - open_, p['RVI_PERIOD']) / rolling_mean(high - low, p['RVI_PERIOD'])
+
+    return {name: out[name] for name in INDICATOR_COLUMNS}
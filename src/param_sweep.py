@@ -0,0 +1,150 @@
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from config import PARAM_GRID, TECHNICAL_PARAMS
+from src.backtest import Backtester
+from src.indicator_registry import LazyIndicators
+from src.panel import OHLCV_FIELDS, PricePanel
+from src.signals import SIGNAL_COLUMNS, signal_history
+
+
+def expand_grid(grid):
+    """
+    Every combination of a {parameter: [values]} grid as a full parameter set
+
+    The first parameter varies slowest, so neighbouring combinations share
+    the most intermediates; list the most expensive parameters first.
+
+    Returns:
+    list: Dicts of TECHNICAL_PARAMS with the grid values applied
+    """
+    names = list(grid)
+    return [dict(TECHNICAL_PARAMS, **dict(zip(names, values)))
+            for values in itertools.product(*(grid[name] for name in names))]
+
+
+def sweep_state(frames, backtest_params=None):
+    """
+    Build the data every combination shares
+
+    Prices are stacked once into bar-aligned (bars x symbols) frames that
+    the indicator registry evaluates for all symbols at once, and the
+    returns the backtest needs are prepared once on the common date axis.
+
+    Parameters:
+    frames (dict): Stock symbols as keys and OHLCV DataFrames as values
+    backtest_params (dict): Keyword arguments for Backtester
+
+    Returns:
+    dict: Shared sweep inputs
+    """
+    bar_panel = PricePanel.from_bars(frames)
+    date_panel = PricePanel.from_frames(frames, fields=['Close'])
+    n_bars, n_symbols = bar_panel.shape
+
+    # Flat positions mapping each bar-aligned cell onto the date grid
+    source, target = [], []
+    for j, symbol in enumerate(bar_panel.symbols):
+        index = bar_panel.bar_dates[symbol]
+        source.append(np.arange(n_bars - len(index), n_bars) * n_symbols + j)
+        target.append(date_panel.dates.get_indexer(index) * n_symbols + j)
+
+    return {
+        'fields': {field: pd.DataFrame(bar_panel[field]) for field in OHLCV_FIELDS},
+        'dates': date_panel.dates,
+        'symbols': date_panel.symbols,
+        'shape': date_panel.shape,
+        'source': np.concatenate(source),
+        'target': np.concatenate(target),
+        'market': Backtester.prepare(date_panel['Close']),
+        'backtest_params': backtest_params or {}
+    }
+
+
+def evaluate(state, lazy, params):
+    """
+    Backtest one parameter set
+
+    Parameters:
+    state (dict): Output of sweep_state
+    lazy (LazyIndicators): Indicator cache over state['fields'], reused across calls
+    params (dict): Full parameter set
+
+    Returns:
+    pandas.Series: Portfolio summary of the backtest
+    """
+    columns = {col: lazy.get(col, params).to_numpy() for col in SIGNAL_COLUMNS}
+    columns['Close'] = state['fields']['Close'].to_numpy()
+    bar_scores = signal_history(columns)['Score']
+
+    scores = np.full(state['shape'], np.nan)
+    scores.flat[state['target']] = bar_scores.flat[state['source']]
+    results = Backtester(**state['backtest_params']).simulate(
+        state['dates'], state['symbols'], state['market'], scores)
+    return results['summary'].loc['PORTFOLIO']
+
+
+_worker_state = None
+_worker_lazy = None
+
+
+def _init_worker(state):
+    global _worker_state, _worker_lazy
+    _worker_state = state
+    _worker_lazy = LazyIndicators(state['fields'])
+
+
+def _evaluate_chunk(combinations):
+    return [evaluate(_worker_state, _worker_lazy, params) for params in combinations]
+
+
+class ParameterSweep:
+    def __init__(self, frames, grid=None, processes=1, backtest_params=None):
+        """
+        Backtest every combination of a parameter grid across a universe
+
+        Work that does not depend on the parameters (stacking prices,
+        returns, date alignment) is done once. Each worker keeps one
+        indicator cache for all of its combinations, so intermediates such as
+        a 20-bar rolling mean, price deltas or a 12-span EWM base are
+        computed once per worker however many combinations use them.
+        Combinations are handed out in contiguous chunks to keep
+        combinations that share parameters on the same worker.
+
+        Parameters:
+        frames (dict): Stock symbols as keys and OHLCV DataFrames as values
+        grid (dict): TECHNICAL_PARAMS names as keys and lists of values; defaults to config.PARAM_GRID
+        processes (int): Worker processes (1 runs in this process)
+        backtest_params (dict): Keyword arguments for Backtester
+        """
+        self.frames = {symbol: df for symbol, df in frames.items() if df is not None and not df.empty}
+        self.grid = grid or PARAM_GRID
+        self.processes = processes
+        self.backtest_params = backtest_params
+
+    def run(self):
+        """
+        Evaluate the whole grid
+
+        Returns:
+        pandas.DataFrame: One row per combination (grid parameters plus the
+        portfolio backtest summary), best Sharpe ratio first
+        """
+        combinations = expand_grid(self.grid)
+        state = sweep_state(self.frames, self.backtest_params)
+
+        if self.processes <= 1:
+            lazy = LazyIndicators(state['fields'])
+            summaries = [evaluate(state, lazy, params) for params in combinations]
+        else:
+            n_chunks = min(len(combinations), self.processes * 4)
+            edges = np.linspace(0, len(combinations), n_chunks + 1).astype(int)
+            chunks = [combinations[start:stop] for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
+            with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                     initargs=(state,)) as executor:
+                summaries = [summary for chunk in executor.map(_evaluate_chunk, chunks) for summary in chunk]
+
+        rows = [{**{name: params[name] for name in self.grid}, **summary.to_dict()}
+                for params, summary in zip(combinations, summaries)]
+        return pd.DataFrame(rows).sort_values('Sharpe', ascending=False, ignore_index=True)
@@ -0,0 +1,179 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+import matplotlib.pyplot as plt
+from src.panel_indicators import INDICATOR_COLUMNS
+from src.stock_analyzer import StockAnalyzer
+
+# Marker telling a stage that its upstream has finished
+_DONE = None
+
+
+def _compute_worker(in_queue, out_queue, instrument=False, compact=False, technical_params=None):
+    """Indicator stage: turn (symbol, prices) into (symbol, results, timing samples)"""
+    analyzer = StockAnalyzer(instrument=instrument, compact=compact, technical_params=technical_params)
+    span = analyzer.instrumentation.span
+    while True:
+        item = in_queue.get()
+        if item is _DONE:
+            break
+        symbol, df = item
+        results = None
+        try:
+            if not set(INDICATOR_COLUMNS).issubset(df.columns):
+                with span('indicators', symbol):
+                    df = analyzer.calculate_technical_indicators(df)
+            if df is not None:
+                with span('signals', symbol):
+                    signals = analyzer.generate_signals(df)
+                results = analyzer.build_results(df, signals)
+        except Exception as e:
+            print(f"Error computing indicators for {symbol}: {str(e)}")
+        out_queue.put((symbol, results, analyzer.instrumentation.drain()))
+
+
+def _plot_worker(in_queue, out_queue, fast_plots, instrument=False):
+    """Plot stage: render the charts and pass the results on unchanged"""
+    plt.switch_backend('Agg')
+    analyzer = StockAnalyzer(fast_plots=fast_plots, instrument=instrument)
+    while True:
+        item = in_queue.get()
+        if item is _DONE:
+            break
+        symbol, results, samples = item
+        if results is not None:
+            with analyzer.instrumentation.span('plot', symbol):
+                analyzer.plot_technical_analysis(results['data'], symbol)
+        # Timing samples travel with the item so the parent process can aggregate them
+        out_queue.put((symbol, results, samples + analyzer.instrumentation.drain()))
+
+
+class AnalysisPipeline:
+    def __init__(self, analyzer, fetch_workers=4, compute_workers=2, plot_workers=2,
+                 queue_size=16, fetch_batch_size=20, max_retries=3, keep_frames=True):
+        """
+        Run fetch, indicator, plot and export stages concurrently
+
+        Fetch threads download batches of symbols through the analyzer's
+        batched, rate-limited path; indicators and plots run in
+        worker processes and exporting runs on a thread that owns `analyzer`.
+        Stages are connected by bounded queues, so a slow stage makes the ones
+        upstream of it wait instead of piling up frames in memory, and the
+        run takes as long as its slowest stage rather than the sum of all of them.
+
+        Parameters:
+        analyzer (StockAnalyzer): Analyzer used for fetching and exporting
+        fetch_workers (int): Number of fetch threads
+        compute_workers (int): Number of indicator processes
+        plot_workers (int): Number of plotting processes
+        queue_size (int): Capacity of each queue between stages
+        fetch_batch_size (int): Symbols downloaded per fetch request
+        max_retries (int): Fetch attempts per symbol
+        keep_frames (bool): Keep each symbol's frame in the returned results after it is exported
+        """
+        self.analyzer = analyzer
+        self.fetch_workers = fetch_workers
+        self.compute_workers = compute_workers
+        self.plot_workers = plot_workers
+        self.queue_size = queue_size
+        self.fetch_batch_size = fetch_batch_size
+        self.max_retries = max_retries
+        self.keep_frames = keep_frames
+
+    def _fetch(self, batches, out_queue, failed):
+        while True:
+            try:
+                batch = batches.get_nowait()
+            except queue.Empty:
+                return
+            with self.analyzer.instrumentation.span('fetch_batch'):
+                frames = self.analyzer.get_multiple_stock_data(
+                    batch, batch_size=len(batch), max_workers=1)
+            for symbol in batch:
+                df = frames.get(symbol)
+                # Symbols missing from the batch response are retried one at a time
+                for _ in range(1, self.max_retries):
+                    if df is not None:
+                        break
+                    self.analyzer.instrumentation.increment('retries', symbol)
+                    time.sleep(2)  # Wait before retrying
+                    with self.analyzer.instrumentation.span('fetch', symbol):
+                        df = self.analyzer.get_stock_data(symbol)
+                if df is None:
+                    failed.append(symbol)
+                else:
+                    out_queue.put((symbol, df))
+
+    def _export(self, in_queue, all_results, failed, on_result):
+        while True:
+            item = in_queue.get()
+            if item is _DONE:
+                break
+            symbol, results, samples = item
+            self.analyzer.instrumentation.merge(samples)
+            if results is None:
+                failed.append(symbol)
+                continue
+            self.analyzer.export_results(results, symbol)
+            if not self.keep_frames:
+                results.pop('data', None)
+            all_results[symbol] = results
+            if on_result is not None:
+                on_result(symbol, results)
+
+    def run(self, symbols, on_result=None):
+        """
+        Analyse every symbol through the pipeline
+
+        Parameters:
+        symbols (list): List of stock symbols
+        on_result (callable): Called with (symbol, results) as each symbol is exported
+
+        Returns:
+        tuple: (all_results, failed_symbols)
+        """
+        all_results = {}
+        failed = []
+
+        batch_queue = queue.Queue()
+        for i in range(0, len(symbols), self.fetch_batch_size):
+            batch_queue.put(symbols[i:i + self.fetch_batch_size])
+        compute_queue = mp.Queue(maxsize=self.queue_size)
+        plot_queue = mp.Queue(maxsize=self.queue_size)
+        export_queue = mp.Queue(maxsize=self.queue_size)
+
+        instrument = self.analyzer.instrumentation.enabled
+        compute_procs = [mp.Process(target=_compute_worker,
+                                    args=(compute_queue, plot_queue, instrument, self.analyzer.compact,
+                                          self.analyzer.technical_params),
+                                    daemon=True)
+                         for _ in range(self.compute_workers)]
+        fast_plots = self.analyzer.chart_renderer is not None
+        plot_procs = [mp.Process(target=_plot_worker, args=(plot_queue, export_queue, fast_plots, instrument),
+                                 daemon=True)
+                      for _ in range(self.plot_workers)]
+        exporter = threading.Thread(target=self._export,
+                                    args=(export_queue, all_results, failed, on_result))
+        fetchers = [threading.Thread(target=self._fetch,
+                                     args=(batch_queue, compute_queue, failed))
+                    for _ in range(self.fetch_workers)]
+
+        for worker in compute_procs + plot_procs + [exporter] + fetchers:
+            worker.start()
+
+        # Shut the stages down in order: each one drains before the next is told to stop
+        for fetcher in fetchers:
+            fetcher.join()
+        for _ in compute_procs:
+            compute_queue.put(_DONE)
+        for proc in compute_procs:
+            proc.join()
+        for _ in plot_procs:
+            plot_queue.put(_DONE)
+        for proc in plot_procs:
+            proc.join()
+        export_queue.put(_DONE)
+        exporter.join()
+
+        return all_results, [symbol for symbol in symbols if symbol in failed]
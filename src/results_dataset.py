@@ -0,0 +1,184 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc
+from datetime import datetime
+from src.signals import SIGNAL_LABELS
+
+# Scalar metrics from results['technical_analysis'] and their Arrow types
+METRIC_TYPES = {
+    'last_price': pa.float64(),
+    'volume': pa.int64(),
+    'rsi': pa.float64(),
+    'macd': pa.float64(),
+    'stochastic_k': pa.float64(),
+    'mfi': pa.float64(),
+    'atr': pa.float64(),
+    'roc': pa.float64()
+}
+
+
+class ResultsDataset:
+    def __init__(self, root='output/dataset'):
+        """
+        Typed, memory-mappable store for a run's results
+
+        Each run writes a `run_date=YYYY-MM-DD` partition with two Arrow IPC files:
+        technical.arrow holds every symbol's bars and indicators (one record
+        batch per symbol, so one symbol can be read without touching the
+        rest) and metrics.arrow holds one row of latest metrics per symbol,
+        with the signals stored as dictionary-encoded categorical codes.
+
+        Parameters:
+        root (str): Directory holding the run partitions
+        """
+        self.root = root
+
+    def _partition(self, run_date):
+        return os.path.join(self.root, f'run_date={run_date}')
+
+    def run_dates(self):
+        """Return the run dates stored in the dataset, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name.split('=', 1)[1] for name in os.listdir(self.root)
+                      if name.startswith('run_date='))
+
+    @staticmethod
+    def _technical_batch(df, symbol_index, symbol_dictionary, schema):
+        index = df.index.tz_localize(None) if getattr(df.index, 'tz', None) is not None else df.index
+        arrays = [
+            pa.DictionaryArray.from_arrays(pa.array(np.full(len(df), symbol_index, dtype=np.int32)),
+                                           symbol_dictionary),
+            pa.array(index.values, type=pa.timestamp('ns'))
+        ]
+        for field in list(schema)[2:]:
+            if field.name in df.columns:
+                values = df[field.name].to_numpy()
+                if pa.types.is_integer(field.type):
+                    values = np.nan_to_num(values.astype(np.float64)).astype(np.int64)
+                arrays.append(pa.array(values, type=field.type, from_pandas=True))
+            else:
+                arrays.append(pa.nulls(len(df), type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def write(self, all_results, run_date=None):
+        """
+        Write one run partition
+
+        Parameters:
+        all_results (dict): Stock symbols as keys and analyze_stock results as values
+        run_date (str): Partition date, defaults to today
+
+        Returns:
+        str: Path of the partition directory
+        """
+        run_date = run_date or datetime.now().strftime('%Y-%m-%d')
+        partition = self._partition(run_date)
+        os.makedirs(partition, exist_ok=True)
+
+        symbols = sorted(symbol for symbol, results in all_results.items()
+                         if results and 'technical_analysis' in results)
+        symbol_dictionary = pa.array(symbols, type=pa.string())
+        positions = {symbol: i for i, symbol in enumerate(symbols)}
+
+        # Technical data: one record batch per symbol
+        frames = {symbol: all_results[symbol].get('data') for symbol in symbols}
+        frames = {symbol: df for symbol, df in frames.items() if df is not None}
+        columns = []
+        for df in frames.values():
+            columns += [col for col in df.columns if col not in columns]
+        batch_index = {symbol: i for i, symbol in enumerate(frames)}
+        fields = [pa.field('symbol', pa.dictionary(pa.int32(), pa.string())),
+                  pa.field('date', pa.timestamp('ns'))]
+        fields += [pa.field(col, pa.int64() if col == 'Volume' else pa.float64()) for col in columns]
+        schema = pa.schema(fields, metadata={'batch_index': json.dumps(batch_index)})
+
+        technical_path = os.path.join(partition, 'technical.arrow')
+        with pa.OSFile(technical_path + '.tmp', 'wb') as sink:
+            with pa.ipc.new_file(sink, schema) as writer:
+                for symbol, df in frames.items():
+                    writer.write_batch(self._technical_batch(
+                        df, positions[symbol], symbol_dictionary, schema))
+        os.replace(technical_path + '.tmp', technical_path)
+
+        # Latest metrics and signals: one row per symbol
+        metrics = {'symbol': pa.DictionaryArray.from_arrays(
+            pa.array(np.arange(len(symbols), dtype=np.int32)), symbol_dictionary)}
+        for name, arrow_type in METRIC_TYPES.items():
+            values = pd.Series([all_results[symbol]['technical_analysis'].get(name) for symbol in symbols],
+                               dtype='float64')
+            if pa.types.is_integer(arrow_type):
+                values = values.round().astype('Int64')
+            metrics[name] = pa.array(values, type=arrow_type, from_pandas=True)
+        for signal, labels in SIGNAL_LABELS.items():
+            codes = []
+            for symbol in symbols:
+                label = all_results[symbol]['technical_analysis']['signals'].get(signal)
+                codes.append(labels.index(label) if label in labels else None)
+            metrics[signal] = pa.DictionaryArray.from_arrays(
+                pa.array(codes, type=pa.int8()), pa.array(labels, type=pa.string()))
+
+        metrics_path = os.path.join(partition, 'metrics.arrow')
+        table = pa.table(metrics)
+        with pa.OSFile(metrics_path + '.tmp', 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(metrics_path + '.tmp', metrics_path)
+
+        return partition
+
+    def _open(self, name, run_date=None):
+        run_date = run_date or (self.run_dates() or [None])[-1]
+        if run_date is None:
+            raise FileNotFoundError(f"No runs stored under {self.root}")
+        source = pa.memory_map(os.path.join(self._partition(run_date), name), 'r')
+        return pa.ipc.open_file(source)
+
+    def read_symbol(self, symbol, run_date=None):
+        """
+        Read one symbol's bars and indicators without scanning other symbols
+
+        Parameters:
+        symbol (str): Stock symbol
+        run_date (str): Partition date, defaults to the latest run
+
+        Returns:
+        pandas.DataFrame: Bars indexed by date, or None if the symbol is not stored
+        """
+        reader = self._open('technical.arrow', run_date)
+        batch_index = json.loads(reader.schema.metadata[b'batch_index'])
+        if symbol not in batch_index:
+            return None
+        batch = reader.get_batch(batch_index[symbol])
+        df = batch.to_pandas().drop(columns=['symbol']).set_index('date')
+        df.index.name = 'Date'
+        return df
+
+    def read_metric(self, metric, run_date=None):
+        """
+        Read a single metric or signal column for every symbol of one run
+
+        Only the metrics.arrow file of the `run_date` partition is opened.
+        It is memory-mapped, so reading its table copies nothing, and only
+        the symbol and requested columns are converted to pandas.
+
+        Parameters:
+        metric (str): Metric name (e.g. 'rsi') or signal name (e.g. 'MACD')
+        run_date (str): Partition date, defaults to the latest run
+
+        Returns:
+        pandas.Series: Values indexed by symbol; signals come back as categoricals
+        """
+        table = self._open('metrics.arrow', run_date).read_all().select(['symbol', metric])
+        symbols = table.column('symbol').to_pandas().astype(str)
+        return pd.Series(table.column(metric).to_pandas().values, index=symbols.values, name=metric)
+
+    def read_metrics(self, run_date=None):
+        """Read the full typed metrics table as a DataFrame indexed by symbol"""
+        table = self._open('metrics.arrow', run_date).read_all()
+        df = table.to_pandas()
+        df['symbol'] = df['symbol'].astype(str)
+        return df.set_index('symbol')
@@ -0,0 +1,173 @@
+import numbers
+import numpy as np
+import pandas as pd
+from config import FUNDAMENTAL_THRESHOLDS
+
+# FUNDAMENTAL_THRESHOLDS key -> (metric, bound, scale). yfinance reports
+# debtToEquity in percent, so that threshold is scaled to match the data.
+THRESHOLD_CRITERIA = {
+    'MIN_MARKET_CAP': ('Market_Cap', 'min', 1),
+    'MAX_PE': ('PE_Ratio', 'max', 1),
+    'MIN_PROFIT_MARGIN': ('Profit_Margin', 'min', 1),
+    'MAX_DEBT_TO_EQUITY': ('Debt_To_Equity', 'max', 100),
+    'MIN_CURRENT_RATIO': ('Current_Ratio', 'min', 1),
+    'MIN_ROE': ('ROE', 'min', 1)
+}
+
+
+def to_float(value):
+    """Return a metric as float, NaN for 'N/A', None, booleans and other non-numbers"""
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return float(value)
+    return np.nan
+
+
+def thresholds_to_criteria(thresholds=None):
+    """
+    Turn FUNDAMENTAL_THRESHOLDS-style limits into screener criteria
+
+    Parameters:
+    thresholds (dict): Threshold names as keys; defaults to config.FUNDAMENTAL_THRESHOLDS
+
+    Returns:
+    dict: Metric as key and inclusive (low, high) bounds as value, None where open
+
+    Raises:
+    KeyError: For a threshold name not in THRESHOLD_CRITERIA
+    """
+    criteria = {}
+    for key, limit in (FUNDAMENTAL_THRESHOLDS if thresholds is None else thresholds).items():
+        if key not in THRESHOLD_CRITERIA:
+            raise KeyError(f"Unknown fundamental threshold: {key}")
+        if limit is None:
+            continue
+        metric, bound, scale = THRESHOLD_CRITERIA[key]
+        low, high = criteria.get(metric, (None, None))
+        if bound == 'min':
+            low = limit * scale
+        else:
+            high = limit * scale
+        criteria[metric] = (low, high)
+    return criteria
+
+
+class FundamentalScreener:
+    def __init__(self, symbols, columns):
+        """
+        Typed column store of a universe's fundamentals with a sorted index per metric
+
+        Each metric is a float64 array (NaN where a value is missing) plus
+        the row order that sorts it, so a range query is two binary searches
+        instead of a scan. Multi-criteria queries start from the narrowest
+        range and intersect it with the others, which keeps screens over tens
+        of thousands of symbols in the millisecond range.
+
+        Parameters:
+        symbols (list): Symbol of every row
+        columns (dict): Metric name as key and numeric values (one per symbol) as value
+        """
+        self.symbols = np.asarray(symbols, dtype=object)
+        self.columns = {}
+        self.order = {}
+        self.sorted = {}
+        for name, values in columns.items():
+            values = np.asarray(values, dtype=np.float64)
+            # argsort places NaN last; the searches below only cover the valid prefix
+            order = np.argsort(values, kind='stable')
+            n_valid = int(np.count_nonzero(~np.isnan(values)))
+            self.columns[name] = values
+            self.order[name] = order[:n_valid]
+            self.sorted[name] = values[order[:n_valid]]
+
+    @classmethod
+    def from_metrics(cls, metrics, fields=None):
+        """
+        Build a screener from FundamentalAnalyzer results
+
+        Parameters:
+        metrics (dict): Stock symbols as keys and analyze_stock dicts as values
+        fields (list): Metrics to index; defaults to every numeric metric present
+            plus every THRESHOLD_CRITERIA metric, so a threshold on a metric no
+            symbol reports matches nothing instead of failing
+
+        Returns:
+        FundamentalScreener: Screener over the symbols in `metrics`
+        """
+        symbols = list(metrics)
+        if fields is None:
+            fields = list(dict.fromkeys([key for values in metrics.values() for key, value in values.items()
+                                         if not np.isnan(to_float(value))] +
+                                        [metric for metric, _, _ in THRESHOLD_CRITERIA.values()]))
+        columns = {field: np.array([to_float(metrics[symbol].get(field)) for symbol in symbols])
+                   for field in fields}
+        return cls(symbols, columns)
+
+    def range_rows(self, name, low=None, high=None):
+        """
+        Rows whose metric lies in [low, high] (NaN never matches)
+
+        Parameters:
+        name (str): Metric name
+        low (float): Inclusive lower bound, None for open
+        high (float): Inclusive upper bound, None for open
+
+        Returns:
+        numpy.ndarray: Matching row positions, in ascending order of the metric
+        """
+        values = self.sorted[name]
+        start = 0 if low is None else np.searchsorted(values, low, side='left')
+        stop = len(values) if high is None else np.searchsorted(values, high, side='right')
+        return self.order[name][start:max(start, stop)]
+
+    def query(self, criteria):
+        """
+        Rows matching every range in `criteria`
+
+        Parameters:
+        criteria (dict): Metric as key and inclusive (low, high) bounds as value
+
+        Returns:
+        numpy.ndarray: Matching row positions, in universe order
+
+        Raises:
+        KeyError: For a metric the screener does not index, so a misspelt
+        criterion fails instead of silently widening the result
+        """
+        unknown = [name for name in criteria if name not in self.columns]
+        if unknown:
+            raise KeyError(f"Unknown screening metric(s): {', '.join(unknown)}")
+        if not criteria:
+            return np.arange(len(self.symbols))
+        ranges = sorted((self.range_rows(name, low, high) for name, (low, high) in criteria.items()), key=len)
+        rows = ranges[0]
+        member = np.zeros(len(self.symbols), dtype=bool)
+        for other in ranges[1:]:
+            if not len(rows):
+                break
+            member[other] = True
+            rows = rows[member[rows]]
+            member[other] = False
+        return np.sort(rows)
+
+    def screen(self, thresholds=None, criteria=None):
+        """
+        Symbols passing FUNDAMENTAL_THRESHOLDS (or explicit criteria)
+
+        Every criterion must name an indexed metric (see query); symbols
+        without a value for a metric never pass a criterion on it.
+
+        Parameters:
+        thresholds (dict): Threshold names as keys; defaults to config.FUNDAMENTAL_THRESHOLDS
+        criteria (dict): Metric as key and (low, high) as value; overrides `thresholds`
+
+        Returns:
+        pandas.DataFrame: Screened metrics indexed by symbol, in universe order
+
+        Raises:
+        KeyError: For an unknown threshold name or screening metric
+        """
+        if criteria is None:
+            criteria = thresholds_to_criteria(thresholds)
+        rows = self.query(criteria)
+        return pd.DataFrame({name: values[rows] for name, values in self.columns.items()},
+                            index=pd.Index(self.symbols[rows], name='Symbol'))
@@ -1,15 +1,29 @@
-import requests
-from bs4 import BeautifulSoup
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import time
+from src.news_fetcher import NewsFetcher
+from src.news_parser import NewsPageParser
+from src.headline_sentiment import HeadlineScorer
+from src.mention_extractor import MentionExtractor
+
+# Scores beyond +/- this count as positive / negative mentions
+POLARITY_THRESHOLD = 0.05
 
 class SentimentAnalyzer:
-    def __init__(self):
-        """Initialize the Sentiment Analyzer"""
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+    def __init__(self, news_fetcher=None, scorer=None, news_parser=None):
+        """
+        Initialize the Sentiment Analyzer
+
+        Parameters:
+        news_fetcher (NewsFetcher): Pooled, cached news fetcher; defaults to one with an in-memory cache
+        scorer (HeadlineScorer): Batched, memoised text scorer; defaults to the bundled lexicon
+        news_parser (NewsPageParser): Event-based news item extractor with a parsed-page cache
+        """
+        self.news_fetcher = news_fetcher or NewsFetcher()
+        self.scorer = scorer or HeadlineScorer()
+        self.news_parser = news_parser or NewsPageParser()
+        self.headers = self.news_fetcher.headers
     
     def get_news_sentiment(self, symbol):
         """
@@ -21,74 +35,129 @@ class SentimentAnalyzer:
         Returns:
         dict: News sentiment analysis results
         """
+        return self.get_universe_news_sentiment([symbol]).get(symbol)
+
+    def get_universe_news_sentiment(self, symbols):
+        """
+        Get news sentiment for many stocks, fetching every page concurrently
+        
+        Parameters:
+        symbols (list): Stock symbols
+        
+        Returns:
+        dict: Stock symbols as keys and news sentiment results as values (None where the fetch failed)
+        """
         try:
-            # Example URL - you would need to replace with actual news API
-            url = f"https://finance.yahoo.com/quote/{symbol}/news"
-            response = requests.get(url, headers=self.headers)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                news_items = self._parse_news(soup)
-                sentiment = self._analyze_news_sentiment(news_items)
-                return {
-                    'news_items': news_items,
-                    'sentiment_score': sentiment
-                }
-            else:
-                return None
-                
+            pages = self.news_fetcher.fetch_news(symbols)
         except Exception as e:
-            print(f"Error analyzing news sentiment for {symbol}: {str(e)}")
-            return None
+            print(f"Error fetching news: {str(e)}")
+            return {symbol: None for symbol in symbols}
+
+        try:
+            parsed = self.news_parser.parse_pages(pages)
+        except Exception as e:
+            print(f"Error parsing news pages: {str(e)}")
+            return {symbol: None for symbol in symbols}
+
+        # Score every headline of the universe in one batch
+        headlines = [self._headline(item) for items in parsed.values() if items for item in items]
+        scores = iter(self.scorer.score(headlines))
+        results = {}
+        for symbol, news_items in parsed.items():
+            if news_items is None:
+                results[symbol] = None
+                continue
+            item_scores = [next(scores) for _ in news_items]
+            results[symbol] = {
+                'news_items': news_items,
+                'sentiment_score': float(np.mean(item_scores)) if item_scores else 0.0
+            }
+        return results
     
-    def _parse_news(self, soup):
+    def _parse_news(self, html):
         """
         Parse news articles from HTML
         
         Parameters:
-        soup (BeautifulSoup): Parsed HTML
+        html (str): News page HTML
         
         Returns:
-        list: List of news items
+        list: List of news items (dicts with 'title', 'url' and, when present, 'summary' and 'source')
         """
-        news_items = []
-        # Implementation would depend on the specific HTML structure
-        # This is a placeholder
-        return news_items
+        return self.news_parser.parse(html)
     
+    @staticmethod
+    def _headline(item):
+        """Text to score for a news item: a string, or a dict's title and summary"""
+        if isinstance(item, dict):
+            return ' '.join(str(item[key]) for key in ('title', 'summary') if item.get(key))
+        return str(item)
+
     def _analyze_news_sentiment(self, news_items):
         """
         Analyze sentiment of news items
         
         Parameters:
-        news_items (list): List of news items
+        news_items (list): List of news items (headline strings or dicts with 'title')
         
         Returns:
-        float: Sentiment score
+        float: Sentiment score in (-1, 1), the mean over the items
         """
-        # Placeholder for sentiment analysis implementation
-        # Would typically use NLP library like NLTK or TextBlob
-        return 0.0
+        if not news_items:
+            return 0.0
+        return float(self.scorer.score([self._headline(item) for item in news_items]).mean())
     
-    def get_social_media_sentiment(self, symbol):
+    def get_social_media_sentiment(self, symbol, posts=None):
         """
         Get social media sentiment for a stock
         
         Parameters:
         symbol (str): Stock symbol
+        posts (list): Post texts mentioning the symbol; no social source is
+            connected yet, so without posts the result is neutral
         
         Returns:
         dict: Social media sentiment analysis results
         """
-        # Placeholder for social media sentiment analysis
-        # Would typically connect to Twitter/Reddit API
+        if not posts:
+            return {
+                'sentiment_score': 0.0,
+                'mentions': 0,
+                'positive_mentions': 0,
+                'negative_mentions': 0
+            }
+        scores = self.scorer.score(posts)
         return {
-            'sentiment_score': 0.0,
-            'mentions': 0,
-            'positive_mentions': 0,
-            'negative_mentions': 0
+            'sentiment_score': float(scores.mean()),
+            'mentions': len(posts),
+            'positive_mentions': int((scores > POLARITY_THRESHOLD).sum()),
+            'negative_mentions': int((scores < -POLARITY_THRESHOLD).sum())
         }
     
+    def get_social_feed_sentiment(self, feed, symbols, names=None, text_field='text'):
+        """
+        Social media sentiment for a whole universe from a JSONL post feed
+        
+        Parameters:
+        feed (str or iterable): Path of a JSONL file, or an iterable of JSON lines or dicts
+        symbols (list): Stock symbols to attribute posts to
+        names (dict): Stock symbols as keys and company names as values, matched alongside tickers
+        text_field (str): Key of the post text in each record
+        
+        Returns:
+        dict: Stock symbols as keys and results shaped like get_social_media_sentiment as values
+        """
+        try:
+            extractor = MentionExtractor(symbols, names)
+            results, skipped = extractor.process_feed(feed, self.scorer, text_field=text_field,
+                                                      polarity_threshold=POLARITY_THRESHOLD)
+            if skipped:
+                print(f"Skipped {skipped} malformed feed records")
+            return results
+        except Exception as e:
+            print(f"Error analyzing social feed: {str(e)}")
+            return {symbol: self.get_social_media_sentiment(symbol) for symbol in symbols}
+    
     def calculate_overall_sentiment(self, news_sentiment, social_sentiment):
         """
         Calculate overall sentiment score
@@ -100,8 +169,10 @@ class SentimentAnalyzer:
         Returns:
         float: Overall sentiment score
         """
-        if news_sentiment and social_sentiment:
-            # Combine different sentiment scores (simplified)
-            return (news_sentiment.get('sentiment_score', 0) + 
-                   social_sentiment.get('sentiment_score', 0)) / 2
-        return 0.0
+        scores = []
+        if news_sentiment and news_sentiment.get('news_items'):
+            scores.append(news_sentiment.get('sentiment_score', 0))
+        if social_sentiment and social_sentiment.get('mentions'):
+            scores.append(social_sentiment.get('sentiment_score', 0))
+        # Sources without any text carry no signal and are left out of the average
+        return sum(scores) / len(scores) if scores else 0.0
@@ -0,0 +1,151 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from src.panel import PricePanel
+from src.panel_indicators import INDICATOR_COLUMNS, compute_panel_indicators
+
+
+class SharedPanel:
+    def __init__(self, fields, outputs, shape, input_block, output_block, owner=False):
+        """
+        Price panel and indicator outputs held in shared memory
+
+        Inputs are one float64 block of shape (fields, dates, symbols) and
+        outputs a second block of shape (outputs, dates, symbols). Worker
+        processes attach to both by name, read their slice of symbol columns
+        and write indicators straight into the output block, so neither the
+        prices nor the results are pickled between processes.
+
+        Use `create()` in the parent and `attach()` in workers rather than
+        calling this directly.
+
+        Parameters:
+        fields (list): Input field names, in block order
+        outputs (list): Output column names, in block order
+        shape (tuple): (dates, symbols)
+        input_block (SharedMemory): Block holding the input fields
+        output_block (SharedMemory): Block holding the outputs
+        owner (bool): Whether this process created (and must unlink) the blocks
+        """
+        self.fields = list(fields)
+        self.outputs = list(outputs)
+        self.shape = tuple(shape)
+        self.input_block = input_block
+        self.output_block = output_block
+        self.owner = owner
+        self.inputs = np.ndarray((len(self.fields),) + self.shape, dtype=np.float64, buffer=input_block.buf)
+        self.results = np.ndarray((len(self.outputs),) + self.shape, dtype=np.float64, buffer=output_block.buf)
+
+    @classmethod
+    def create(cls, panel, outputs=INDICATOR_COLUMNS):
+        """
+        Copy a panel into new shared memory blocks (the only copy of the prices)
+
+        Parameters:
+        panel (PricePanel): Aligned price panel
+        outputs (list): Output columns to preallocate, filled with NaN
+
+        Returns:
+        SharedPanel: Owning handle; call `unlink()` when done
+        """
+        fields = list(panel.fields)
+        n_values = len(panel.dates) * len(panel.symbols)
+        input_block = shared_memory.SharedMemory(create=True, size=max(1, len(fields) * n_values * 8))
+        output_block = shared_memory.SharedMemory(create=True, size=max(1, len(outputs) * n_values * 8))
+        shared = cls(fields, outputs, panel.shape, input_block, output_block, owner=True)
+        for k, field in enumerate(fields):
+            shared.inputs[k] = panel[field]
+        shared.results.fill(np.nan)
+        return shared
+
+    @property
+    def spec(self):
+        """Picklable description workers pass to `attach()`"""
+        return {'fields': self.fields, 'outputs': self.outputs, 'shape': self.shape,
+                'input': self.input_block.name, 'output': self.output_block.name}
+
+    @classmethod
+    def attach(cls, spec):
+        """Attach to blocks created by another process"""
+        return cls(spec['fields'], spec['outputs'], spec['shape'],
+                   shared_memory.SharedMemory(name=spec['input']),
+                   shared_memory.SharedMemory(name=spec['output']))
+
+    def panel(self, start=0, stop=None):
+        """
+        Return a PricePanel whose arrays are views of symbol columns [start, stop)
+
+        Dates and symbols are left empty: the indicator engine only needs the arrays.
+        """
+        fields = {field: self.inputs[k, :, start:stop] for k, field in enumerate(self.fields)}
+        return PricePanel(None, [], fields)
+
+    def write(self, columns, start=0, stop=None):
+        """Store computed columns for symbol columns [start, stop) in the output block"""
+        for k, name in enumerate(self.outputs):
+            self.results[k, :, start:stop] = columns[name]
+
+    def columns(self):
+        """Return the outputs as a dict of (dates x symbols) views of shared memory"""
+        return {name: self.results[k] for k, name in enumerate(self.outputs)}
+
+    def close(self):
+        # Drop the array views first; the buffers cannot be released while they exist
+        del self.inputs, self.results
+        self.input_block.close()
+        self.output_block.close()
+
+    def unlink(self):
+        """Close and free the blocks (owner only)"""
+        self.close()
+        if self.owner:
+            self.input_block.unlink()
+            self.output_block.unlink()
+
+
+_worker_panel = None
+_worker_params = None
+
+
+def _attach_worker(spec, params):
+    global _worker_panel, _worker_params
+    _worker_panel = SharedPanel.attach(spec)
+    _worker_params = params
+
+
+def _compute_columns(bounds):
+    start, stop = bounds
+    columns = compute_panel_indicators(_worker_panel.panel(start, stop), _worker_params)
+    _worker_panel.write(columns, start, stop)
+    return bounds
+
+
+def compute_shared_indicators(panel, processes=2, params=None):
+    """
+    Calculate panel indicators across worker processes over shared memory
+
+    Symbols are independent, so each worker computes a contiguous slice of
+    symbol columns and writes it into the shared output block.
+
+    Parameters:
+    panel (PricePanel): Aligned OHLCV panel
+    processes (int): Number of worker processes
+    params (dict): Overrides for config.TECHNICAL_PARAMS
+
+    Returns:
+    dict: Indicator name as key and 2-D array (dates x symbols) as value, as compute_panel_indicators
+    """
+    n_symbols = len(panel.symbols)
+    processes = max(1, min(processes, n_symbols))
+    edges = np.linspace(0, n_symbols, processes + 1).astype(int)
+    bounds = [(int(start), int(stop)) for start, stop in zip(edges[:-1], edges[1:]) if stop > start]
+
+    shared = SharedPanel.create(panel)
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_attach_worker,
+                                 initargs=(shared.spec, params)) as executor:
+            list(executor.map(_compute_columns, bounds))
+        # Copy out once so the blocks can be freed
+        return {name: values.copy() for name, values in shared.columns().items()}
+    finally:
+        shared.unlink()
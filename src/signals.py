@@ -0,0 +1,229 @@
+import numpy as np
+
+# Every label classify_signals can emit, per signal. The list position is the
+# stable categorical code used when signals are stored outside Python.
+SIGNAL_LABELS = {
+    'RSI': ['Oversold', 'Neutral', 'Overbought'],
+    'MACD': ['Sell', 'Buy'],
+    'Long_Term_Trend': ['Bearish', 'Bullish'],
+    'Stochastic': ['Oversold', 'Neutral', 'Overbought'],
+    'MFI': ['Oversold', 'Neutral', 'Overbought'],
+    'Bollinger': ['Below Lower Band', 'Within Bands', 'Above Upper Band'],
+    'Volume_Trend': ['Decreasing', 'Increasing'],
+    'Volatility': ['Low', 'Moderate', 'High']
+}
+
+# Indicator columns classify_signals reads; enough to compute when only signals are needed
+SIGNAL_COLUMNS = ['RSI', 'MACD', 'Signal_Line', 'SMA_200', 'Stochastic_K', 'MFI',
+                  'BB_upper', 'BB_lower', 'OBV', 'ATR']
+
+
+def classify_signals(latest, prev_obv):
+    """
+    Classify the latest indicator values into trading signals
+
+    Parameters:
+    latest (pandas.Series or dict): Latest bar with price and indicator columns
+    prev_obv (float): OBV of the bar before `latest`
+
+    Returns:
+    dict: Signal name as key and label as value
+    """
+    signals = {}
+
+    # RSI signals
+    last_rsi = latest['RSI']
+    if last_rsi > 70:
+        signals['RSI'] = 'Overbought'
+    elif last_rsi < 30:
+        signals['RSI'] = 'Oversold'
+    else:
+        signals['RSI'] = 'Neutral'
+
+    # MACD signals
+    if latest['MACD'] > latest['Signal_Line']:
+        signals['MACD'] = 'Buy'
+    else:
+        signals['MACD'] = 'Sell'
+
+    # Moving Average signals
+    if latest['Close'] > latest['SMA_200']:
+        signals['Long_Term_Trend'] = 'Bullish'
+    else:
+        signals['Long_Term_Trend'] = 'Bearish'
+
+    # Stochastic signals
+    if latest['Stochastic_K'] > 80:
+        signals['Stochastic'] = 'Overbought'
+    elif latest['Stochastic_K'] < 20:
+        signals['Stochastic'] = 'Oversold'
+    else:
+        signals['Stochastic'] = 'Neutral'
+
+    # MFI signals
+    if latest['MFI'] > 80:
+        signals['MFI'] = 'Overbought'
+    elif latest['MFI'] < 20:
+        signals['MFI'] = 'Oversold'
+    else:
+        signals['MFI'] = 'Neutral'
+
+    # Bollinger Bands signals
+    if latest['Close'] > latest['BB_upper']:
+        signals['Bollinger'] = 'Above Upper Band'
+    elif latest['Close'] < latest['BB_lower']:
+        signals['Bollinger'] = 'Below Lower Band'
+    else:
+        signals['Bollinger'] = 'Within Bands'
+
+    # Volume signals
+    if latest['OBV'] > prev_obv:
+        signals['Volume_Trend'] = 'Increasing'
+    else:
+        signals['Volume_Trend'] = 'Decreasing'
+
+    # Volatility (using ATR)
+    atr_percent = (latest['ATR'] / latest['Close']) * 100
+    if atr_percent > 2:
+        signals['Volatility'] = 'High'
+    elif atr_percent < 1:
+        signals['Volatility'] = 'Low'
+    else:
+        signals['Volatility'] = 'Moderate'
+
+    return signals
+
+
+# Recommendation labels in score order; positions are the stable codes
+RECOMMENDATION_LABELS = ['Strong Sell', 'Sell', 'Hold', 'Buy', 'Strong Buy']
+
+# Points each signal label adds to the 0-100 recommendation score, as in
+# StockAnalyzer.generate_recommendation (RSI Oversold/Neutral mirror its rsi < 30 / neutral branches)
+SCORE_POINTS = {
+    'Long_Term_Trend': {'Bullish': 30},
+    'RSI': {'Oversold': 15, 'Neutral': 7.5},
+    'MACD': {'Buy': 20},
+    'Volume_Trend': {'Increasing': 15},
+    'Bollinger': {'Below Lower Band': 10, 'Within Bands': 5},
+    'Stochastic': {'Oversold': 10, 'Neutral': 5}
+}
+
+
+def _select(signal, choices, default):
+    """np.select over label names: the first matching condition wins"""
+    labels = SIGNAL_LABELS[signal]
+    return np.select([mask for mask, _ in choices], [labels.index(label) for _, label in choices],
+                     labels.index(default)).astype(np.int8)
+
+
+def _previous_valid(values, valid):
+    """Value of the last valid earlier row along axis 0 (NaN if there is none)"""
+    rows = np.arange(len(values)).reshape((-1,) + (1,) * (values.ndim - 1))
+    last = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+    prev = np.full(values.shape, -1)
+    prev[1:] = last[:-1]
+    filled = np.take_along_axis(values, np.maximum(prev, 0), axis=0)
+    return np.where(prev >= 0, filled, np.nan)
+
+
+def signal_codes(columns):
+    """
+    Classify every bar at once, like classify_signals does for the latest one
+
+    Parameters:
+    columns (dict): 'Close' and SIGNAL_COLUMNS as keys, arrays of shape
+    (bars,) or (bars, symbols) as values
+
+    Returns:
+    dict: Signal name as key and int8 codes (positions in SIGNAL_LABELS) as
+    value; bars without a Close are coded -1
+    """
+    close = np.asarray(columns['Close'], dtype=np.float64)
+    listed = ~np.isnan(close)
+    get = lambda name: np.asarray(columns[name], dtype=np.float64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsi, stochastic, mfi = get('RSI'), get('Stochastic_K'), get('MFI')
+        obv = get('OBV')
+        atr_percent = (get('ATR') / close) * 100
+        codes = {
+            'RSI': _select('RSI', [(rsi > 70, 'Overbought'), (rsi < 30, 'Oversold')], 'Neutral'),
+            'MACD': _select('MACD', [(get('MACD') > get('Signal_Line'), 'Buy')], 'Sell'),
+            'Long_Term_Trend': _select('Long_Term_Trend', [(close > get('SMA_200'), 'Bullish')], 'Bearish'),
+            'Stochastic': _select('Stochastic', [(stochastic > 80, 'Overbought'),
+                                                 (stochastic < 20, 'Oversold')], 'Neutral'),
+            'MFI': _select('MFI', [(mfi > 80, 'Overbought'), (mfi < 20, 'Oversold')], 'Neutral'),
+            'Bollinger': _select('Bollinger', [(close > get('BB_upper'), 'Above Upper Band'),
+                                               (close < get('BB_lower'), 'Below Lower Band')], 'Within Bands'),
+            'Volume_Trend': _select('Volume_Trend', [(obv > _previous_valid(obv, listed), 'Increasing')],
+                                    'Decreasing'),
+            'Volatility': _select('Volatility', [(atr_percent > 2, 'High'), (atr_percent < 1, 'Low')], 'Moderate')
+        }
+
+    for values in codes.values():
+        values[~listed] = -1
+    return codes
+
+
+def recommendation_scores(codes):
+    """
+    0-100 confidence score for every bar, as generate_recommendation computes it
+
+    Parameters:
+    codes (dict): Output of signal_codes
+
+    Returns:
+    numpy.ndarray: float64 scores, NaN where the bar is missing
+    """
+    score = np.zeros(codes['RSI'].shape)
+    for signal, points in SCORE_POINTS.items():
+        table = np.array([points.get(label, 0) for label in SIGNAL_LABELS[signal]], dtype=np.float64)
+        score += table[np.maximum(codes[signal], 0)]
+    # SCORE_POINTS sums to 100, so the raw score is already the 0-100 percentage
+    return np.where(codes['RSI'] >= 0, score, np.nan)
+
+
+def recommendation_codes(scores):
+    """Map scores to positions in RECOMMENDATION_LABELS (-1 where the score is NaN)"""
+    with np.errstate(invalid='ignore'):
+        codes = np.select([scores >= 80, scores >= 60, scores >= 40, scores >= 20], [4, 3, 2, 1], 0)
+    return np.where(np.isnan(scores), -1, codes).astype(np.int8)
+
+
+def signal_history(columns):
+    """
+    Signal codes, score and recommendation for every bar in one pass
+
+    Parameters:
+    columns (dict): 'Close' and SIGNAL_COLUMNS as keys, arrays of shape
+    (bars,) or (bars, symbols) as values
+
+    Returns:
+    dict: Every signal's int8 codes, 'Score' (float64) and 'Recommendation' (int8 codes)
+    """
+    history = signal_codes(columns)
+    history['Score'] = recommendation_scores(history)
+    history['Recommendation'] = recommendation_codes(history['Score'])
+    return history
+
+
+def latest_changes(codes):
+    """
+    Compare each column's latest valid code with the one before it
+
+    Parameters:
+    codes (numpy.ndarray): int8 codes of shape (bars, symbols), -1 for missing bars
+
+    Returns:
+    tuple: (previous, latest, latest_row) arrays with one entry per column;
+    codes are -1 and rows -1 where there are not enough valid bars
+    """
+    valid = codes >= 0
+    count = valid.sum(axis=0)
+    rank = np.cumsum(valid, axis=0)
+    latest_row = np.where(count >= 1, np.argmax(valid & (rank == count), axis=0), -1)
+    previous_row = np.where(count >= 2, np.argmax(valid & (rank == count - 1), axis=0), -1)
+    columns = np.arange(codes.shape[1])
+    latest = np.where(latest_row >= 0, codes[np.maximum(latest_row, 0), columns], -1)
+    previous = np.where(previous_row >= 0, codes[np.maximum(previous_row, 0), columns], -1)
+    return previous.astype(np.int8), latest.astype(np.int8), latest_row
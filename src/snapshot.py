@@ -0,0 +1,373 @@
+import numpy as np
+import pandas as pd
+from src.signals import RECOMMENDATION_LABELS
+
+# Snapshot metric -> key of the value in build_results()['technical_analysis']
+TECHNICAL_KEYS = {
+    'price': 'last_price',
+    'rsi': 'rsi',
+    'macd': 'macd',
+    'volume': 'volume',
+    'stochastic_k': 'stochastic_k',
+    'mfi': 'mfi',
+    'atr': 'atr',
+    'roc': 'roc'
+}
+
+SNAPSHOT_METRICS = list(TECHNICAL_KEYS) + ['score']
+
+RECOMMENDATION_CODES = {label: code for code, label in enumerate(RECOMMENDATION_LABELS)}
+
+
+def snapshot_values(tech_analysis, score=None, recommendation=None):
+    """
+    Snapshot record of one symbol's analysis
+
+    Parameters:
+    tech_analysis (dict): build_results()['technical_analysis']
+    score (float): Confidence score from generate_recommendation
+    recommendation (str): Recommendation label from generate_recommendation
+
+    Returns:
+    dict: Snapshot metrics as keys, plus 'recommendation'
+    """
+    values = {metric: tech_analysis.get(key) for metric, key in TECHNICAL_KEYS.items()}
+    values['score'] = score
+    values['recommendation'] = recommendation
+    return values
+
+
+class MetricSnapshot:
+    def __init__(self, metrics=SNAPSHOT_METRICS, capacity=1024):
+        """
+        Typed snapshot of the latest metrics per symbol with a maintained sorted index per metric
+
+        Each metric is a float64 column (NaN where missing) plus the values
+        in sorted order and the rows that sort them, NaN last. Updating a
+        symbol moves its entry within each index with one binary search and
+        one in-place shift, so the indexes never need a full re-sort. Top-k
+        reads the end of an index, filtered top-k walks it until k rows pass,
+        and percentiles are a binary search. The recommendation is kept as a
+        code into RECOMMENDATION_LABELS (-1 when unknown).
+
+        Parameters:
+        metrics (list): Metric names
+        capacity (int): Initial number of rows; grows by doubling
+        """
+        self.metrics = list(metrics)
+        self.symbols = []
+        self.index = {}
+        self.columns = {metric: np.full(capacity, np.nan) for metric in self.metrics}
+        self.sorted = {metric: np.full(capacity, np.nan) for metric in self.metrics}
+        self.order = {metric: np.zeros(capacity, dtype=np.int64) for metric in self.metrics}
+        self.codes = np.full(capacity, -1, dtype=np.int8)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.index
+
+    @classmethod
+    def from_records(cls, records, metrics=SNAPSHOT_METRICS):
+        """
+        Build a snapshot from per-symbol records
+
+        Parameters:
+        records (dict): Stock symbols as keys and dicts of metric values (and 'recommendation') as values
+        metrics (list): Metric names
+
+        Returns:
+        MetricSnapshot: Snapshot of the symbols in `records`
+        """
+        snapshot = cls(metrics, capacity=max(len(records), 1))
+        snapshot.update_many(records)
+        return snapshot
+
+    def _grow(self, size):
+        capacity = len(self.codes)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        for metric in self.metrics:
+            for store, fill in ((self.columns, np.nan), (self.sorted, np.nan), (self.order, 0)):
+                grown = np.full(capacity, fill, dtype=store[metric].dtype)
+                grown[:len(self.symbols)] = store[metric][:len(self.symbols)]
+                store[metric] = grown
+        codes = np.full(capacity, -1, dtype=np.int8)
+        codes[:len(self.symbols)] = self.codes[:len(self.symbols)]
+        self.codes = codes
+
+    def _add(self, symbol):
+        row = len(self.symbols)
+        self._grow(row + 1)
+        self.symbols.append(symbol)
+        self.index[symbol] = row
+        # A new row is all NaN, so it joins every index at the end
+        for metric in self.metrics:
+            self.sorted[metric][row] = np.nan
+            self.order[metric][row] = row
+        return row
+
+    def _position(self, metric, row):
+        """Position of a row in a metric's sorted index"""
+        values = self.sorted[metric][:len(self.symbols)]
+        value = self.columns[metric][row]
+        start = np.searchsorted(values, value, side='left')
+        stop = np.searchsorted(values, value, side='right')
+        return start + int(np.flatnonzero(self.order[metric][start:stop] == row)[0])
+
+    def _move(self, metric, row, value):
+        """Set a row's value and shift its index entry to the new sorted position"""
+        if value == self.columns[metric][row] or (np.isnan(value) and np.isnan(self.columns[metric][row])):
+            return
+        values = self.sorted[metric]
+        order = self.order[metric]
+        old = self._position(metric, row)
+        new = np.searchsorted(values[:len(self.symbols)], value, side='left')
+        # Positions after `old` move up by one once the entry is taken out
+        if new > old:
+            new -= 1
+            values[old:new] = values[old + 1:new + 1]
+            order[old:new] = order[old + 1:new + 1]
+        elif new < old:
+            values[new + 1:old + 1] = values[new:old]
+            order[new + 1:old + 1] = order[new:old]
+        values[new] = value
+        order[new] = row
+        self.columns[metric][row] = value
+
+    @staticmethod
+    def _code(recommendation):
+        if recommendation is None:
+            return -1
+        if isinstance(recommendation, str):
+            return RECOMMENDATION_CODES.get(recommendation, -1)
+        return int(recommendation)
+
+    @staticmethod
+    def _float(value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    def update(self, symbol, values):
+        """
+        Set the latest metrics of one symbol, adding it if new
+
+        Parameters:
+        symbol (str): Stock symbol
+        values (dict): Metric names (and 'recommendation', label or code) as keys;
+            metrics left out keep their value, other keys are ignored
+        """
+        row = self.index.get(symbol)
+        if row is None:
+            row = self._add(symbol)
+        for metric in self.metrics:
+            if metric in values:
+                self._move(metric, row, self._float(values[metric]))
+        if 'recommendation' in values:
+            self.codes[row] = self._code(values['recommendation'])
+
+    def update_many(self, records):
+        """
+        Set the latest metrics of many symbols
+
+        Large batches are written column-wise and the indexes re-sorted once,
+        which is cheaper than moving entries one at a time.
+
+        Parameters:
+        records (dict): Stock symbols as keys and update() values as values
+        """
+        if len(records) * 8 < len(self.symbols):
+            for symbol, values in records.items():
+                self.update(symbol, values)
+            return
+
+        new = [symbol for symbol in records if symbol not in self.index]
+        if new:
+            # The indexes are rebuilt below, so new rows only need registering
+            self._grow(len(self.symbols) + len(new))
+            self.index.update((symbol, len(self.symbols) + k) for k, symbol in enumerate(new))
+            self.symbols.extend(new)
+        rows = [self.index[symbol] for symbol in records]
+        for name in self.metrics + ['recommendation']:
+            given = [(row, values[name]) for row, values in zip(rows, records.values()) if name in values]
+            if not given:
+                continue
+            targets, raw = zip(*given)
+            if name == 'recommendation':
+                self.codes[list(targets)] = [self._code(value) for value in raw]
+            else:
+                self.columns[name][list(targets)] = [self._float(value) for value in raw]
+        self._reindex()
+
+    def _reindex(self):
+        size = len(self.symbols)
+        for metric in self.metrics:
+            values = self.columns[metric][:size]
+            order = np.argsort(values, kind='stable')
+            self.order[metric][:size] = order
+            self.sorted[metric][:size] = values[order]
+
+    def remove(self, symbol):
+        """Drop a symbol from every query (its row is kept for reuse if it comes back)"""
+        row = self.index.get(symbol)
+        if row is None:
+            return
+        for metric in self.metrics:
+            self._move(metric, row, np.nan)
+        self.codes[row] = -1
+
+    def n_valid(self, metric):
+        """Number of symbols with a value for a metric"""
+        return int(np.searchsorted(self.sorted[metric][:len(self.symbols)], np.nan, side='left'))
+
+    def _matches(self, rows, recommendations, where):
+        keep = np.ones(len(rows), dtype=bool)
+        if recommendations is not None:
+            keep &= np.isin(self.codes[rows], recommendations)
+        for metric, (low, high) in where.items():
+            values = self.columns[metric][rows]
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+            # NaN fails both comparisons, but an open range must still exclude it
+            keep &= ~np.isnan(values)
+        return rows[keep]
+
+    def top_rows(self, metric, k=10, ascending=False, recommendations=None, where=None, chunk_size=256):
+        """
+        Rows of the k highest (or lowest) values of a metric, optionally filtered
+
+        Parameters:
+        metric (str): Metric to rank by; symbols without a value are never returned
+        k (int): Number of rows
+        ascending (bool): Rank lowest first
+        recommendations (list): Keep only these recommendation labels
+        where (dict): Metric as key and inclusive (low, high) bounds as value, None where open
+        chunk_size (int): Index entries checked per step when filtering
+
+        Returns:
+        numpy.ndarray: Row positions, best first, ties in row (insertion) order
+        """
+        n_valid = self.n_valid(metric)
+        order = self.order[metric][:n_valid]
+        ranked = order if ascending else order[::-1]
+        if recommendations is None and not where:
+            found = ranked[:k]
+        else:
+            codes = None if recommendations is None else [self._code(label) for label in recommendations]
+            chunks = []
+            n_found = 0
+            # Walk the index from the best end until k rows pass the filters
+            start = 0
+            while start < n_valid:
+                rows = self._matches(ranked[start:start + chunk_size], codes, where or {})
+                chunks.append(rows)
+                n_found += len(rows)
+                if n_found >= k:
+                    break
+                start += chunk_size
+                chunk_size *= 2
+            found = np.concatenate(chunks) if chunks else np.array([], dtype=np.int64)
+        if len(found) < k or not k:
+            return self._rank(found, metric, ascending)[:k]
+
+        # Entries equal to the k-th value sit in index order, not row order; take
+        # the whole tie group so ties are always resolved by row
+        values = self.columns[metric]
+        cutoff = values[found[k - 1]]
+        sorted_values = self.sorted[metric][:n_valid]
+        ties = order[np.searchsorted(sorted_values, cutoff, side='left'):
+                     np.searchsorted(sorted_values, cutoff, side='right')]
+        if recommendations is not None or where:
+            ties = self._matches(ties, codes, where or {})
+        better = found[values[found] != cutoff]
+        return self._rank(np.concatenate([better, ties]), metric, ascending)[:k]
+
+    def _rank(self, rows, metric, ascending):
+        """Rows ordered by a metric, ties by row"""
+        values = self.columns[metric][rows]
+        return rows[np.lexsort((rows, values if ascending else -values))]
+
+    def top(self, metric, k=10, ascending=False, recommendations=None, where=None, columns=None):
+        """
+        Top-k symbols by a metric as a table
+
+        Parameters:
+        metric (str): Metric to rank by
+        k (int): Number of symbols
+        ascending (bool): Rank lowest first
+        recommendations (list): Keep only these recommendation labels
+        where (dict): Metric as key and inclusive (low, high) bounds as value, None where open
+        columns (list): Metrics (or 'recommendation') to include; defaults to [metric]
+
+        Returns:
+        pandas.DataFrame: 'Symbol' and the requested columns, best first
+        """
+        rows = self.top_rows(metric, k, ascending, recommendations, where)
+        return self._frame(rows, columns or [metric])
+
+    def _frame(self, rows, columns):
+        data = {'Symbol': [self.symbols[row] for row in rows]}
+        for column in columns:
+            if column == 'recommendation':
+                data[column] = [RECOMMENDATION_LABELS[code] if code >= 0 else None for code in self.codes[rows]]
+            else:
+                data[column] = self.columns[column][rows]
+        return pd.DataFrame(data)
+
+    def percentile(self, metric, value):
+        """
+        Percentile rank of a value among the symbols' values of a metric
+
+        Parameters:
+        metric (str): Metric name
+        value (float): Value to rank
+
+        Returns:
+        float: Percent of symbols with a value at or below it, NaN if none has a value
+        """
+        n_valid = self.n_valid(metric)
+        if not n_valid or np.isnan(value):
+            return np.nan
+        return 100.0 * np.searchsorted(self.sorted[metric][:n_valid], value, side='right') / n_valid
+
+    def symbol_percentile(self, symbol, metric):
+        """Percentile rank of one symbol's own value of a metric (NaN if unknown)"""
+        row = self.index.get(symbol)
+        return np.nan if row is None else self.percentile(metric, self.columns[metric][row])
+
+    def quantile(self, metric, q):
+        """
+        Value of a metric at a quantile, interpolated linearly like numpy.quantile
+
+        Parameters:
+        metric (str): Metric name
+        q (float): Quantile in [0, 1]
+
+        Returns:
+        float: Metric value, NaN if no symbol has one
+        """
+        n_valid = self.n_valid(metric)
+        if not n_valid:
+            return np.nan
+        values = self.sorted[metric]
+        position = q * (n_valid - 1)
+        low = int(np.floor(position))
+        high = min(low + 1, n_valid - 1)
+        return float(values[low] + (values[high] - values[low]) * (position - low))
+
+    def get(self, symbol):
+        """Latest metrics of one symbol as a dict, None if unknown"""
+        row = self.index.get(symbol)
+        if row is None:
+            return None
+        return self._frame(np.array([row]), self.metrics + ['recommendation']).iloc[0].to_dict()
+
+    def to_frame(self):
+        """Every symbol's latest metrics, indexed by symbol"""
+        return self._frame(np.arange(len(self.symbols)), self.metrics + ['recommendation']).set_index('Symbol')
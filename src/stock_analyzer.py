@@ -2,22 +2,64 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+import xlsxwriter
 from datetime import datetime
 import os
 import time
 import warnings
+from config import TECHNICAL_PARAMS
+from src.data_fetcher import DataFetcher, RateLimiter
+from src.bar_cache import BarCache
+from src.panel import PricePanel
+from src.panel_indicators import INDICATOR_COLUMNS, compute_panel_indicators
+from src.shared_panel import compute_shared_indicators
+from src.indicator_registry import compute_indicators
+from src.signals import (RECOMMENDATION_LABELS, SIGNAL_COLUMNS, SIGNAL_LABELS,
+                         classify_signals, latest_changes, signal_history)
+from src.chart_renderer import ChartRenderer
+from src.results_dataset import ResultsDataset
+from src.instrumentation import RunMetrics
+from src.compact import compact_frame
+from src.backtest import Backtester
+from src.param_sweep import ParameterSweep
+from src.snapshot import MetricSnapshot, snapshot_values
+from src.correlation import returns_panel, correlation_matrix, rolling_correlations, cluster_symbols
 warnings.filterwarnings('ignore')
 
 class StockAnalyzer:
-    def __init__(self):
+    def __init__(self, provider=None, cache_dir=None, fast_plots=False, export_format='csv',
+                 instrument=False, compact=False, technical_params=None):
         self.output_dir = 'output'
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
+        # One limiter for single and batched requests so both paths respect the same budget
+        self.rate_limiter = RateLimiter(calls_per_second=1.0)
+        self.data_fetcher = DataFetcher(provider=provider, rate_limiter=self.rate_limiter)
+        # Incremental on-disk bar store; None keeps the always-download behaviour
+        self.bar_cache = BarCache(self.data_fetcher, cache_dir) if cache_dir else None
+        # Template-based Agg renderer that skips charts whose data has not changed
+        self.chart_renderer = ChartRenderer(self.output_dir) if fast_plots else None
+        # 'csv' writes per-symbol files; 'arrow' defers to one dataset written by export_dataset
+        self.export_format = export_format
+        # Per-stage timings and retry counts; spans are no-ops unless enabled
+        self.instrumentation = RunMetrics(enabled=instrument)
+        # Keep analysed frames as float32 with trimmed action columns (see src/compact.py)
+        self.compact = compact
+        # Indicator windows; defaults to config.TECHNICAL_PARAMS
+        self.technical_params = dict(TECHNICAL_PARAMS, **(technical_params or {}))
+        # Latest metrics per symbol of the last summary, indexed for top-k and percentile queries
+        self.snapshot = MetricSnapshot()
 
     def get_stock_data(self, symbol, period='1y'):
         """Fetch stock data using yfinance"""
         try:
-            time.sleep(1)  # Rate limiting
+            if self.bar_cache is not None:
+                df = self.bar_cache.get_many([symbol], period).get(symbol)
+                if df is None or df.empty:
+                    print(f"No data received for {symbol}")
+                    return None
+                return df.copy()
+            self.rate_limiter.wait()  # Rate limiting
             stock = yf.Ticker(symbol)
             df = stock.history(period=period)
             if df.empty:
@@ -28,134 +70,217 @@ class StockAnalyzer:
             print(f"Error fetching data: {str(e)}")
             return None
 
-    def calculate_technical_indicators(self, df):
-        """Calculate comprehensive technical indicators"""
+    def get_multiple_stock_data(self, symbols, period='1y', batch_size=50, max_workers=4):
+        """Fetch stock data for many symbols through batched, rate-limited requests"""
         try:
-            # RSI
-            delta = df['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['RSI'] = 100 - (100 / (1 + rs))
+            if self.bar_cache is not None:
+                return self.bar_cache.get_many(
+                    symbols, period, batch_size=batch_size, max_workers=max_workers)
+            return self.data_fetcher.fetch_multiple_stocks(
+                symbols, period=period, batch_size=batch_size, max_workers=max_workers)
+        except Exception as e:
+            print(f"Error fetching batch data: {str(e)}")
+            return {}
 
-            # MACD
-            exp1 = df['Close'].ewm(span=12, adjust=False).mean()
-            exp2 = df['Close'].ewm(span=26, adjust=False).mean()
-            df['MACD'] = exp1 - exp2
-            df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False).mean()
-
-            # Moving Averages
-            df['SMA_20'] = df['Close'].rolling(window=20).mean()
-            df['SMA_50'] = df['Close'].rolling(window=50).mean()
-            df['SMA_200'] = df['Close'].rolling(window=200).mean()
-
-            # Bollinger Bands
-            df['BB_middle'] = df['Close'].rolling(window=20).mean()
-            df['BB_upper'] = df['BB_middle'] + 2*df['Close'].rolling(window=20).std()
-            df['BB_lower'] = df['BB_middle'] - 2*df['Close'].rolling(window=20).std()
-
-            # Stochastic Oscillator
-            low_min = df['Low'].rolling(window=14).min()
-            high_max = df['High'].rolling(window=14).max()
-            df['Stochastic_K'] = 100 * ((df['Close'] - low_min) / (high_max - low_min))
-            df['Stochastic_D'] = df['Stochastic_K'].rolling(window=3).mean()
-
-            # Average True Range (ATR)
-            high_low = df['High'] - df['Low']
-            high_close = np.abs(df['High'] - df['Close'].shift())
-            low_close = np.abs(df['Low'] - df['Close'].shift())
-            ranges = pd.concat([high_low, high_close, low_close], axis=1)
-            true_range = np.max(ranges, axis=1)
-            df['ATR'] = true_range.rolling(window=14).mean()
-
-            # On-Balance Volume (OBV)
-            df['OBV'] = (np.sign(df['Close'].diff()) * df['Volume']).fillna(0).cumsum()
-
-            # Rate of Change (ROC)
-            df['ROC'] = ((df['Close'] - df['Close'].shift(10)) / df['Close'].shift(10)) * 100
-
-            # Money Flow Index (MFI)
-            typical_price = (df['High'] + df['Low'] + df['Close']) / 3
-            money_flow = typical_price * df['Volume']
-            positive_flow = money_flow.where(typical_price > typical_price.shift(1), 0).rolling(window=14).sum()
-            negative_flow = money_flow.where(typical_price < typical_price.shift(1), 0).rolling(window=14).sum()
-            mfi_ratio = positive_flow / negative_flow
-            df['MFI'] = 100 - (100 / (1 + mfi_ratio))
-
-            # Relative Vigor Index (RVI)
-            close_open = df['Close'] - df['Open']
-            high_low = df['High'] - df['Low']
-            df['RVI'] = close_open.rolling(window=10).mean() / high_low.rolling(window=10).mean()
+    def calculate_technical_indicators(self, df, columns=None):
+        """
+        Calculate comprehensive technical indicators
 
-            return df
+        Parameters:
+        df (pandas.DataFrame): OHLCV data
+        columns (list): Indicator columns to add (e.g. SIGNAL_COLUMNS); defaults to all of them.
+        Shared intermediates such as the 20-day mean and deviation are computed once.
+
+        Returns:
+        pandas.DataFrame: `df` with the indicator columns added, or None on error
+        """
+        try:
+            return compute_indicators(df, columns, self.technical_params)
         except Exception as e:
             print(f"Error calculating indicators: {str(e)}")
             return None
+
+    def calculate_panel_indicators(self, frames, processes=1):
+        """
+        Calculate technical indicators for many symbols in one vectorised pass
+
+        The panel is bar-aligned (see PricePanel.from_bars), so a symbol's
+        windows never span a date on which only other symbols traded and
+        the results match calculate_technical_indicators per symbol.
+
+        With processes > 1 the panel is placed in shared memory and split by
+        symbol across worker processes, so no price data is pickled to them.
+        """
+        try:
+            frames = {symbol: df for symbol, df in frames.items() if df is not None and not df.empty}
+            if not frames:
+                return {}
+            panel = PricePanel.from_bars(frames)
+            if processes > 1:
+                columns = compute_shared_indicators(panel, processes, self.technical_params)
+            else:
+                columns = compute_panel_indicators(panel, self.technical_params)
+            return panel.to_frames(frames, columns)
+        except Exception as e:
+            print(f"Error calculating panel indicators: {str(e)}")
+            return {}
     def generate_signals(self, df):
         """Generate comprehensive trading signals"""
-        signals = {}
-        
-        # RSI signals
-        last_rsi = df['RSI'].iloc[-1]
-        if last_rsi > 70:
-            signals['RSI'] = 'Overbought'
-        elif last_rsi < 30:
-            signals['RSI'] = 'Oversold'
-        else:
-            signals['RSI'] = 'Neutral'
-
-        # MACD signals
-        if df['MACD'].iloc[-1] > df['Signal_Line'].iloc[-1]:
-            signals['MACD'] = 'Buy'
-        else:
-            signals['MACD'] = 'Sell'
-
-        # Moving Average signals
-        if df['Close'].iloc[-1] > df['SMA_200'].iloc[-1]:
-            signals['Long_Term_Trend'] = 'Bullish'
-        else:
-            signals['Long_Term_Trend'] = 'Bearish'
-
-        # Stochastic signals
-        if df['Stochastic_K'].iloc[-1] > 80:
-            signals['Stochastic'] = 'Overbought'
-        elif df['Stochastic_K'].iloc[-1] < 20:
-            signals['Stochastic'] = 'Oversold'
-        else:
-            signals['Stochastic'] = 'Neutral'
-
-        # MFI signals
-        if df['MFI'].iloc[-1] > 80:
-            signals['MFI'] = 'Overbought'
-        elif df['MFI'].iloc[-1] < 20:
-            signals['MFI'] = 'Oversold'
-        else:
-            signals['MFI'] = 'Neutral'
-
-        # Bollinger Bands signals
-        if df['Close'].iloc[-1] > df['BB_upper'].iloc[-1]:
-            signals['Bollinger'] = 'Above Upper Band'
-        elif df['Close'].iloc[-1] < df['BB_lower'].iloc[-1]:
-            signals['Bollinger'] = 'Below Lower Band'
-        else:
-            signals['Bollinger'] = 'Within Bands'
-
-        # Volume signals
-        if df['OBV'].iloc[-1] > df['OBV'].iloc[-2]:
-            signals['Volume_Trend'] = 'Increasing'
-        else:
-            signals['Volume_Trend'] = 'Decreasing'
-
-        # Volatility (using ATR)
-        atr_percent = (df['ATR'].iloc[-1] / df['Close'].iloc[-1]) * 100
-        if atr_percent > 2:
-            signals['Volatility'] = 'High'
-        elif atr_percent < 1:
-            signals['Volatility'] = 'Low'
-        else:
-            signals['Volatility'] = 'Moderate'
-
-        return signals
+        return classify_signals(df.iloc[-1], df['OBV'].iloc[-2])
+
+    def generate_signal_history(self, df, labels=False):
+        """
+        Signals, confidence score and recommendation for every bar of one stock
+
+        Parameters:
+        df (pandas.DataFrame): Frame with indicator columns
+        labels (bool): Return categorical labels instead of int8 codes
+
+        Returns:
+        pandas.DataFrame: One column per signal plus 'Score' and 'Recommendation', indexed like `df`
+        """
+        try:
+            history = signal_history({col: df[col].to_numpy(dtype=np.float64)
+                                      for col in ['Close'] + SIGNAL_COLUMNS})
+            history_df = pd.DataFrame(history, index=df.index)
+            if labels:
+                for signal, signal_labels in list(SIGNAL_LABELS.items()) + [('Recommendation', RECOMMENDATION_LABELS)]:
+                    history_df[signal] = pd.Categorical.from_codes(history_df[signal], signal_labels)
+            return history_df
+        except Exception as e:
+            print(f"Error generating signal history: {str(e)}")
+            return None
+
+    def generate_panel_signal_history(self, frames):
+        """
+        Signal codes, scores and recommendations for every bar of every stock in one pass
+
+        The panel is bar-aligned (see PricePanel.from_bars), so every symbol's
+        history matches generate_signal_history and its last row is the latest bar.
+
+        Parameters:
+        frames (dict): Stock symbols as keys and OHLCV DataFrames as values
+
+        Returns:
+        tuple: (PricePanel, dict of (dates x symbols) arrays as returned by signal_history)
+        """
+        try:
+            frames = {symbol: df for symbol, df in frames.items() if df is not None and not df.empty}
+            if not frames:
+                return None, {}
+            panel = PricePanel.from_bars(frames)
+            columns = compute_panel_indicators(panel, self.technical_params)
+            columns['Close'] = panel['Close']
+            return panel, signal_history(columns)
+        except Exception as e:
+            print(f"Error generating panel signal history: {str(e)}")
+            return None, {}
+
+    def screen_recommendation_changes(self, frames):
+        """
+        Find stocks whose recommendation changed on their latest bar
+
+        Parameters:
+        frames (dict): Stock symbols as keys and OHLCV DataFrames as values
+
+        Returns:
+        pandas.DataFrame: Symbol, Date, Previous, Recommendation and Score for every changed stock
+        """
+        panel, history = self.generate_panel_signal_history(frames)
+        if panel is None:
+            return pd.DataFrame(columns=['Symbol', 'Date', 'Previous', 'Recommendation', 'Score'])
+        previous, latest, rows = latest_changes(history['Recommendation'])
+        changed = np.flatnonzero((previous >= 0) & (previous != latest))
+        return pd.DataFrame({
+            'Symbol': [panel.symbols[j] for j in changed],
+            'Date': [panel.date_of(rows[j], panel.symbols[j]) for j in changed],
+            'Previous': [RECOMMENDATION_LABELS[code] for code in previous[changed]],
+            'Recommendation': [RECOMMENDATION_LABELS[code] for code in latest[changed]],
+            'Score': history['Score'][rows[changed], changed]
+        })
+
+    def backtest_recommendations(self, frames, **backtest_params):
+        """
+        Backtest the recommendation score across many stocks at once
+
+        Parameters:
+        frames (dict): Stock symbols as keys and OHLCV DataFrames as values
+        backtest_params: Thresholds, costs and slippage passed to Backtester
+
+        Returns:
+        dict: Backtester.run results ('equity', 'portfolio' and 'summary'), or None on error
+        """
+        try:
+            bar_panel, history = self.generate_panel_signal_history(frames)
+            if bar_panel is None:
+                return None
+            # Scores come from the bar-aligned panel; trade them on a common date axis
+            panel = PricePanel.from_frames({symbol: frames[symbol] for symbol in bar_panel.symbols},
+                                           fields=['Close'])
+            scores = np.full(panel.shape, np.nan)
+            n_bars = len(bar_panel.dates)
+            for j, symbol in enumerate(panel.symbols):
+                index = bar_panel.bar_dates[symbol]
+                scores[panel.dates.get_indexer(index), j] = history['Score'][n_bars - len(index):, j]
+            return Backtester(**backtest_params).run(panel.dates, panel.symbols, panel['Close'], scores)
+        except Exception as e:
+            print(f"Error running backtest: {str(e)}")
+            return None
+
+    def sweep_parameters(self, frames, grid=None, processes=1, **backtest_params):
+        """
+        Backtest every combination of an indicator parameter grid
+
+        Parameters:
+        frames (dict): Stock symbols as keys and OHLCV DataFrames as values
+        grid (dict): TECHNICAL_PARAMS names as keys and lists of values; defaults to config.PARAM_GRID
+        processes (int): Worker processes
+        backtest_params: Thresholds, costs and slippage passed to Backtester
+
+        Returns:
+        pandas.DataFrame: One row per combination, best Sharpe ratio first, or None on error
+        """
+        try:
+            return ParameterSweep(frames, grid, processes, backtest_params).run()
+        except Exception as e:
+            print(f"Error running parameter sweep: {str(e)}")
+            return None
+
+    def correlation_analysis(self, frames, window=None, n_clusters=None, min_periods=20):
+        """
+        Correlation matrix and co-movement clusters of a universe
+
+        Parameters:
+        frames (dict): Stock symbols as keys and OHLCV DataFrames as values
+        window (int): Use the correlation of the last `window` bars instead of the full history
+        n_clusters (int): Number of clusters; None cuts the tree at a fixed distance
+        min_periods (int): Pairs with fewer common returns are left uncorrelated (full history only)
+
+        Returns:
+        dict: 'correlation' (DataFrame, symbols x symbols) and 'clusters' (Series), or None on error
+        """
+        try:
+            returns = returns_panel(frames)
+            if returns.empty:
+                return None
+            if window:
+                if len(returns) < window:
+                    return None
+                # Step so the only matrix produced is the one ending on the last bar
+                step = max(len(returns) - window, 1)
+                corr = None
+                for _, corr in rolling_correlations(returns, window=window, step=step):
+                    pass
+            else:
+                corr = correlation_matrix(returns.to_numpy(dtype=np.float64), min_periods=min_periods)
+            symbols = list(returns.columns)
+            return {
+                'correlation': pd.DataFrame(corr, index=symbols, columns=symbols),
+                'clusters': cluster_symbols(corr, symbols, n_clusters=n_clusters)
+            }
+        except Exception as e:
+            print(f"Error computing correlations: {str(e)}")
+            return None
 
     def generate_recommendation(self, tech_analysis, signals):
         """Generate a weighted recommendation based on multiple technical indicators"""
@@ -246,148 +371,119 @@ class StockAnalyzer:
         except Exception as e:
             print(f"Error generating recommendation: {str(e)}")
             return "Hold", 50.0, "Error in analysis"
-    def generate_excel_summary(self, symbols_data):
-        """Generate a comprehensive Excel summary of all analyzed stocks"""
-        try:
-            # Create Excel writer object
-            excel_path = f'{self.output_dir}/stock_analysis_summary_{datetime.now().strftime("%Y%m%d_%H%M")}.xlsx'
-            writer = pd.ExcelWriter(excel_path, engine='openpyxl')
-            
-            # Summary DataFrame
-            summary_data = []
-            signals_data = []
-            technical_data = []
-            
-            for symbol, data in symbols_data.items():
-                if not data or 'technical_analysis' not in data:
-                    continue
-                    
-                tech_analysis = data['technical_analysis']
-                signals = tech_analysis['signals']
-                
-                # Calculate technical strength
-                bullish_signals = sum(1 for signal in signals.values() 
-                                   if signal in ['Buy', 'Bullish', 'Increasing'])
-                total_signals = len(signals)
-                strength = (bullish_signals / total_signals) * 100
-                
-                # Get recommendation
-                recommendation, confidence_score, reasoning = self.generate_recommendation(
-                    tech_analysis, signals)
-                
-                # Basic Summary
-                summary_data.append({
-                    'Symbol': symbol,
-                    'Last Price': tech_analysis['last_price'],
-                    'RSI': tech_analysis['rsi'],
-                    'MACD': tech_analysis['macd'],
-                    'Volume': tech_analysis['volume'],
-                    'Analysis Date': datetime.now().strftime("%Y-%m-%d")
-                })
-                
-                # Signals
-                signals['Symbol'] = symbol
-                signals_data.append(signals)
-                
-                # Technical Analysis Details
-                technical_data.append({
-                    'Symbol': symbol,
-                    'Price': tech_analysis['last_price'],
-                    'Recommendation': recommendation,
-                    'Confidence Score': f"{confidence_score:.1f}%",
-                    'Analysis Reasoning': reasoning,
-                    'RSI': tech_analysis['rsi'],
-                    'MACD': tech_analysis['macd'],
-                    'Volume': tech_analysis['volume'],
-                    'Technical Strength': f"{strength:.1f}%",
-                    'RSI Status': 'Overbought' if tech_analysis['rsi'] > 70 else 'Oversold' if tech_analysis['rsi'] < 30 else 'Neutral',
-                    'MACD Signal': signals.get('MACD', 'N/A'),
-                    'Trend': signals.get('Long_Term_Trend', 'N/A'),
-                    'Volume Trend': signals.get('Volume_Trend', 'N/A'),
-                    'Volatility': signals.get('Volatility', 'N/A')
-                })
-            
-            # Create DataFrames
-            summary_df = pd.DataFrame(summary_data)
-            signals_df = pd.DataFrame(signals_data)
-            technical_df = pd.DataFrame(technical_data)
-            
-            # Sort DataFrames by Symbol
-            summary_df = summary_df.sort_values('Symbol')
-            signals_df = signals_df.sort_values('Symbol')
-            technical_df = technical_df.sort_values('Symbol')
-            
-            # Write to Excel
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            signals_df.to_excel(writer, sheet_name='Signals', index=False)
-            technical_df.to_excel(writer, sheet_name='Technical Analysis', index=False)
-            
-            # Add Rankings sheet
-            rankings_data = {
-                'Highest RSI': summary_df.nlargest(10, 'RSI')[['Symbol', 'RSI']],
-                'Lowest RSI': summary_df.nsmallest(10, 'RSI')[['Symbol', 'RSI']],
-                'Highest MACD': summary_df.nlargest(10, 'MACD')[['Symbol', 'MACD']],
-                'Highest Volume': summary_df.nlargest(10, 'Volume')[['Symbol', 'Volume']]
-            }
-            
-            start_row = 0
-            rankings_sheet = writer.book.create_sheet('Rankings')
-            
-            for title, df in rankings_data.items():
-                # Write title
-                rankings_sheet.cell(row=start_row + 1, column=1, value=title)
-                
-                # Write data
-                for r_idx, row in enumerate(df.values):
-                    for c_idx, value in enumerate(row):
-                        rankings_sheet.cell(row=start_row + r_idx + 2, 
-                                         column=c_idx + 1, 
-                                         value=value)
+    def build_summary_frames(self, symbols_data):
+        """Build the Summary, Signals and Technical Analysis tables for the Excel report"""
+        summary_data = []
+        signals_data = []
+        technical_data = []
+        records = {}
+        
+        for symbol, data in symbols_data.items():
+            if not data or 'technical_analysis' not in data:
+                continue
                 
-                start_row += len(df) + 3
+            tech_analysis = data['technical_analysis']
+            signals = tech_analysis['signals']
             
-            # Add Recommendations Rankings
-            recommendations_df = pd.DataFrame(technical_data)
+            # Calculate technical strength
+            bullish_signals = sum(1 for signal in signals.values() 
+                               if signal in ['Buy', 'Bullish', 'Increasing'])
+            total_signals = len(signals)
+            strength = (bullish_signals / total_signals) * 100
             
-            # Strong Buy and Buy recommendations
-            buy_recommendations = recommendations_df[
-                recommendations_df['Recommendation'].isin(['Strong Buy', 'Buy'])
-            ][['Symbol', 'Recommendation', 'Confidence Score', 'Price']].sort_values('Confidence Score', ascending=False)
+            # Get recommendation
+            recommendation, confidence_score, reasoning = self.generate_recommendation(
+                tech_analysis, signals)
             
-            # Strong Sell and Sell recommendations
-            sell_recommendations = recommendations_df[
-                recommendations_df['Recommendation'].isin(['Strong Sell', 'Sell'])
-            ][['Symbol', 'Recommendation', 'Confidence Score', 'Price']].sort_values('Confidence Score', ascending=True)
+            # Basic Summary
+            summary_data.append({
+                'Symbol': symbol,
+                'Last Price': tech_analysis['last_price'],
+                'RSI': tech_analysis['rsi'],
+                'MACD': tech_analysis['macd'],
+                'Volume': tech_analysis['volume'],
+                'Analysis Date': datetime.now().strftime("%Y-%m-%d")
+            })
             
-            # Add to Rankings sheet
-            rankings_sheet.cell(row=start_row + 1, column=1, value='Top Buy Recommendations')
-            for r_idx, row in enumerate(buy_recommendations.head(10).values):
-                for c_idx, value in enumerate(row):
-                    rankings_sheet.cell(row=start_row + r_idx + 2, column=c_idx + 1, value=value)
+            records[symbol] = snapshot_values(tech_analysis, confidence_score, recommendation)
             
-            start_row += len(buy_recommendations.head(10)) + 3
+            # Signals
+            signals_data.append(dict(signals, Symbol=symbol))
             
-            rankings_sheet.cell(row=start_row + 1, column=1, value='Top Sell Recommendations')
-            for r_idx, row in enumerate(sell_recommendations.head(10).values):
-                for c_idx, value in enumerate(row):
-                    rankings_sheet.cell(row=start_row + r_idx + 2, column=c_idx + 1, value=value)
-
-            # Auto-adjust columns width
-            for sheet in writer.book.sheetnames:
-                worksheet = writer.book[sheet]
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    worksheet.column_dimensions[column_letter].width = max_length + 2
+            # Technical Analysis Details
+            technical_data.append({
+                'Symbol': symbol,
+                'Price': tech_analysis['last_price'],
+                'Recommendation': recommendation,
+                'Confidence Score': f"{confidence_score:.1f}%",
+                'Analysis Reasoning': reasoning,
+                'RSI': tech_analysis['rsi'],
+                'MACD': tech_analysis['macd'],
+                'Volume': tech_analysis['volume'],
+                'Technical Strength': f"{strength:.1f}%",
+                'RSI Status': 'Overbought' if tech_analysis['rsi'] > 70 else 'Oversold' if tech_analysis['rsi'] < 30 else 'Neutral',
+                'MACD Signal': signals.get('MACD', 'N/A'),
+                'Trend': signals.get('Long_Term_Trend', 'N/A'),
+                'Volume Trend': signals.get('Volume_Trend', 'N/A'),
+                'Volatility': signals.get('Volatility', 'N/A')
+            })
+        
+        # Create DataFrames sorted by Symbol
+        summary_df = pd.DataFrame(summary_data).sort_values('Symbol')
+        signals_df = pd.DataFrame(signals_data).sort_values('Symbol')
+        technical_df = pd.DataFrame(technical_data).sort_values('Symbol')
+        # Rows in symbol order, so ranking ties list alphabetically as in the sheets
+        self.snapshot = MetricSnapshot.from_records(dict(sorted(records.items())))
+        return summary_df, signals_df, technical_df
+
+    def update_snapshot(self, symbol, results):
+        """Refresh one symbol's entry in the snapshot from analyze_stock results"""
+        tech_analysis = results['technical_analysis']
+        recommendation, confidence_score, _ = self.generate_recommendation(tech_analysis, tech_analysis['signals'])
+        self.snapshot.update(symbol, snapshot_values(tech_analysis, confidence_score, recommendation))
+
+    def build_rankings(self, snapshot=None):
+        """Build the titled blocks of the Rankings sheet, in display order, from the metric snapshot"""
+        if snapshot is None:
+            snapshot = self.snapshot
+        labels = {'rsi': 'RSI', 'macd': 'MACD', 'volume': 'Volume', 'price': 'Price',
+                  'recommendation': 'Recommendation', 'score': 'Confidence Score'}
+        rankings = [
+            ('Highest RSI', snapshot.top('rsi', 10)),
+            ('Lowest RSI', snapshot.top('rsi', 10, ascending=True)),
+            ('Highest MACD', snapshot.top('macd', 10)),
+            ('Highest Volume', snapshot.top('volume', 10))
+        ]
+        
+        # Ranked on the numeric score; formatted only for display
+        recommendation_columns = ['recommendation', 'score', 'price']
+        rankings.append(('Top Buy Recommendations',
+                         snapshot.top('score', 10, recommendations=['Strong Buy', 'Buy'],
+                                      columns=recommendation_columns)))
+        rankings.append(('Top Sell Recommendations',
+                         snapshot.top('score', 10, ascending=True, recommendations=['Strong Sell', 'Sell'],
+                                      columns=recommendation_columns)))
+        
+        for k, (title, df) in enumerate(rankings):
+            if 'score' in df:
+                df['score'] = df['score'].map(lambda score: f"{score:.1f}%")
+            rankings[k] = (title, df.rename(columns=labels))
+        return rankings
+
+    def generate_excel_summary(self, symbols_data, streaming=False):
+        """Generate a comprehensive Excel summary of all analyzed stocks"""
+        try:
+            excel_path = f'{self.output_dir}/stock_analysis_summary_{datetime.now().strftime("%Y%m%d_%H%M")}.xlsx'
             
-            # Save the Excel file
-            writer.close()
+            with self.instrumentation.span('excel_summary'):
+                summary_df, signals_df, technical_df = self.build_summary_frames(symbols_data)
+                sheets = [('Summary', summary_df), ('Signals', signals_df), ('Technical Analysis', technical_df)]
+                rankings = self.build_rankings()
+                
+                if streaming:
+                    self._write_excel_streaming(excel_path, sheets, rankings)
+                else:
+                    self._write_excel_openpyxl(excel_path, sheets, rankings)
             
             print(f"\nExcel summary report generated: {excel_path}")
             return excel_path
@@ -395,9 +491,107 @@ class StockAnalyzer:
         except Exception as e:
             print(f"Error generating Excel summary: {str(e)}")
             return None
+
+    def _write_excel_openpyxl(self, excel_path, sheets, rankings):
+        """Write the report with openpyxl, keeping the whole workbook in memory"""
+        writer = pd.ExcelWriter(excel_path, engine='openpyxl')
+        
+        for sheet_name, df in sheets:
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+        
+        start_row = 0
+        rankings_sheet = writer.book.create_sheet('Rankings')
+        
+        for title, df in rankings:
+            # Write title
+            rankings_sheet.cell(row=start_row + 1, column=1, value=title)
+            
+            # Write data
+            for r_idx, row in enumerate(df.values):
+                for c_idx, value in enumerate(row):
+                    rankings_sheet.cell(row=start_row + r_idx + 2, 
+                                     column=c_idx + 1, 
+                                     value=value)
+            
+            start_row += len(df) + 3
+
+        # Auto-adjust columns width
+        for sheet in writer.book.sheetnames:
+            worksheet = writer.book[sheet]
+            for column in worksheet.columns:
+                max_length = 0
+                column_letter = column[0].column_letter
+                for cell in column:
+                    try:
+                        if len(str(cell.value)) > max_length:
+                            max_length = len(str(cell.value))
+                    except:
+                        pass
+                worksheet.column_dimensions[column_letter].width = max_length + 2
+        
+        # Save the Excel file
+        writer.close()
+
+    @staticmethod
+    def _column_widths(df, include_header=True):
+        """Width of every column from its longest rendered value, computed per column"""
+        widths = []
+        for col in df.columns:
+            longest = df[col].astype(str).str.len().max() if len(df) else 0
+            if include_header:
+                longest = max(longest, len(str(col)))
+            widths.append(int(longest) + 2)
+        return widths
+
+    @staticmethod
+    def _write_rows(worksheet, first_row, df, chunk_size=1000):
+        """Write a DataFrame's rows as whole blocks, converting NaN to blank cells"""
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size].astype(object)
+            rows = chunk.where(chunk.notna(), None).values.tolist()
+            for offset, row in enumerate(rows):
+                worksheet.write_row(first_row + start + offset, 0, row)
+
+    def _write_excel_streaming(self, excel_path, sheets, rankings):
+        """
+        Write the report with xlsxwriter in constant_memory mode
+
+        Rows are flushed to disk as they are written, so memory stays flat as
+        the universe grows. Column widths come from the DataFrames instead of a
+        pass over the finished cells.
+        """
+        workbook = xlsxwriter.Workbook(excel_path, {'constant_memory': True})
+        
+        for sheet_name, df in sheets:
+            worksheet = workbook.add_worksheet(sheet_name)
+            for c_idx, width in enumerate(self._column_widths(df)):
+                worksheet.set_column(c_idx, c_idx, width)
+            worksheet.write_row(0, 0, list(df.columns))
+            self._write_rows(worksheet, 1, df)
+        
+        rankings_sheet = workbook.add_worksheet('Rankings')
+        widths = {}
+        for title, df in rankings:
+            widths[0] = max(widths.get(0, 0), len(title) + 2)
+            for c_idx, width in enumerate(self._column_widths(df, include_header=False)):
+                widths[c_idx] = max(widths.get(c_idx, 0), width)
+        for c_idx, width in widths.items():
+            rankings_sheet.set_column(c_idx, c_idx, width)
+        
+        start_row = 0
+        for title, df in rankings:
+            rankings_sheet.write(start_row, 0, title)
+            self._write_rows(rankings_sheet, start_row + 1, df)
+            start_row += len(df) + 3
+        
+        workbook.close()
     def plot_technical_analysis(self, df, symbol):
         """Create technical analysis plots"""
         try:
+            if self.chart_renderer is not None:
+                self.chart_renderer.render(df, symbol)
+                return
+
             # Price, Moving Averages, and Bollinger Bands
             plt.figure(figsize=(12, 6))
             plt.plot(df.index, df['Close'], label='Price', alpha=0.5)
@@ -437,40 +631,57 @@ class StockAnalyzer:
         except Exception as e:
             print(f"Error creating plots: {str(e)}")
 
-    def analyze_stock(self, symbol, period='1y'):
-        """Perform complete stock analysis"""
+    def build_results(self, df, signals):
+        """
+        Package the latest indicator values and signals with the analysed frame
+
+        The scalar values are taken at full precision; in compact mode only the
+        stored frame is reduced.
+        """
+        return {
+            'technical_analysis': {
+                'signals': signals,
+                'last_price': df['Close'].iloc[-1],
+                'volume': df['Volume'].iloc[-1],
+                'rsi': df['RSI'].iloc[-1],
+                'macd': df['MACD'].iloc[-1],
+                'stochastic_k': df['Stochastic_K'].iloc[-1],
+                'mfi': df['MFI'].iloc[-1],
+                'atr': df['ATR'].iloc[-1],
+                'roc': df['ROC'].iloc[-1]
+            },
+            'data': compact_frame(df) if self.compact else df
+        }
+
+    def analyze_stock(self, symbol, period='1y', data=None, plot=True):
+        """Perform complete stock analysis, reusing prefetched `data` when given"""
         try:
+            span = self.instrumentation.span
+
             # Get data
-            df = self.get_stock_data(symbol, period)
+            with span('fetch', symbol):
+                df = data.copy() if data is not None else self.get_stock_data(symbol, period)
             if df is None or df.empty:
                 return None
 
-            # Calculate indicators
-            df = self.calculate_technical_indicators(df)
+            # Calculate indicators unless the panel engine already did
+            if not set(INDICATOR_COLUMNS).issubset(df.columns):
+                with span('indicators', symbol):
+                    df = self.calculate_technical_indicators(df)
             if df is None:
                 return None
 
             # Generate signals
-            signals = self.generate_signals(df)
+            with span('signals', symbol):
+                signals = self.generate_signals(df)
 
             # Create plots
-            self.plot_technical_analysis(df, symbol)
+            if plot:
+                with span('plot', symbol):
+                    self.plot_technical_analysis(df, symbol)
 
             # Prepare results
-            results = {
-                'technical_analysis': {
-                    'signals': signals,
-                    'last_price': df['Close'].iloc[-1],
-                    'volume': df['Volume'].iloc[-1],
-                    'rsi': df['RSI'].iloc[-1],
-                    'macd': df['MACD'].iloc[-1],
-                    'stochastic_k': df['Stochastic_K'].iloc[-1],
-                    'mfi': df['MFI'].iloc[-1],
-                    'atr': df['ATR'].iloc[-1],
-                    'roc': df['ROC'].iloc[-1]
-                },
-                'data': df
-            }
+            results = self.build_results(df, signals)
 
             return results
 
@@ -481,23 +692,38 @@ class StockAnalyzer:
     def export_results(self, results, symbol):
         """Export analysis results to files"""
         try:
+            if self.export_format != 'csv':
+                return
+
             if results and 'data' in results:
-                # Export technical data
-                results['data'].to_csv(f'{self.output_dir}/{symbol}_technical_data.csv')
-                
-                # Export signals and metrics
-                if 'technical_analysis' in results:
-                    tech_analysis = results['technical_analysis']
-                    metrics_df = pd.DataFrame({
-                        'Metric': tech_analysis.keys(),
-                        'Value': tech_analysis.values()
-                    })
-                    metrics_df.to_csv(f'{self.output_dir}/{symbol}_analysis_summary.csv', index=False)
+                with self.instrumentation.span('export', symbol):
+                    # Export technical data
+                    results['data'].to_csv(f'{self.output_dir}/{symbol}_technical_data.csv')
+                    
+                    # Export signals and metrics
+                    if 'technical_analysis' in results:
+                        tech_analysis = results['technical_analysis']
+                        metrics_df = pd.DataFrame({
+                            'Metric': tech_analysis.keys(),
+                            'Value': tech_analysis.values()
+                        })
+                        metrics_df.to_csv(f'{self.output_dir}/{symbol}_analysis_summary.csv', index=False)
 
             print(f"Data exported for {symbol}")
         except Exception as e:
             print(f"Error exporting results: {str(e)}")
 
+    def export_dataset(self, all_results, run_date=None):
+        """Export every symbol's results to one typed, run-date partitioned Arrow dataset"""
+        try:
+            with self.instrumentation.span('export_dataset'):
+                partition = ResultsDataset(os.path.join(self.output_dir, 'dataset')).write(all_results, run_date)
+            print(f"Results dataset written to {partition}")
+            return partition
+        except Exception as e:
+            print(f"Error exporting results dataset: {str(e)}")
+            return None
+
     def calculate_technical_strength(self, tech_analysis, signals):
         """Calculate overall technical strength as a percentage"""
         try:
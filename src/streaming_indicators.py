@@ -0,0 +1,386 @@
+import json
+import math
+from collections import deque
+from config import TECHNICAL_PARAMS
+from src.signals import classify_signals
+
+NAN = float('nan')
+
+
+class RollingWindow:
+    def __init__(self, window, resync_every=1000):
+        """
+        Fixed-size window with running sum and sum of squares
+
+        Values are stored relative to an anchor (the first value seen) so the
+        sum-of-squares variance stays precise for high-priced symbols. The sums
+        are rebuilt from the window every `resync_every` updates to stop
+        floating-point drift on long-running streams.
+
+        Parameters:
+        window (int): Number of values in the window
+        resync_every (int): Updates between exact recomputations of the sums
+        """
+        self.window = window
+        self.resync_every = resync_every
+        self.values = deque()
+        self.anchor = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.missing = 0
+        self.updates = 0
+
+    def push(self, value):
+        """Add a value, evicting the oldest once the window is full"""
+        if len(self.values) == self.window:
+            self._remove(self.values.popleft())
+        self.values.append(value)
+        if math.isfinite(value):
+            if self.anchor is None:
+                self.anchor = value
+            shifted = value - self.anchor
+            self.total += shifted
+            self.total_sq += shifted * shifted
+        else:
+            self.missing += 1
+
+        self.updates += 1
+        if self.updates % self.resync_every == 0:
+            self._resync()
+
+    def _remove(self, value):
+        if math.isfinite(value):
+            shifted = value - self.anchor
+            self.total -= shifted
+            self.total_sq -= shifted * shifted
+        else:
+            self.missing -= 1
+
+    def _resync(self):
+        finite = [v for v in self.values if math.isfinite(v)]
+        self.anchor = sum(finite) / len(finite) if finite else None
+        self.total = sum(v - self.anchor for v in finite)
+        self.total_sq = sum((v - self.anchor) ** 2 for v in finite)
+
+    @property
+    def full(self):
+        return len(self.values) == self.window and self.missing == 0
+
+    def sum(self):
+        """Window sum, NaN until the window holds `window` finite values"""
+        return self.total + self.window * self.anchor if self.full else NAN
+
+    def mean(self):
+        """Window mean, NaN until the window holds `window` finite values"""
+        return self.total / self.window + self.anchor if self.full else NAN
+
+    def std(self, ddof=1):
+        """Window standard deviation, NaN until the window is full"""
+        if not self.full:
+            return NAN
+        var = (self.total_sq - self.total * self.total / self.window) / (self.window - ddof)
+        return math.sqrt(max(var, 0.0))
+
+    def to_dict(self):
+        return {'window': self.window, 'resync_every': self.resync_every,
+                'values': list(self.values), 'updates': self.updates}
+
+    @classmethod
+    def from_dict(cls, state):
+        rolling = cls(state['window'], state['resync_every'])
+        for value in state['values']:
+            rolling.push(value)
+        rolling.updates = state['updates']
+        return rolling
+
+
+class MonotonicWindow:
+    def __init__(self, window, mode='max'):
+        """
+        Rolling minimum or maximum in amortised constant time
+
+        Parameters:
+        window (int): Number of bars in the window
+        mode (str): 'max' or 'min'
+        """
+        self.window = window
+        self.mode = mode
+        self.candidates = deque()  # (bar number, value), values monotonic
+        self.count = 0
+
+    def push(self, value):
+        """Add a value and drop candidates it dominates or that left the window"""
+        dominated = (lambda old: old <= value) if self.mode == 'max' else (lambda old: old >= value)
+        while self.candidates and dominated(self.candidates[-1][1]):
+            self.candidates.pop()
+        self.candidates.append((self.count, value))
+        self.count += 1
+        while self.candidates[0][0] <= self.count - 1 - self.window:
+            self.candidates.popleft()
+
+    def value(self):
+        """Current extreme, NaN until the window is full"""
+        return self.candidates[0][1] if self.count >= self.window else NAN
+
+    def to_dict(self):
+        return {'window': self.window, 'mode': self.mode, 'count': self.count,
+                'candidates': [list(c) for c in self.candidates]}
+
+    @classmethod
+    def from_dict(cls, state):
+        extreme = cls(state['window'], state['mode'])
+        extreme.count = state['count']
+        extreme.candidates = deque(tuple(c) for c in state['candidates'])
+        return extreme
+
+
+class StreamingIndicators:
+    def __init__(self, symbol=None, params=None):
+        """
+        Incremental per-symbol indicator state
+
+        Every call to update() costs O(1) and produces the same row that
+        StockAnalyzer.calculate_technical_indicators would produce for the
+        last bar of the full history, plus the generate_signals result.
+
+        Parameters:
+        symbol (str): Stock symbol the state belongs to
+        params (dict): Overrides for config.TECHNICAL_PARAMS; every window,
+            span and band width comes from them
+        """
+        self.symbol = symbol
+        self.params = dict(TECHNICAL_PARAMS, **(params or {}))
+        p = self.params
+        self.bars = 0
+        self.last_date = None
+        self.prev_close = NAN
+        self.prev_typical_price = NAN
+        self.ema_fast = NAN
+        self.ema_slow = NAN
+        self.signal_line = NAN
+        self.obv = 0.0
+        self.prev_obv = NAN
+        self.closes = deque(maxlen=int(p['ROC_PERIOD']) + 1)  # ROC needs the close ROC_PERIOD bars back
+
+        self.gain = RollingWindow(int(p['RSI_PERIOD']))
+        self.loss = RollingWindow(int(p['RSI_PERIOD']))
+        self.sma_short = RollingWindow(int(p['SMA_SHORT']))
+        self.sma_long = RollingWindow(int(p['SMA_LONG']))
+        self.sma_trend = RollingWindow(int(p['SMA_TREND']))
+        self.bollinger = self._bollinger_window()
+        self.low_min = MonotonicWindow(int(p['STOCH_PERIOD']), 'min')
+        self.high_max = MonotonicWindow(int(p['STOCH_PERIOD']), 'max')
+        self.stochastic_k = RollingWindow(int(p['STOCH_SMOOTH']))
+        self.true_range = RollingWindow(int(p['ATR_PERIOD']))
+        self.positive_flow = RollingWindow(int(p['MFI_PERIOD']))
+        self.negative_flow = RollingWindow(int(p['MFI_PERIOD']))
+        self.close_open = RollingWindow(int(p['RVI_PERIOD']))
+        self.high_low = RollingWindow(int(p['RVI_PERIOD']))
+
+    def _bollinger_window(self):
+        """The Bollinger window, shared with the short SMA when the periods match"""
+        if int(self.params['BB_PERIOD']) == self.sma_short.window:
+            return self.sma_short
+        return RollingWindow(int(self.params['BB_PERIOD']))
+
+    @staticmethod
+    def _ema(prev, value, span):
+        if math.isnan(prev):
+            return value
+        return prev + (2.0 / (span + 1.0)) * (value - prev)
+
+    @staticmethod
+    def _ratio(numerator, denominator):
+        try:
+            return numerator / denominator
+        except ZeroDivisionError:
+            if numerator == 0 or math.isnan(numerator):
+                return NAN
+            return math.copysign(math.inf, numerator)
+
+    def update(self, bar):
+        """
+        Consume one bar and return the latest indicator row and signals
+
+        Parameters:
+        bar (dict or pandas.Series): Bar with Open, High, Low, Close and Volume,
+            and optionally a 'Date'
+
+        Returns:
+        tuple: (row, signals) where row is a dict of price and indicator values
+        """
+        open_, high, low = float(bar['Open']), float(bar['High']), float(bar['Low'])
+        close, volume = float(bar['Close']), float(bar['Volume'])
+        first = self.bars == 0
+
+        # RSI
+        delta = NAN if first else close - self.prev_close
+        self.gain.push(delta if delta > 0 else 0.0)
+        self.loss.push(-delta if delta < 0 else 0.0)
+        rs = self._ratio(self.gain.mean(), self.loss.mean())
+        rsi = 100 - (100 / (1 + rs))
+
+        # MACD
+        p = self.params
+        self.ema_fast = self._ema(self.ema_fast, close, int(p['EMA_SHORT']))
+        self.ema_slow = self._ema(self.ema_slow, close, int(p['EMA_LONG']))
+        macd = self.ema_fast - self.ema_slow
+        self.signal_line = self._ema(self.signal_line, macd, int(p['MACD_SIGNAL']))
+
+        # Moving Averages and Bollinger Bands
+        for window in (self.sma_short, self.sma_long, self.sma_trend):
+            window.push(close)
+        if self.bollinger is not self.sma_short:
+            self.bollinger.push(close)
+        bb_middle = self.bollinger.mean()
+        bb_std = self.bollinger.std()
+        bb_width = float(p['BB_STD']) * bb_std
+
+        # Stochastic Oscillator
+        self.low_min.push(low)
+        self.high_max.push(high)
+        low_min, high_max = self.low_min.value(), self.high_max.value()
+        stochastic_k = 100 * self._ratio(close - low_min, high_max - low_min)
+        self.stochastic_k.push(stochastic_k)
+
+        # Average True Range (ATR)
+        ranges = [high - low]
+        if not first:
+            ranges += [abs(high - self.prev_close), abs(low - self.prev_close)]
+        self.true_range.push(max(ranges))
+
+        # On-Balance Volume (OBV)
+        self.prev_obv = self.obv if not first else NAN
+        if not first and delta != 0:
+            self.obv += math.copysign(volume, delta)
+
+        # Rate of Change (ROC)
+        self.closes.append(close)
+        if len(self.closes) == self.closes.maxlen:
+            roc = self._ratio(close - self.closes[0], self.closes[0]) * 100
+        else:
+            roc = NAN
+
+        # Money Flow Index (MFI)
+        typical_price = (high + low + close) / 3
+        money_flow = typical_price * volume
+        self.positive_flow.push(money_flow if typical_price > self.prev_typical_price else 0.0)
+        self.negative_flow.push(money_flow if typical_price < self.prev_typical_price else 0.0)
+        mfi_ratio = self._ratio(self.positive_flow.sum(), self.negative_flow.sum())
+        mfi = 100 - (100 / (1 + mfi_ratio))
+
+        # Relative Vigor Index (RVI)
+        self.close_open.push(close - open_)
+        self.high_low.push(high - low)
+        rvi = self._ratio(self.close_open.mean(), self.high_low.mean())
+
+        self.prev_close = close
+        self.prev_typical_price = typical_price
+        self.bars += 1
+        if 'Date' in bar:
+            self.last_date = str(bar['Date'])
+
+        row = {
+            'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume,
+            'RSI': rsi, 'MACD': macd, 'Signal_Line': self.signal_line,
+            'SMA_20': self.sma_short.mean(), 'SMA_50': self.sma_long.mean(), 'SMA_200': self.sma_trend.mean(),
+            'BB_middle': bb_middle, 'BB_upper': bb_middle + bb_width, 'BB_lower': bb_middle - bb_width,
+            'Stochastic_K': stochastic_k, 'Stochastic_D': self.stochastic_k.mean(),
+            'ATR': self.true_range.mean(), 'OBV': self.obv, 'ROC': roc, 'MFI': mfi, 'RVI': rvi
+        }
+        return row, classify_signals(row, self.prev_obv)
+
+    @classmethod
+    def from_history(cls, df, symbol=None, params=None):
+        """
+        Warm up the state by replaying a historical OHLCV frame
+
+        Parameters:
+        df (pandas.DataFrame): Historical bars, oldest first
+        symbol (str): Stock symbol
+        params (dict): Overrides for config.TECHNICAL_PARAMS
+
+        Returns:
+        StreamingIndicators: State positioned after the last bar of `df`
+        """
+        state = cls(symbol, params)
+        for date, open_, high, low, close, volume in zip(
+                df.index, df['Open'], df['High'], df['Low'], df['Close'], df['Volume']):
+            state.update({'Date': date, 'Open': open_, 'High': high, 'Low': low,
+                          'Close': close, 'Volume': volume})
+        return state
+
+    _SCALARS = ['symbol', 'bars', 'last_date', 'prev_close', 'prev_typical_price',
+                'ema_fast', 'ema_slow', 'signal_line', 'obv', 'prev_obv']
+    _ROLLING = ['gain', 'loss', 'sma_short', 'sma_long', 'sma_trend', 'stochastic_k',
+                'true_range', 'positive_flow', 'negative_flow', 'close_open', 'high_low']
+    _EXTREMES = ['low_min', 'high_max']
+
+    def to_dict(self):
+        """Return a JSON-serialisable snapshot of the state"""
+        state = {name: getattr(self, name) for name in self._SCALARS}
+        state['params'] = self.params
+        state['closes'] = list(self.closes)
+        state.update({name: getattr(self, name).to_dict() for name in self._ROLLING})
+        state.update({name: getattr(self, name).to_dict() for name in self._EXTREMES})
+        if self.bollinger is not self.sma_short:
+            state['bollinger'] = self.bollinger.to_dict()
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild the state saved by to_dict()"""
+        indicators = cls(state['symbol'], state.get('params'))
+        for name in cls._SCALARS:
+            setattr(indicators, name, state[name])
+        indicators.closes = deque(state['closes'], maxlen=indicators.closes.maxlen)
+        for name in cls._ROLLING:
+            setattr(indicators, name, RollingWindow.from_dict(state[name]))
+        for name in cls._EXTREMES:
+            setattr(indicators, name, MonotonicWindow.from_dict(state[name]))
+        if 'bollinger' in state:
+            indicators.bollinger = RollingWindow.from_dict(state['bollinger'])
+        else:
+            indicators.bollinger = indicators.sma_short
+        return indicators
+
+
+def save_states(states, path, params=None):
+    """
+    Persist the streaming state of many symbols so a restart is warm
+
+    Parameters:
+    states (dict): Stock symbols as keys and StreamingIndicators as values
+    path (str): JSON file to write
+    params (dict): Overrides for config.TECHNICAL_PARAMS the states were built with
+    """
+    params = dict(TECHNICAL_PARAMS, **(params or {}))
+    for symbol, state in states.items():
+        if state.params != params:
+            raise ValueError(f"Streaming state for {symbol} was built with different indicator parameters")
+    with open(path, 'w') as f:
+        json.dump({'params': params,
+                   'states': {symbol: state.to_dict() for symbol, state in states.items()}}, f)
+
+
+def load_states(path, params=None):
+    """
+    Load streaming states written by save_states()
+
+    A state built with other indicator parameters would silently produce
+    different values, so a file saved with different params is refused.
+
+    Parameters:
+    path (str): JSON file to read
+    params (dict): Overrides for config.TECHNICAL_PARAMS the states must match
+
+    Returns:
+    dict: Stock symbols as keys and StreamingIndicators as values
+    """
+    params = dict(TECHNICAL_PARAMS, **(params or {}))
+    with open(path) as f:
+        saved = json.load(f)
+    if saved.get('params') != params:
+        raise ValueError(f"Streaming states in {path} were saved with different indicator parameters; "
+                         f"rebuild them with StreamingIndicators.from_history")
+    return {symbol: StreamingIndicators.from_dict(state) for symbol, state in saved['states'].items()}
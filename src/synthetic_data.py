@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+# Trading days in each supported history length
+PERIOD_BARS = {'1mo': 21, '3mo': 63, '6mo': 126, '1y': 252, '2y': 504,
+               '5y': 1260, '10y': 2520, '20y': 5040}
+
+
+def generate_ohlcv(n_bars, seed=0, start_price=100.0, volatility=0.02, drift=0.0003,
+                   gap_probability=0.01, end_date='2024-12-31'):
+    """
+    Generate a realistic OHLCV frame shaped like yfinance Ticker.history()
+
+    Closes follow a geometric random walk; opens gap away from the previous
+    close (occasionally by several sigma), highs and lows bracket both, and
+    volume is log-normal and rises on large moves.
+
+    Parameters:
+    n_bars (int): Number of daily bars
+    seed (int): Random seed
+    start_price (float): First close
+    volatility (float): Daily log-return standard deviation
+    drift (float): Daily log-return mean
+    gap_probability (float): Chance of an overnight price gap on each bar
+    end_date (str): Date of the last bar
+
+    Returns:
+    pandas.DataFrame: Open, High, Low, Close, Volume, Dividends, Stock Splits
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=end_date, periods=n_bars, tz='America/New_York')
+
+    returns = rng.normal(drift, volatility, n_bars)
+    close = start_price * np.exp(np.cumsum(returns))
+    prev_close = np.concatenate([[start_price], close[:-1]])
+
+    gaps = rng.normal(0, volatility / 4, n_bars)
+    jumps = rng.random(n_bars) < gap_probability
+    gaps[jumps] += rng.normal(0, volatility * 4, jumps.sum())
+    open_ = prev_close * np.exp(gaps)
+
+    wick = np.abs(rng.normal(0, volatility / 2, (2, n_bars)))
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+
+    base_volume = rng.lognormal(mean=15, sigma=0.4, size=n_bars)
+    volume = (base_volume * (1 + 20 * np.abs(returns))).astype(np.int64)
+
+    dividends = np.zeros(n_bars)
+    dividends[rng.random(n_bars) < 1 / 63] = np.round(close[0] * 0.005, 2)
+
+    return pd.DataFrame({
+        'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume,
+        'Dividends': dividends, 'Stock Splits': np.zeros(n_bars)
+    }, index=pd.DatetimeIndex(index, name='Date'))
+
+
+def generate_universe(n_symbols, period='1y', seed=0, late_listing_share=0.1, missing_bar_share=0.001):
+    """
+    Generate a universe of synthetic symbols with varying listing dates
+
+    A share of the symbols list partway through the period (like RIVN or
+    LCID) and a few random bars are dropped from every symbol to mimic
+    halts and data gaps.
+
+    Parameters:
+    n_symbols (int): Number of symbols
+    period (str): History length, a key of PERIOD_BARS
+    seed (int): Random seed
+    late_listing_share (float): Fraction of symbols listed after the period starts
+    missing_bar_share (float): Fraction of bars dropped from each symbol
+
+    Returns:
+    dict: Synthetic symbols as keys and OHLCV DataFrames as values
+    """
+    rng = np.random.default_rng(seed)
+    n_bars = PERIOD_BARS[period]
+    universe = {}
+    for i in range(n_symbols):
+        symbol = f'SYN{i:05d}'
+        df = generate_ohlcv(n_bars, seed=seed * 1_000_003 + i,
+                            start_price=float(rng.uniform(5, 500)),
+                            volatility=float(rng.uniform(0.01, 0.04)))
+        if rng.random() < late_listing_share:
+            df = df.iloc[int(rng.integers(1, max(2, n_bars - 250))):]
+        keep = rng.random(len(df)) >= missing_bar_share
+        keep[:1] = keep[-1:] = True
+        universe[symbol] = df[keep]
+    return universe
+
+
+def synthetic_provider(universe):
+    """
+    Build a DataFetcher batch provider that serves a synthetic universe
+
+    Parameters:
+    universe (dict): Symbols as keys and OHLCV DataFrames as values
+
+    Returns:
+    callable: Provider taking (symbols, period, start=None, interval='1d')
+    """
+    def provider(symbols, period='1y', start=None, interval='1d'):
+        frames = {}
+        for symbol in symbols:
+            df = universe.get(symbol)
+            if df is None:
+                continue
+            if start is not None:
+                df = df[df.index >= pd.Timestamp(start, tz=df.index.tz)]
+            frames[symbol] = df.copy()
+        return frames
+    return provider
@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-import ta
+from src.indicator_registry import LazyIndicators
 
 class TechnicalAnalyzer:
     def __init__(self, data):
@@ -12,6 +12,8 @@ class TechnicalAnalyzer:
         """
         self.data = data
         self.indicators = {}
+        # Shared with every add_* method so common intermediates are computed once
+        self.lazy = LazyIndicators(data)
 
     def add_all_indicators(self):
         """Add all technical indicators to the dataset"""
@@ -30,8 +32,8 @@ class TechnicalAnalyzer:
         periods (list): List of periods for moving averages
         """
         for period in periods:
-            self.data[f'SMA_{period}'] = ta.trend.sma_indicator(self.data['Close'], window=period)
-            self.data[f'EMA_{period}'] = ta.trend.ema_indicator(self.data['Close'], window=period)
+            self.data[f'SMA_{period}'] = self.lazy[f'rolling_mean:Close:{period}']
+            self.data[f'EMA_{period}'] = self.lazy[f'ema:Close:{period}']
 
     def add_rsi(self, period=14):
         """
@@ -40,7 +42,7 @@ class TechnicalAnalyzer:
         Parameters:
         period (int): Period for RSI calculation
         """
-        self.data['RSI'] = ta.momentum.rsi(self.data['Close'], window=period)
+        self.data['RSI'] = self.lazy[f'rsi_wilder:{period}']
 
     def add_macd(self, fast=12, slow=26, signal=9):
         """
@@ -51,13 +53,8 @@ class TechnicalAnalyzer:
         slow (int): Slow period
         signal (int): Signal period
         """
-        self.data['MACD'] = ta.trend.macd(self.data['Close'], 
-                                         window_slow=slow, 
-                                         window_fast=fast)
-        self.data['MACD_Signal'] = ta.trend.macd_signal(self.data['Close'], 
-                                                       window_slow=slow, 
-                                                       window_fast=fast, 
-                                                       window_sign=signal)
+        self.data['MACD'] = self.lazy[f'macd_ema:{fast}:{slow}']
+        self.data['MACD_Signal'] = self.lazy[f'ema:macd_ema:{fast}:{slow}:{signal}']
 
     def add_bollinger_bands(self, window=20, window_dev=2):
         """
@@ -67,14 +64,9 @@ class TechnicalAnalyzer:
         window (int): Moving average window
         window_dev (int): Standard deviation multiplier
         """
-        self.data['BB_Upper'] = ta.volatility.bollinger_hband(self.data['Close'], 
-                                                             window=window, 
-                                                             window_dev=window_dev)
-        self.data['BB_Lower'] = ta.volatility.bollinger_lband(self.data['Close'], 
-                                                             window=window, 
-                                                             window_dev=window_dev)
-        self.data['BB_Middle'] = ta.volatility.bollinger_mavg(self.data['Close'], 
-                                                             window=window)
+        self.data['BB_Upper'] = self.lazy[f'bb_upper_pop:{window}:{window_dev}']
+        self.data['BB_Lower'] = self.lazy[f'bb_lower_pop:{window}:{window_dev}']
+        self.data['BB_Middle'] = self.lazy[f'rolling_mean:Close:{window}']
 
     def add_atr(self, window=14):
         """
@@ -83,10 +75,7 @@ class TechnicalAnalyzer:
         Parameters:
         window (int): Period for ATR calculation
         """
-        self.data['ATR'] = ta.volatility.average_true_range(high=self.data['High'],
-                                                           low=self.data['Low'],
-                                                           close=self.data['Close'],
-                                                           window=window)
+        self.data['ATR'] = self.lazy[f'atr_wilder:{window}']
 
     def generate_signals(self):
         """
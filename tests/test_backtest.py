@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest import Backtester
+
+
+def per_bar_backtest(close, scores, long_threshold=60, exit_threshold=40, short_threshold=None, cost=0.001):
+    """Bar-by-bar reference: per-symbol net returns and the equal-weight portfolio return"""
+    n_dates, n_symbols = close.shape
+    net = np.zeros(close.shape)
+    position = np.zeros(close.shape)
+    active = np.zeros(close.shape, dtype=bool)
+    for j in range(n_symbols):
+        closes = np.flatnonzero(~np.isnan(close[:, j]))
+        first, last = closes[0], closes[-1]
+        target, held, last_close = 0.0, 0.0, np.nan
+        for t in range(n_dates):
+            # Trade on yesterday's decision; nothing is held before the first close
+            pos = target if t >= first else 0.0
+            ret = 0.0
+            if not np.isnan(close[t, j]):
+                if not np.isnan(last_close):
+                    ret = close[t, j] / last_close - 1
+                last_close = close[t, j]
+            net[t, j] = pos * ret - abs(pos - held) * cost
+            position[t, j], held = pos, pos
+            active[t, j] = first < t <= last
+
+            score = scores[t, j]
+            if score >= long_threshold:
+                target = 1.0
+            elif short_threshold is not None and score < short_threshold:
+                target = -1.0
+            elif score < exit_threshold:
+                target = 0.0
+    portfolio = np.array([net[t, active[t]].mean() if active[t].any() else 0.0 for t in range(n_dates)])
+    return net, position, active, portfolio
+
+
+def max_drawdown(equity):
+    peak, worst = -np.inf, 0.0
+    for value in equity:
+        peak = max(peak, value)
+        worst = min(worst, value / peak - 1)
+    return worst
+
+
+def run(close, scores, **params):
+    dates = pd.bdate_range('2024-01-01', periods=len(close))
+    symbols = [f'S{j}' for j in range(close.shape[1])]
+    return Backtester(**params).run(dates, symbols, close, scores)
+
+
+@pytest.mark.parametrize('short_threshold', [None, 20])
+def test_matches_per_bar_loop(short_threshold):
+    rng = np.random.default_rng(7)
+    n_dates = 80
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, (n_dates, 3)), axis=0)
+    close[:15, 0] = np.nan       # listed late
+    close[60:, 1] = np.nan       # data ends early
+    close[[30, 31, 45], 2] = np.nan  # halts
+    scores = rng.uniform(0, 100, close.shape)
+    scores[rng.random(close.shape) < 0.1] = np.nan
+
+    result = run(close, scores, short_threshold=short_threshold)
+    net, position, active, portfolio = per_bar_backtest(close, scores, short_threshold=short_threshold)
+
+    equity = np.cumprod(1 + net, axis=0)
+    np.testing.assert_allclose(result['equity'].to_numpy(), equity)
+    np.testing.assert_allclose(result['portfolio']['Equity'].to_numpy(), np.cumprod(1 + portfolio))
+
+    summary = result['summary']
+    for j, symbol in enumerate(result['equity'].columns):
+        bars = active[:, j]
+        assert summary.loc[symbol, 'Total_Return'] == pytest.approx(equity[-1, j] - 1)
+        assert summary.loc[symbol, 'Max_Drawdown'] == pytest.approx(max_drawdown(equity[:, j]))
+        assert summary.loc[symbol, 'Trades'] == np.count_nonzero(np.diff(position[:, j], prepend=0.0))
+        assert summary.loc[symbol, 'Exposure'] == pytest.approx((position[bars, j] != 0).mean())
+        assert summary.loc[symbol, 'Volatility'] == pytest.approx(net[bars, j].std(ddof=1) * np.sqrt(252))
+    assert summary.loc['PORTFOLIO', 'Max_Drawdown'] == pytest.approx(max_drawdown(np.cumprod(1 + portfolio)))
+
+
+def test_positions_follow_the_previous_target():
+    close = np.array([[100.0], [100.0], [200.0], [200.0], [400.0]])
+    scores = np.array([[0.0], [0.0], [100.0], [100.0], [100.0]])
+    backtester = Backtester(cost_bps=0, slippage_bps=0)
+    np.testing.assert_array_equal(backtester.target_positions(scores)[:, 0], [0, 0, 1, 1, 1])
+
+    # The jump on the signal bar itself is not captured, only the one after it
+    result = run(close, scores, cost_bps=0, slippage_bps=0)
+    np.testing.assert_allclose(result['equity']['S0'].to_numpy(), [1, 1, 1, 1, 2])
+
+
+def test_costs_are_paid_on_every_position_change():
+    close = np.full((5, 1), 100.0)
+    scores = np.array([[70.0], [30.0], [70.0], [30.0], [70.0]])
+    result = run(close, scores, cost_bps=6, slippage_bps=4)
+    # Positions are [0, 1, 0, 1, 0]: four changes at 10 bps each
+    np.testing.assert_allclose(result['equity']['S0'].to_numpy(),
+                               [1, 0.999, 0.999 ** 2, 0.999 ** 3, 0.999 ** 4])
+    assert result['summary'].loc['S0', 'Trades'] == 4
+    assert result['summary'].loc['S0', 'Turnover'] == 4
+
+
+def test_bars_before_listing_are_flat():
+    close = np.array([[100.0, np.nan], [101.0, np.nan], [102.0, 50.0], [103.0, 55.0], [104.0, 60.5]])
+    scores = np.full(close.shape, 100.0)
+    result = run(close, scores, cost_bps=10, slippage_bps=0)
+    equity = result['equity']['S1'].to_numpy()
+    # Flat until the first close, which pays to enter; returns accrue from the next bar
+    np.testing.assert_allclose(equity, [1, 1, 0.999, 0.999 * 1.1, 0.999 * 1.1 * 1.1])
+    assert result['summary'].loc['S1', 'Trades'] == 1
+
+
+def test_symbol_ending_early_leaves_the_portfolio():
+    close = np.array([[100.0, 100.0], [110.0, 90.0], [121.0, 81.0], [133.1, np.nan], [146.41, np.nan]])
+    scores = np.full(close.shape, 100.0)
+    result = run(close, scores, cost_bps=0, slippage_bps=0)
+    # Bars 1 and 2 average +10% and -10%; afterwards only S0 trades
+    np.testing.assert_allclose(result['portfolio']['Equity'].to_numpy(), [1, 1, 1, 1.1, 1.21])
+    assert result['summary'].loc['S1', 'Exposure'] == 1.0
+    assert result['summary'].loc['S1', 'CAGR'] == pytest.approx(0.81 ** (252 / 2) - 1)
+
+
+def test_known_max_drawdown():
+    close = np.array([[100.0], [100.0], [110.0], [88.0], [99.0], [120.0]])
+    scores = np.full(close.shape, 100.0)
+    result = run(close, scores, cost_bps=0, slippage_bps=0)
+    assert result['summary'].loc['S0', 'Max_Drawdown'] == pytest.approx(-0.2)
+    assert result['portfolio']['Drawdown'].min() == pytest.approx(-0.2)
@@ -0,0 +1,111 @@
+import pandas as pd
+
+from src.bar_cache import BarCache
+from src.data_fetcher import DataFetcher, RateLimiter
+from src.synthetic_data import generate_universe, synthetic_provider
+
+
+class Feed:
+    """Provider over a universe the test can change between runs, recording every request"""
+
+    def __init__(self, universe):
+        self.universe = universe
+        self.calls = []
+
+    def __call__(self, symbols, period='1y', start=None, interval='1d'):
+        self.calls.append((sorted(symbols), start))
+        return synthetic_provider(self.universe)(symbols, period, start=start, interval=interval)
+
+    def full_fetches(self):
+        return sorted(symbol for symbols, start in self.calls if start is None for symbol in symbols)
+
+    def tail_fetches(self):
+        return sorted(symbol for symbols, start in self.calls if start is not None for symbol in symbols)
+
+
+def make_universe():
+    universe = generate_universe(5, period='3mo', late_listing_share=0, missing_bar_share=0)
+    # No corporate actions unless a test adds one
+    return {symbol: df.assign(Dividends=0.0) for symbol, df in universe.items()}
+
+
+def run(cache_dir, feed, symbols):
+    fetcher = DataFetcher(provider=feed, rate_limiter=RateLimiter(calls_per_second=0))
+    return BarCache(fetcher, cache_dir=str(cache_dir)).get_many(symbols, period='max')
+
+
+def test_cold_cache_fetches_in_full_then_only_tails(tmp_path):
+    full = make_universe()
+    symbols = list(full)
+    feed = Feed({symbol: df.iloc[:-5] for symbol, df in full.items()})
+
+    run(tmp_path, feed, symbols)
+    assert feed.full_fetches() == sorted(symbols)
+    assert feed.tail_fetches() == []
+
+    feed.universe = full
+    feed.calls = []
+    data = run(tmp_path, feed, symbols)
+    assert feed.full_fetches() == []
+    assert feed.tail_fetches() == sorted(symbols)
+    # Tails start at the second-to-last stored bar
+    anchor = full[symbols[0]].index[-7].strftime('%Y-%m-%d')
+    assert {start for _, start in feed.calls} == {anchor}
+    for symbol in symbols:
+        pd.testing.assert_frame_equal(data[symbol], full[symbol], check_freq=False)
+
+
+def test_uncached_symbol_is_fetched_in_full(tmp_path):
+    full = make_universe()
+    symbols = list(full)
+    feed = Feed(full)
+    run(tmp_path, feed, symbols[:3])
+
+    feed.calls = []
+    run(tmp_path, feed, symbols)
+    assert feed.full_fetches() == sorted(symbols[3:])
+    assert feed.tail_fetches() == sorted(symbols[:3])
+
+
+def test_gap_adjustment_and_new_action_trigger_rewrites(tmp_path):
+    full = make_universe()
+    symbols = list(full)
+    gap, adjusted, action = symbols[:3]
+    feed = Feed({symbol: df.iloc[:-5] for symbol, df in full.items()})
+    run(tmp_path, feed, symbols)
+
+    anchor = full[gap].index[-7]
+    changed = dict(full)
+    # The anchor bar disappears from the provider's history
+    changed[gap] = full[gap].drop(index=anchor)
+    # A split applied retroactively moves every stored price
+    prices = ['Open', 'High', 'Low', 'Close']
+    changed[adjusted] = full[adjusted].assign(**{col: full[adjusted][col] / 2 for col in prices})
+    # A dividend on a new bar will adjust everything before it
+    dividends = full[action]['Dividends'].copy()
+    dividends.iloc[-2] = 0.5
+    changed[action] = full[action].assign(Dividends=dividends)
+
+    feed.universe = changed
+    feed.calls = []
+    data = run(tmp_path, feed, symbols)
+
+    assert feed.tail_fetches() == sorted(symbols)
+    assert feed.full_fetches() == sorted([gap, adjusted, action])
+    for symbol in symbols:
+        pd.testing.assert_frame_equal(data[symbol], changed[symbol], check_freq=False)
+
+
+def test_unchanged_tail_is_appended_without_rewrite(tmp_path):
+    full = make_universe()
+    symbols = list(full)
+    feed = Feed({symbol: df.iloc[:-1] for symbol, df in full.items()})
+    run(tmp_path, feed, symbols)
+
+    feed.universe = full
+    feed.calls = []
+    run(tmp_path, feed, symbols)
+    cache = BarCache(DataFetcher(provider=feed), cache_dir=str(tmp_path))
+    assert feed.full_fetches() == []
+    for symbol in symbols:
+        pd.testing.assert_frame_equal(cache.load(symbol), full[symbol], check_freq=False)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.correlation import RollingCovariance, correlation_matrix, rolling_correlations
+
+
+def make_returns(n_dates=120, n_symbols=7, seed=11):
+    rng = np.random.default_rng(seed)
+    common = rng.normal(0, 0.01, (n_dates, 1))
+    values = common + rng.normal(0, 0.01, (n_dates, n_symbols))
+    values[:40, 1] = np.nan                                     # listed late
+    values[rng.choice(n_dates, 10, replace=False), 2] = np.nan  # scattered gaps
+    values[[50, 51, 90], 3] = np.nan                            # halts
+    values[:-15, 4] = np.nan                                    # too short for min_periods
+    dates = pd.bdate_range('2024-01-01', periods=n_dates)
+    return pd.DataFrame(values, index=dates, columns=[f'S{j}' for j in range(n_symbols)])
+
+
+@pytest.mark.parametrize('block_size', [3, 1024])
+@pytest.mark.parametrize('min_periods', [1, 20])
+def test_correlation_matrix_matches_pandas(block_size, min_periods):
+    returns = make_returns()
+    expected = returns.corr(min_periods=min_periods).to_numpy()
+    result = correlation_matrix(returns.to_numpy(), block_size=block_size, min_periods=min_periods)
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-12, equal_nan=True)
+
+
+def test_correlation_matrix_writes_into_out():
+    returns = make_returns().to_numpy()
+    out = np.empty((returns.shape[1], returns.shape[1]))
+    assert correlation_matrix(returns, block_size=2, out=out) is out
+
+
+def rolling_expected(returns, window, end):
+    """pandas rolling correlation of the window ending on row `end`"""
+    return returns.rolling(window).corr().loc[returns.index[end]].to_numpy()
+
+
+@pytest.mark.parametrize('chunks', [[1] * 60, [3, 12, 1, 5, 25, 2, 7, 5]])
+def test_rolling_covariance_matches_pandas(chunks):
+    returns = make_returns(n_dates=sum(chunks) + 40).iloc[40:]
+    values = returns.to_numpy()
+    window = 10
+    # Rebuilds land between, at and across chunk boundaries
+    rolling = RollingCovariance(values.shape[1], window, recompute_every=7)
+    stop = 0
+    for size in chunks:
+        rolling.update(values[stop:stop + size] if size > 1 else values[stop])
+        stop += size
+        if stop < window:
+            assert np.isnan(rolling.correlation()).all()
+            continue
+        np.testing.assert_allclose(rolling.correlation(), rolling_expected(returns, window, stop - 1),
+                                   rtol=1e-9, atol=1e-12, equal_nan=True, err_msg=f'row {stop - 1}')
+        np.testing.assert_allclose(rolling.covariance(), returns.iloc[stop - window:stop].cov(min_periods=window),
+                                   rtol=1e-9, atol=1e-15, equal_nan=True)
+
+
+def test_rolling_correlations_matches_pandas():
+    returns = make_returns()
+    window, step = 30, 11
+    results = list(rolling_correlations(returns, window=window, step=step))
+    assert [date for date, _ in results] == list(returns.index[window - 1::step])
+    for date, corr in results:
+        end = returns.index.get_loc(date)
+        np.testing.assert_allclose(corr, rolling_expected(returns, window, end),
+                                   rtol=1e-9, atol=1e-12, equal_nan=True)
+
+
+def test_rolling_correlations_short_history_yields_nothing():
+    returns = make_returns().iloc[:30]
+    assert list(rolling_correlations(returns, window=63)) == []
+    assert len(list(rolling_correlations(returns, window=30))) == 1
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from src.data_fetcher import DataFetcher, RateLimiter
+from src.synthetic_data import generate_universe, synthetic_provider
+
+
+def recording_provider(universe, fail=()):
+    """synthetic_provider that records every request and can fail chosen batches"""
+    serve = synthetic_provider(universe)
+    calls = []
+    lock = threading.Lock()
+
+    def provider(symbols, period='1y', start=None, interval='1d'):
+        with lock:
+            calls.append({'symbols': list(symbols), 'start': start, 'time': time.monotonic()})
+        if set(symbols) & set(fail):
+            raise RuntimeError('provider down')
+        return serve(symbols, period, start=start, interval=interval)
+
+    provider.calls = calls
+    return provider
+
+
+def test_symbols_are_fetched_in_batches_in_caller_order():
+    universe = generate_universe(23, period='3mo')
+    provider = recording_provider(universe)
+    fetcher = DataFetcher(provider=provider, rate_limiter=RateLimiter(calls_per_second=0))
+    symbols = list(reversed(list(universe))) + ['MISSING', list(universe)[0]]
+
+    data = fetcher.fetch_multiple_stocks(symbols, batch_size=10, max_workers=3)
+
+    assert sorted(len(call['symbols']) for call in provider.calls) == [4, 10, 10]
+    requested = [symbol for call in provider.calls for symbol in call['symbols']]
+    # Duplicates are requested once
+    assert sorted(requested) == sorted(set(symbols))
+    assert list(data) == list(reversed(list(universe)))
+    for symbol, df in data.items():
+        assert df.equals(universe[symbol])
+
+
+def test_failed_batch_does_not_drop_other_batches():
+    universe = generate_universe(6, period='3mo')
+    symbols = list(universe)
+    provider = recording_provider(universe, fail=[symbols[0]])
+    fetcher = DataFetcher(provider=provider, rate_limiter=RateLimiter(calls_per_second=0))
+
+    data = fetcher.fetch_multiple_stocks(symbols, batch_size=2, max_workers=2)
+
+    assert list(data) == symbols[2:]
+
+
+def test_start_is_passed_to_provider_for_incremental_fetches():
+    universe = generate_universe(3, period='3mo')
+    provider = recording_provider(universe)
+    fetcher = DataFetcher(provider=provider, rate_limiter=RateLimiter(calls_per_second=0))
+
+    data = fetcher.fetch_multiple_stocks(list(universe), start='2024-12-20')
+
+    assert [call['start'] for call in provider.calls] == ['2024-12-20']
+    assert all(df.index[0].strftime('%Y-%m-%d') >= '2024-12-20' for df in data.values())
+
+
+def test_rate_limiter_spaces_requests_across_workers():
+    universe = generate_universe(8, period='1mo')
+    provider = recording_provider(universe)
+    fetcher = DataFetcher(provider=provider, rate_limiter=RateLimiter(calls_per_second=20))
+
+    fetcher.fetch_multiple_stocks(list(universe), batch_size=1, max_workers=8)
+
+    starts = sorted(call['time'] for call in provider.calls)
+    assert len(starts) == 8
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    # 20 calls per second: every request starts at least ~50ms after the previous one
+    assert min(gaps) >= 0.045
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from src.data_fetcher import RateLimiter
+from src.fundamentals_cache import FundamentalsCache, frame_from_json, frame_to_json
+
+PERIODS = pd.DatetimeIndex(['2024-09-30', '2023-09-30'])
+
+
+class FakeTicker:
+    requests = []
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def __getattr__(self, name):
+        FakeTicker.requests.append((self.symbol, name))
+        if name == 'info':
+            return {'marketCap': 1e9, 'longName': f'{self.symbol} Inc.'}
+        if name == 'recommendations':
+            return pd.DataFrame({'To Grade': ['Buy', 'Hold']},
+                                index=pd.DatetimeIndex(['2024-01-05', '2024-07-05'], tz='America/New_York'))
+        return pd.DataFrame([[1.0, np.nan]], index=['Total Revenue'], columns=PERIODS)
+
+
+def make_cache(cache_dir, now):
+    return FundamentalsCache(cache_dir, ticker_factory=FakeTicker, rate_limiter=RateLimiter(0),
+                             clock=lambda: now)
+
+
+def test_date_labels_round_trip():
+    for index in [PERIODS, pd.DatetimeIndex(['2024-01-05', '2024-07-05'], tz='America/New_York')]:
+        df = pd.DataFrame({'value': [1.0, np.nan]}, index=index)
+        back = frame_from_json(frame_to_json(df))
+        assert back.index.equals(index) and back.index.tz == index.tz
+        np.testing.assert_array_equal(back.to_numpy(), df.to_numpy())
+
+
+def test_store_persists_across_instances(tmp_path):
+    FakeTicker.requests = []
+    cache = make_cache(str(tmp_path), now=1_000_000)
+    cache.get_statements(['AAA', 'BBB'])
+    cache.get_recommendations(['AAA'])
+    cache.close()
+    fetched = len(FakeTicker.requests)
+    assert fetched > 0
+
+    # A new instance over the same directory serves everything from disk
+    cache = make_cache(str(tmp_path), now=1_000_100)
+    statements = cache.get_statements(['AAA', 'BBB'])
+    recommendations = cache.get_recommendations(['AAA'])
+    assert len(FakeTicker.requests) == fetched
+    assert statements['AAA']['Balance_Sheet'].columns.equals(PERIODS)
+    assert str(recommendations['AAA'].index.tz) == 'America/New_York'
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.headline_sentiment import HeadlineScorer
+
+HEADLINES = [
+    'Acme beats estimates, shares surge',
+    'Acme misses estimates as margins slump',
+    'Regulator does not approve merger',
+    'Acme shares not surging, no fraud found',
+    'Quarterly report due Thursday',
+    '',
+    'ACME   BEATS estimates,  shares SURGE',
+    'Acme beats estimates, shares surge'
+]
+
+
+def reference_score(text, alpha=1.0):
+    """Per-word loop over the same lexicon and negation rule"""
+    scorer = HeadlineScorer()
+    tokens = text.lower().replace(',', ' ').split()
+    total, negate = 0.0, False
+    for token in tokens:
+        weight = scorer.weights[scorer.vocab.get(token, 0)]
+        total += -weight if negate else weight
+        negate = token in {'not', 'no', 'never', 'without'}
+    return total / np.sqrt(total * total + alpha)
+
+
+def test_scores_match_per_word_loop():
+    scores = HeadlineScorer().score(HEADLINES)
+    np.testing.assert_allclose(scores, [reference_score(text) for text in HEADLINES])
+
+
+def test_negation_flips_polarity():
+    scorer = HeadlineScorer()
+    plain, negated, later = scorer.score(['profits improve', 'profits not improve', 'not profits improve'])
+    assert plain > 0
+    # Only the word right after the negator flips
+    assert negated == pytest.approx(0.0)
+    assert later == pytest.approx(reference_score('not profits improve'))
+    assert scorer.score(['no growth'])[0] == pytest.approx(-scorer.score(['growth'])[0])
+
+
+def test_text_without_lexicon_words_scores_zero():
+    assert HeadlineScorer().score(['Quarterly report due Thursday', '', None]).tolist() == [0.0, 0.0, 0.0]
+
+
+def test_memoised_scores_equal_cold_scores():
+    scorer = HeadlineScorer()
+    cold = scorer.score(HEADLINES)
+    # Case and whitespace variants share one entry
+    assert len(scorer.cache) == len(HEADLINES) - 2
+    np.testing.assert_array_equal(scorer.score(HEADLINES[::-1]), cold[::-1])
+    np.testing.assert_array_equal(HeadlineScorer().score(HEADLINES[::-1]), cold[::-1])
+
+
+def test_clearing_the_cache_keeps_scores_correct():
+    expected = HeadlineScorer().score(HEADLINES)
+    scorer = HeadlineScorer(max_cache=3)
+    for start in range(len(HEADLINES)):
+        batch = HEADLINES[start:start + 2]
+        np.testing.assert_array_equal(scorer.score(batch), expected[start:start + 2])
+        assert len(scorer.cache) <= 3
+    np.testing.assert_array_equal(scorer.score(HEADLINES), expected)
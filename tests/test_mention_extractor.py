@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from src.headline_sentiment import HeadlineScorer
+from src.mention_extractor import MentionExtractor, company_aliases
+
+SYMBOLS = ['AAPL', 'TGT', 'CAT', 'BRK-B', 'F', 'MSFT']
+NAMES = {'AAPL': 'Apple Inc.', 'TGT': 'Target Corporation', 'CAT': 'Caterpillar Inc.',
+         'BRK-B': 'Berkshire Hathaway Inc.', 'F': 'Ford Motor Company', 'MSFT': ['Microsoft Corporation']}
+
+
+@pytest.fixture
+def extractor():
+    return MentionExtractor(SYMBOLS, NAMES)
+
+
+def test_company_aliases_drop_suffixes():
+    assert company_aliases('Apple Inc.') == [('apple', 'inc'), ('apple',)]
+    assert company_aliases('The Walt Disney Company') == [('the', 'walt', 'disney', 'company'), ('walt', 'disney')]
+    assert company_aliases('') == []
+
+
+@pytest.mark.parametrize('text, expected', [
+    # Cashtags match in any case, including ambiguous and single-letter tickers
+    ('Loading up on $aapl and $CAT', {'AAPL', 'CAT'}),
+    ('$F and $BRK.B both green', {'F', 'BRK-B'}),
+    # Bare tickers need upper case; ambiguous and single-letter ones never match bare
+    ('AAPL earnings tonight', {'AAPL'}),
+    ('aapl earnings tonight', set()),
+    ('CAT rallies while F lags', set()),
+    ('BRK.B hits a record', {'BRK-B'}),
+    # Mostly upper-case posts ignore bare tickers but keep cashtags
+    ('AAPL TO THE MOON LETS GO', set()),
+    ('$AAPL TO THE MOON LETS GO', {'AAPL'}),
+    # Names must start with a capital letter
+    ('Apple and Microsoft lead the Nasdaq', {'AAPL', 'MSFT'}),
+    ('an apple a day', set()),
+    ('Ford Motor Company recalls trucks', {'F'}),
+    # One-word names that are everyday words need a legal suffix (or a cashtag)
+    ('Analyst raises price Target on chip stocks', set()),
+    ('Target beats estimates', set()),
+    ('Target Corp. beats estimates', {'TGT'}),
+    ('Target Corporation beats estimates', {'TGT'}),
+    ('$TGT beats estimates', {'TGT'})
+])
+def test_extract(extractor, text, expected):
+    assert extractor.extract(text) == expected
+
+
+def test_extract_matches_each_symbol_once(extractor):
+    assert extractor.extract('AAPL AAPL $AAPL Apple Inc. apple') == {'AAPL'}
+    assert extractor.extract('') == set()
+    assert extractor.extract(None) == set()
+
+
+def test_process_feed_counts_mentions_and_skipped_records(extractor, tmp_path):
+    records = [
+        json.dumps({'text': 'Apple beats estimates, shares surge'}),
+        json.dumps({'text': '$AAPL and $TGT plunge on fraud probe'}),
+        json.dumps({'text': 'Nothing to see here'}),
+        json.dumps({'body': 'AAPL without a text field'}),
+        '',
+        '{not json',
+        json.dumps(['AAPL']),
+        json.dumps({'text': 'Target Corp. expands stores'})
+    ]
+    path = tmp_path / 'feed.jsonl'
+    path.write_text('\n'.join(records) + '\n')
+    scorer = HeadlineScorer()
+
+    results, skipped = extractor.process_feed(str(path), scorer, batch_size=2)
+
+    assert skipped == 2
+    expected = scorer.score(['Apple beats estimates, shares surge', '$AAPL and $TGT plunge on fraud probe',
+                             'Target Corp. expands stores'])
+    assert results['AAPL']['mentions'] == 2
+    assert results['AAPL']['sentiment_score'] == pytest.approx(expected[:2].mean())
+    assert (results['AAPL']['positive_mentions'], results['AAPL']['negative_mentions']) == (1, 1)
+    assert results['TGT']['mentions'] == 2
+    assert results['TGT']['sentiment_score'] == pytest.approx(expected[1:].mean())
+    assert results['MSFT'] == {'sentiment_score': 0.0, 'mentions': 0,
+                               'positive_mentions': 0, 'negative_mentions': 0}
+
+    # Iterables of lines or dicts give the same results
+    dicts = [json.loads(line) for line in records if line and line[0] == '{' and line != '{not json']
+    assert extractor.process_feed(iter(records), scorer)[0] == results
+    assert extractor.process_feed(dicts, scorer) == (results, 0)
+    assert sum(r['mentions'] for r in results.values()) == 4
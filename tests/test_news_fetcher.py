@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+
+from src.news_fetcher import NewsFetcher
+
+
+class StubResponse:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+class StubSession:
+    """Session stand-in serving scripted responses and tracking concurrency per host"""
+
+    def __init__(self, responses, delay=0.0):
+        self.responses = responses
+        self.delay = delay
+        self.requests = []
+        self.active = defaultdict(int)
+        self.peak = defaultdict(int)
+        self.peak_total = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, headers=None, timeout=None):
+        host = urlsplit(url).netloc
+        with self._lock:
+            self.requests.append({'url': url, 'headers': dict(headers or {}), 'timeout': timeout})
+            self.active[host] += 1
+            self.peak[host] = max(self.peak[host], self.active[host])
+            self.peak_total = max(self.peak_total, sum(self.active.values()))
+        try:
+            time.sleep(self.delay)
+            response = self.responses(url, headers or {})
+            if isinstance(response, Exception):
+                raise response
+            return response
+        finally:
+            with self._lock:
+                self.active[host] -= 1
+
+    def close(self):
+        pass
+
+
+def test_200_is_cached_and_304_revalidates_from_cache():
+    def responses(url, headers):
+        if headers.get('If-None-Match') == '"v1"':
+            return StubResponse(304)
+        return StubResponse(200, f'<html>{url}</html>', {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024'})
+
+    session = StubSession(responses)
+    fetcher = NewsFetcher(url_template='https://news.test/{symbol}', session=session, timeout=(1, 2))
+
+    first = fetcher.fetch_news(['AAA', 'BBB'])
+    assert first == {'AAA': '<html>https://news.test/AAA</html>', 'BBB': '<html>https://news.test/BBB</html>'}
+    cached = fetcher.cache.get('https://news.test/AAA')
+    assert (cached['etag'], cached['last_modified']) == ('"v1"', 'Mon, 01 Jan 2024')
+    assert all(request['timeout'] == (1, 2) for request in session.requests)
+    assert all('If-None-Match' not in request['headers'] for request in session.requests)
+
+    time.sleep(0.01)
+    session.requests.clear()
+    second = fetcher.fetch_news(['AAA', 'BBB'])
+    assert second == first
+    assert all(request['headers']['If-None-Match'] == '"v1"' and
+               request['headers']['If-Modified-Since'] == 'Mon, 01 Jan 2024' for request in session.requests)
+    # A 304 only refreshes the revalidation time
+    assert fetcher.cache.get('https://news.test/AAA')['fetched_at'] > cached['fetched_at']
+
+
+def test_timeout_and_http_errors_return_none_and_keep_cache():
+    state = {'mode': 'ok'}
+
+    def responses(url, headers):
+        if state['mode'] == 'ok':
+            return StubResponse(200, 'fresh', {'ETag': '"e"'})
+        if url.endswith('AAA'):
+            return requests.exceptions.ReadTimeout('read timed out')
+        return StubResponse(503)
+
+    fetcher = NewsFetcher(url_template='https://news.test/{symbol}', session=StubSession(responses))
+    fetcher.fetch_news(['AAA', 'BBB'])
+
+    state['mode'] = 'down'
+    assert fetcher.fetch_news(['AAA', 'BBB', 'CCC']) == {'AAA': None, 'BBB': None, 'CCC': None}
+    assert fetcher.cache.get('https://news.test/AAA')['body'] == 'fresh'
+    assert fetcher.cache.get('https://news.test/CCC') is None
+
+
+def test_per_host_semaphore_caps_concurrency_per_host():
+    session = StubSession(lambda url, headers: StubResponse(200, url), delay=0.05)
+    fetcher = NewsFetcher(session=session, per_host=2, max_workers=16)
+    urls = [f'https://host{h}.test/{i}' for h in range(3) for i in range(6)]
+
+    pages = fetcher.fetch_urls(urls + urls[:3])
+
+    assert pages == {url: url for url in urls}
+    assert len(session.requests) == len(urls)
+    assert max(session.peak.values()) == 2
+    # Hosts do not wait for each other
+    assert session.peak_total > 2
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+import src.news_parser as news_parser
+from src.news_parser import BASE_URL, NewsPageParser, article_key
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'benchmarks', 'fixtures')
+FIELDS = {'id', 'url', 'title', 'summary', 'source', 'published'}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.fixture
+def stream():
+    return load_fixture('yahoo_news_stream.html')
+
+
+@pytest.fixture
+def story_items():
+    return load_fixture('yahoo_news_story_items.html')
+
+
+def test_stream_layout(stream):
+    items = NewsPageParser().parse(stream)
+    # 40 headlines, one of them repeated
+    assert len(items) == 39
+    assert all(set(item) == FIELDS for item in items)
+    assert [item['id'] for item in items] == [f'uuid-{k:04d}' for k in range(39)]
+    assert items[0] == {
+        'id': 'uuid-0000',
+        'url': 'https://finance.yahoo.com/news/apple-beats-100000.html?.tsrc=rss',
+        'title': 'Apple beats estimates as iPhone demand holds up',
+        'summary': 'Apple said on Tuesday that beats estimates as iPhone demand holds up, '
+                   'according to people familiar with the matter & analysts.',
+        'source': 'Yahoo Finance',
+        'published': '13 hours ago'
+    }
+
+
+def test_story_item_layout(story_items):
+    items = NewsPageParser().parse(story_items)
+    assert len(items) == 39
+    assert all(set(item) == FIELDS for item in items)
+    assert all(item['id'] is None and item['url'].startswith(BASE_URL + '/news/') for item in items)
+    assert len({item['url'] for item in items}) == 39
+    assert items[0]['title'] == 'Tesla beats estimates as iPhone demand holds up'
+    assert items[0]['source'] == 'Barrons.com'
+    assert items[0]['published'] == '46 minutes ago'
+
+
+def test_parse_pages_shares_articles_across_pages(stream, story_items):
+    repost = ('<ul><li><h3><a href="/news/tesla-beats-200000.html?utm_source=feed">Tesla beats</a></h3></li>'
+              '<li data-uuid="uuid-0005"><h3><a href="/news/other.html">Same stream id</a></h3></li>'
+              '<li><h3><a href="/news/new-story.html">A new story</a></h3></li></ul>')
+    parser = NewsPageParser()
+    results = parser.parse_pages({'AAPL': stream, 'MSFT': stream + '<!-- MSFT -->', 'TSLA': story_items,
+                                  'NVDA': repost, 'NONE': None})
+
+    assert results['NONE'] is None
+    assert all(a is b for a, b in zip(results['AAPL'], results['MSFT']))
+    # Matched by URL without its query, and by stream id
+    assert results['NVDA'][0] is results['TSLA'][0]
+    assert results['NVDA'][1] is results['AAPL'][5]
+    assert results['NVDA'][2]['url'] == BASE_URL + '/news/new-story.html'
+
+    unique = {id(item) for items in results.values() if items for item in items}
+    assert len(unique) == 39 + 39 + 1
+    assert len({article_key(item) for items in results.values() if items for item in items}) == len(unique)
+
+
+def test_unchanged_page_is_served_from_cache(stream, monkeypatch):
+    parser = NewsPageParser(max_pages=1)
+    first = parser.parse(stream)
+
+    calls = []
+    original = news_parser._NewsStreamParser
+
+    def counting(base_url):
+        calls.append(base_url)
+        return original(base_url)
+
+    monkeypatch.setattr(news_parser, '_NewsStreamParser', counting)
+    assert parser.parse(stream) is first
+    assert calls == []
+
+    # A changed page is parsed and, with max_pages=1, evicts the old one
+    parser.parse(stream + '<!-- changed -->')
+    assert len(calls) == 1 and len(parser.cache) == 1
+    assert parser.parse(stream) == first
+    assert len(calls) == 2
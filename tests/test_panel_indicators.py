@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from src.panel_indicators import INDICATOR_COLUMNS
+from src.stock_analyzer import StockAnalyzer
+from src.synthetic_data import generate_universe
+
+
+@pytest.mark.parametrize('missing_bar_share', [0.001, 0.01])
+def test_panel_matches_per_symbol_with_missing_bars(missing_bar_share):
+    universe = generate_universe(20, period='1y', seed=3, missing_bar_share=missing_bar_share)
+    analyzer = StockAnalyzer()
+
+    panel_frames = analyzer.calculate_panel_indicators(universe)
+
+    assert set(panel_frames) == set(universe)
+    for symbol, df in universe.items():
+        expected = analyzer.calculate_technical_indicators(df.copy())
+        result = panel_frames[symbol]
+        assert result.index.equals(df.index)
+        for column in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(result[column].to_numpy(dtype=np.float64),
+                                       expected[column].to_numpy(dtype=np.float64),
+                                       rtol=1e-7, atol=1e-9, equal_nan=True,
+                                       err_msg=f'{symbol} {column}')
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from src.screener import FundamentalScreener
+
+METRICS = {
+    'AAA': {'Market_Cap': 5e9, 'PE_Ratio': 20, 'Profit_Margin': 0.2, 'Debt_To_Equity': 50,
+            'Current_Ratio': 2.0, 'ROE': 0.25},
+    'BBB': {'Market_Cap': 5e8, 'PE_Ratio': 10, 'Profit_Margin': 0.3, 'Debt_To_Equity': 20,
+            'Current_Ratio': 3.0, 'ROE': 0.30},
+    'CCC': {'Market_Cap': 2e10, 'PE_Ratio': 'N/A', 'Profit_Margin': 0.15, 'Debt_To_Equity': 80,
+            'Current_Ratio': 1.6, 'ROE': 0.2}
+}
+
+
+def test_screen_matches_brute_force():
+    screener = FundamentalScreener.from_metrics(METRICS)
+    criteria = {'Market_Cap': (1e9, None), 'PE_Ratio': (None, 50)}
+    assert list(screener.screen(criteria=criteria).index) == ['AAA']
+    assert list(screener.screen().index) == ['AAA']
+
+
+def test_unknown_metric_or_threshold_raises():
+    screener = FundamentalScreener.from_metrics(METRICS)
+    with pytest.raises(KeyError):
+        screener.screen(criteria={'Market_Capp': (1e9, None)})
+    with pytest.raises(KeyError):
+        screener.screen(thresholds={'MIN_MARKET_CAPP': 1e9})
+
+
+def test_threshold_metric_without_values_matches_nothing():
+    metrics = {symbol: {key: value for key, value in values.items() if key != 'ROE'}
+               for symbol, values in METRICS.items()}
+    screener = FundamentalScreener.from_metrics(metrics)
+    assert np.isnan(screener.columns['ROE']).all()
+    assert screener.screen().empty
+    assert list(screener.screen(thresholds={'MIN_MARKET_CAP': 1e9}).index) == ['AAA', 'CCC']
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from src.signals import RECOMMENDATION_LABELS, SIGNAL_LABELS, classify_signals
+from src.stock_analyzer import StockAnalyzer
+from src.synthetic_data import generate_universe
+
+
+def per_bar_history(analyzer, df):
+    """classify_signals and generate_recommendation on every prefix of `df`, as codes"""
+    obv = df['OBV'].to_numpy()
+    rows = []
+    for t in range(len(df)):
+        latest = df.iloc[t]
+        signals = classify_signals(latest, obv[t - 1] if t > 0 else np.nan)
+        recommendation, score, _ = analyzer.generate_recommendation({'rsi': latest['RSI']}, signals)
+        row = {signal: SIGNAL_LABELS[signal].index(label) for signal, label in signals.items()}
+        row['Score'] = score
+        row['Recommendation'] = RECOMMENDATION_LABELS.index(recommendation)
+        rows.append(row)
+    return {key: np.array([row[key] for row in rows]) for key in rows[0]}
+
+
+def assert_history_equal(history, expected, symbol):
+    for key, values in expected.items():
+        if key == 'Score':
+            np.testing.assert_allclose(history[key], values, err_msg=f'{symbol} {key}')
+        else:
+            np.testing.assert_array_equal(history[key], values, err_msg=f'{symbol} {key}')
+
+
+@pytest.fixture
+def frames():
+    universe = generate_universe(4, period='1y', seed=5, late_listing_share=0.5, missing_bar_share=0.01)
+    universe['SHORT'] = universe['SYN00000'].iloc[-30:]
+    universe['TINY'] = universe['SYN00001'].iloc[-2:]
+    return universe
+
+
+def test_signal_history_matches_per_bar(frames):
+    analyzer = StockAnalyzer()
+    for symbol, df in frames.items():
+        df = analyzer.calculate_technical_indicators(df.copy())
+        history = analyzer.generate_signal_history(df)
+        assert history.index.equals(df.index)
+        assert_history_equal({key: history[key].to_numpy() for key in history},
+                             per_bar_history(analyzer, df), symbol)
+
+
+def test_panel_signal_history_matches_per_bar(frames):
+    analyzer = StockAnalyzer()
+    panel, history = analyzer.generate_panel_signal_history(frames)
+    n_bars = len(panel.dates)
+    for j, symbol in enumerate(panel.symbols):
+        df = analyzer.calculate_technical_indicators(frames[symbol].copy())
+        listed = slice(n_bars - len(df), n_bars)
+        assert_history_equal({key: values[listed, j] for key, values in history.items()},
+                             per_bar_history(analyzer, df), symbol)
+        # Rows before the symbol's first bar are coded missing
+        assert (history['Recommendation'][:n_bars - len(df), j] == -1).all()
+        assert np.isnan(history['Score'][:n_bars - len(df), j]).all()
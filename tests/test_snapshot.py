@@ -0,0 +1,180 @@
+import numpy as np
+import pytest
+
+from src.signals import RECOMMENDATION_LABELS
+from src.snapshot import MetricSnapshot
+
+METRICS = ['score', 'rsi']
+
+
+class Reference:
+    """Brute-force model of a snapshot: a dict per symbol, re-sorted on every query"""
+
+    def __init__(self):
+        self.records = {}
+
+    def update(self, symbol, values):
+        record = self.records.setdefault(symbol, dict({metric: np.nan for metric in METRICS}, recommendation=None))
+        for key, value in values.items():
+            record[key] = value if key == 'recommendation' else (np.nan if value is None else float(value))
+
+    def remove(self, symbol):
+        if symbol in self.records:
+            self.records[symbol] = dict({metric: np.nan for metric in METRICS}, recommendation=None)
+
+    def values(self, metric):
+        values = np.array([record[metric] for record in self.records.values()])
+        return values[~np.isnan(values)]
+
+    def top(self, metric, k, ascending=False, recommendations=None, where=None):
+        rows = []
+        for row, record in enumerate(self.records.values()):
+            if np.isnan(record[metric]):
+                continue
+            if recommendations is not None and record['recommendation'] not in recommendations:
+                continue
+            if any(np.isnan(record[name]) or (low is not None and record[name] < low)
+                   or (high is not None and record[name] > high) for name, (low, high) in (where or {}).items()):
+                continue
+            rows.append(row)
+        sign = 1 if ascending else -1
+        return sorted(rows, key=lambda row: (sign * list(self.records.values())[row][metric], row))[:k]
+
+
+def assert_matches(snapshot, reference):
+    assert snapshot.symbols == list(reference.records)
+    for metric in METRICS:
+        size = len(snapshot)
+        values = snapshot.columns[metric][:size]
+        expected = np.array([record[metric] for record in reference.records.values()])
+        np.testing.assert_array_equal(values, expected)
+        # The maintained index is the column sorted with NaN last
+        np.testing.assert_array_equal(snapshot.sorted[metric][:size], np.sort(values))
+        np.testing.assert_array_equal(values[snapshot.order[metric][:size]], np.sort(values))
+        assert snapshot.n_valid(metric) == len(reference.values(metric))
+
+        for k in [0, 1, 3, size + 1]:
+            for ascending in [False, True]:
+                assert snapshot.top_rows(metric, k, ascending).tolist() == reference.top(metric, k, ascending)
+        filters = [{'recommendations': ['Buy', 'Strong Buy']},
+                   {'where': {'rsi': (30, 70)}},
+                   {'recommendations': ['Hold'], 'where': {'score': (None, 60)}}]
+        for kwargs in filters:
+            for chunk_size in [1, 256]:
+                assert (snapshot.top_rows(metric, 3, chunk_size=chunk_size, **kwargs).tolist()
+                        == reference.top(metric, 3, **kwargs)), kwargs
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(4)
+
+
+def random_values(rng):
+    # Few distinct values so ties are common; some metrics go to NaN or are left out
+    values = {}
+    for metric in METRICS:
+        draw = rng.random()
+        if draw < 0.15:
+            values[metric] = None
+        elif draw < 0.85:
+            values[metric] = float(rng.integers(0, 10) * 10)
+    if rng.random() < 0.7:
+        values['recommendation'] = RECOMMENDATION_LABELS[rng.integers(0, len(RECOMMENDATION_LABELS))]
+    return values
+
+
+def test_updates_keep_the_index_sorted(rng):
+    snapshot = MetricSnapshot(METRICS, capacity=2)
+    reference = Reference()
+    symbols = [f'S{k}' for k in range(25)]
+    for step in range(300):
+        symbol = symbols[rng.integers(0, len(symbols))]
+        if rng.random() < 0.1:
+            snapshot.remove(symbol)
+            reference.remove(symbol)
+        else:
+            values = random_values(rng)
+            snapshot.update(symbol, values)
+            reference.update(symbol, values)
+        if step % 10 == 0:
+            assert_matches(snapshot, reference)
+    assert_matches(snapshot, reference)
+
+
+def test_update_many_matches_updates(rng):
+    snapshot = MetricSnapshot(METRICS)
+    reference = Reference()
+    for size in [30, 2, 40, 1]:
+        records = {f'S{k}': random_values(rng) for k in rng.choice(50, size, replace=False)}
+        snapshot.update_many(records)
+        for symbol, values in records.items():
+            reference.update(symbol, values)
+        assert_matches(snapshot, reference)
+
+
+def test_entries_move_both_ways():
+    snapshot = MetricSnapshot.from_records({'A': {'score': 10}, 'B': {'score': 20}, 'C': {'score': 30}}, METRICS)
+    snapshot.update('A', {'score': 40})
+    assert snapshot.top('score', 3)['Symbol'].tolist() == ['A', 'C', 'B']
+    snapshot.update('A', {'score': 5})
+    assert snapshot.top('score', 3)['Symbol'].tolist() == ['C', 'B', 'A']
+    snapshot.update('C', {'score': 20})
+    assert snapshot.top('score', 3)['Symbol'].tolist() == ['B', 'C', 'A']
+
+
+def test_updates_to_and_from_nan():
+    snapshot = MetricSnapshot.from_records({'A': {'score': 10}, 'B': {'score': 20}}, METRICS)
+    snapshot.update('B', {'score': None})
+    assert snapshot.n_valid('score') == 1
+    assert snapshot.top('score', 5)['Symbol'].tolist() == ['A']
+    snapshot.update('B', {'score': 'N/A'})
+    assert snapshot.n_valid('score') == 1
+    snapshot.update('B', {'score': 15})
+    assert snapshot.top('score', 5)['Symbol'].tolist() == ['B', 'A']
+    snapshot.update('C', {'rsi': 50})
+    assert snapshot.n_valid('score') == 2 and snapshot.n_valid('rsi') == 1
+
+
+def test_remove():
+    snapshot = MetricSnapshot.from_records({'A': {'score': 10, 'recommendation': 'Buy'},
+                                            'B': {'score': 20, 'recommendation': 'Sell'}}, METRICS)
+    snapshot.remove('B')
+    snapshot.remove('missing')
+    assert snapshot.top('score', 5)['Symbol'].tolist() == ['A']
+    assert np.isnan(snapshot.symbol_percentile('B', 'score'))
+    assert snapshot.get('B')['recommendation'] is None
+    # A removed symbol that comes back reuses its row
+    snapshot.update('B', {'score': 5})
+    assert snapshot.symbols == ['A', 'B']
+    assert snapshot.top('score', 5)['Symbol'].tolist() == ['A', 'B']
+
+
+def test_filtered_top_k_breaks_ties_by_row():
+    records = {f'S{k}': {'score': 50 if k % 2 else 80, 'rsi': 40 + k,
+                         'recommendation': 'Buy' if k % 3 else 'Hold'} for k in range(12)}
+    snapshot = MetricSnapshot.from_records(records, METRICS)
+    # Move entries so index order within the tie group differs from row order
+    for symbol in ['S7', 'S1', 'S9']:
+        snapshot.update(symbol, {'score': 90})
+        snapshot.update(symbol, {'score': 50})
+    top = snapshot.top('score', 6, recommendations=['Buy'], where={'rsi': (None, 50)}, columns=['rsi'])
+    # S1, S5 and S7 tie at 50; the cut keeps the first two rows
+    assert top['Symbol'].tolist() == ['S2', 'S4', 'S8', 'S10', 'S1', 'S5']
+    assert snapshot.top_rows('score', 3, ascending=True).tolist() == [1, 3, 5]
+
+
+@pytest.mark.parametrize('q', [0.0, 0.1, 0.25, 0.5, 0.9, 1.0])
+def test_quantile_and_percentile_match_numpy(rng, q):
+    snapshot = MetricSnapshot(METRICS)
+    reference = Reference()
+    for k in range(40):
+        values = {'score': None if k % 7 == 0 else float(rng.normal(50, 20))}
+        snapshot.update(f'S{k}', values)
+        reference.update(f'S{k}', values)
+    values = reference.values('score')
+    assert snapshot.quantile('score', q) == pytest.approx(np.quantile(values, q))
+    cutoff = np.quantile(values, q)
+    assert snapshot.percentile('score', cutoff) == pytest.approx(100 * np.mean(values <= cutoff))
+    assert np.isnan(snapshot.quantile('rsi', q))
+    assert np.isnan(snapshot.percentile('score', np.nan))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from src.indicator_registry import compute_indicators
+from src.panel_indicators import INDICATOR_COLUMNS
+from src.streaming_indicators import StreamingIndicators, load_states, save_states
+from src.synthetic_data import generate_ohlcv
+
+CUSTOM_PARAMS = {'RSI_PERIOD': 9, 'SMA_SHORT': 15, 'SMA_LONG': 40, 'SMA_TREND': 100, 'EMA_SHORT': 8,
+                 'EMA_LONG': 21, 'MACD_SIGNAL': 5, 'BB_PERIOD': 25, 'BB_STD': 2.5, 'STOCH_PERIOD': 10,
+                 'STOCH_SMOOTH': 4, 'ATR_PERIOD': 7, 'ROC_PERIOD': 5, 'MFI_PERIOD': 12, 'RVI_PERIOD': 6}
+
+
+@pytest.mark.parametrize('params', [None, CUSTOM_PARAMS])
+def test_stream_matches_batch_indicators(params):
+    df = generate_ohlcv(300, seed=5)
+    expected = compute_indicators(df.copy(), params=params)
+
+    state = StreamingIndicators('SYN', params)
+    rows = [state.update(bar)[0] for _, bar in df.iterrows()]
+
+    for column in INDICATOR_COLUMNS:
+        streamed = np.array([row[column] for row in rows])
+        np.testing.assert_allclose(streamed[-100:], expected[column].to_numpy()[-100:],
+                                   rtol=1e-7, atol=1e-7, equal_nan=True, err_msg=column)
+
+
+def test_saved_states_resume_and_refuse_other_params(tmp_path):
+    df = generate_ohlcv(260, seed=7)
+    path = str(tmp_path / 'states.json')
+    warm = StreamingIndicators.from_history(df.iloc[:-1], 'SYN', CUSTOM_PARAMS)
+    save_states({'SYN': warm}, path, CUSTOM_PARAMS)
+
+    resumed = load_states(path, CUSTOM_PARAMS)['SYN']
+    full = StreamingIndicators.from_history(df.iloc[:-1], 'SYN', CUSTOM_PARAMS)
+    bar = df.iloc[-1]
+    assert resumed.update(bar)[0] == pytest.approx(full.update(bar)[0], nan_ok=True)
+
+    with pytest.raises(ValueError):
+        load_states(path)
+    with pytest.raises(ValueError):
+        save_states({'SYN': warm}, path)